@@ -1,14 +1,34 @@
 import os
-import io
+import asyncio
 import time
 import json
 from datetime import datetime
-from functools import lru_cache
+from collections import OrderedDict
 import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+import shutil
+import hashlib
+import random
 from time import time as _now
 
+import click
+import httpx
+import requests
+import numpy as np
 import pandas as pd
-from flask import Flask, render_template, request, jsonify, send_file
+import gzip
+from flask import Flask, Response, render_template, request, jsonify
+
+try:
+    import orjson  # optional: faster JSON encoding
+except ImportError:
+    orjson = None
+try:
+    import brotli  # optional: br content encoding
+except ImportError:
+    brotli = None
 
 # nba_api imports
 from nba_api.stats.endpoints import (
@@ -28,8 +48,22 @@ from nba_api.stats.endpoints import (
     LeagueGameLog,
     PlayerGameLog
 )
+from nba_api.stats.endpoints._base import Endpoint
+from nba_api.stats.library.http import NBAStatsHTTP, NBAStatsResponse
 from nba_api.stats.static import teams, players
 
+import exports
+import instrumentation
+import metrics
+import player_search
+import shotcharts
+import upstream_replay
+from upstream_health import CircuitOpen, EndpointHealth, TokenBucket
+from async_upstream import AsyncUpstream, UpstreamOverloaded
+from caches import ResponseCache, SharedCache
+from scoreboard import ScoreboardPoller
+from warmup import CacheWarmer
+
 # ------------------------------------------------------------------------------
 # Flask app
 # ------------------------------------------------------------------------------
@@ -43,7 +77,8 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:72.0) Gecko/20100101 Firefox/72.0",
     "Accept": "application/json, text/plain, */*",
     "Accept-Language": "en-US,en;q=0.5",
-    "Accept-Encoding": "gzip, deflate, br",
+    # Only encodings this install can decode (br/zstd when brotli/zstandard exist)
+    "Accept-Encoding": requests.utils.DEFAULT_ACCEPT_ENCODING,
     "x-nba-stats-origin": "stats",
     "x-nba-stats-token": "true",
     "Connection": "keep-alive",
@@ -56,46 +91,129 @@ PROXIES = {
     # "http": "http://your-proxy:port",
     # "https": "http://your-proxy:port",
 }
+if os.environ.get("COURTVISION_PROXY"):
+    PROXIES = {"http": os.environ["COURTVISION_PROXY"], "https": os.environ["COURTVISION_PROXY"]}
 
 DEFAULT_TIMEOUT = 60
 
-_TGL_CACHE = {}
-_TGL_LOCK = threading.Lock()
-_TGL_TTL_SECONDS = 1800  # 30 minutes
+WAREHOUSE_DIR = os.environ.get(
+    "COURTVISION_WAREHOUSE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "warehouse"),
+)
 
-def get_team_gamelog_cached(team_id: int, season: str, timeout_sec: int = 10):
-    """
-    Fetch TeamGameLog with a small timeout, cache for 30min.
-    Falls back to cached copy immediately if NBA API call fails or times out.
-    """
-    key = (int(team_id), season)
-    now = _now()
+CACHE_MAX_BYTES = int(os.environ.get("COURTVISION_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Host-wide cache shared by all worker processes ("" disables it)
+SHARED_CACHE_DIR = os.environ.get("COURTVISION_SHARED_CACHE", os.path.join(WAREHOUSE_DIR, "_shared"))
+SHARED_CACHE_MAX_BYTES = int(os.environ.get("COURTVISION_SHARED_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024))
+# With the shared cache on, each worker keeps only a small in-process L1 of hot
+# frames in front of it instead of a full private copy of everything it read
+SHARED_CACHE_L1_BYTES = int(os.environ.get("COURTVISION_SHARED_CACHE_L1_BYTES", 32 * 1024 * 1024))
+
+# Async upstream mode: stats.nba.com calls run on one event loop through a pooled
+# httpx client instead of each holding a thread for the whole request
+ASYNC_UPSTREAM = os.environ.get("COURTVISION_ASYNC_UPSTREAM", "0") == "1"
+UPSTREAM_HOST_CONNECTIONS = int(os.environ.get("COURTVISION_UPSTREAM_HOST_CONNECTIONS", 32))
+UPSTREAM_MAX_PENDING = int(os.environ.get("COURTVISION_UPSTREAM_MAX_PENDING", 1000))
+
+# Where per-team game logs come from: "league" slices one LeagueGameLog per season,
+# "team" fetches TeamGameLog for each team
+GAMELOG_SOURCE = os.environ.get("COURTVISION_GAMELOG_SOURCE", "league")
+
+# Keep-alive connections held per upstream host by the shared session
+UPSTREAM_POOL_SIZE = int(os.environ.get("COURTVISION_UPSTREAM_POOL_SIZE", 32))
+
+# Circuit breaker: open an endpoint after this many consecutive failures, probe again after the reset time
+BREAKER_FAILURES = int(os.environ.get("COURTVISION_BREAKER_FAILURES", 5))
+BREAKER_RESET_SECONDS = float(os.environ.get("COURTVISION_BREAKER_RESET", 30))
+# Adaptive timeouts: TIMEOUT_P99_MULTIPLIER x observed p99 latency, never below MIN_UPSTREAM_TIMEOUT
+MIN_UPSTREAM_TIMEOUT = float(os.environ.get("COURTVISION_MIN_UPSTREAM_TIMEOUT", 3))
+TIMEOUT_P99_MULTIPLIER = 3.0
+
+# Global ceiling on stats.nba.com requests from this process (requests/second, burst)
+UPSTREAM_RATE = float(os.environ.get("COURTVISION_UPSTREAM_RATE", 8))
+UPSTREAM_BURST = int(os.environ.get("COURTVISION_UPSTREAM_BURST", 16))
+
+# Offline upstream: with a fixture directory, "replay" answers stats.nba.com calls
+# from recorded responses (plus injected latency/errors) and "record" saves them
+UPSTREAM_FIXTURES = os.environ.get("COURTVISION_UPSTREAM_FIXTURES", "")
+UPSTREAM_FIXTURE_MODE = os.environ.get("COURTVISION_UPSTREAM_FIXTURE_MODE", "replay")
+REPLAY_LATENCY_MS = float(os.environ.get("COURTVISION_REPLAY_LATENCY_MS", 0))
+REPLAY_JITTER_MS = float(os.environ.get("COURTVISION_REPLAY_JITTER_MS", 0))
+REPLAY_ERROR_RATE = float(os.environ.get("COURTVISION_REPLAY_ERROR_RATE", 0))
+
+# Add a Server-Timing header (per-endpoint fetch time and cache outcome) to every response
+SERVER_TIMING = os.environ.get("COURTVISION_SERVER_TIMING", "0") == "1"
 
-    with _TGL_LOCK:
-        entry = _TGL_CACHE.get(key)
-        if entry and now - entry["ts"] < _TGL_TTL_SECONDS:
-            return entry["df"]
+# ------------------------------------------------------------------------------
+# Instrumentation: Prometheus metrics served at /metrics
+# ------------------------------------------------------------------------------
+METRICS = instrumentation.Registry()
+ROUTE_LATENCY = METRICS.register(instrumentation.Histogram(
+    "courtvision_http_request_duration_seconds", "Flask request latency by route.",
+    labels=("route", "method", "status"),
+))
+UPSTREAM_LATENCY = METRICS.register(instrumentation.Histogram(
+    "courtvision_upstream_request_duration_seconds", "Latency of each stats.nba.com attempt by endpoint and outcome.",
+    labels=("endpoint", "outcome"),
+))
+FETCH_LATENCY = METRICS.register(instrumentation.Histogram(
+    "courtvision_fetch_duration_seconds", "nba_fetch latency by endpoint, cache lookups included.",
+    labels=("endpoint",),
+))
+UPSTREAM_RETRIES = METRICS.register(instrumentation.Counter(
+    "courtvision_upstream_retries_total", "Upstream attempts retried after a failure.", labels=("endpoint",),
+))
+UPSTREAM_REJECTED = METRICS.register(instrumentation.Counter(
+    "courtvision_upstream_short_circuited_total", "Calls refused because the endpoint's circuit was open.",
+    labels=("endpoint",),
+))
+CACHE_RESULTS = METRICS.register(instrumentation.Counter(
+    "courtvision_cache_lookups_total",
+    "nba_fetch outcomes: hit, stale, shared, warehouse, waited (another worker fetched), upstream, fallback.",
+    labels=("endpoint", "result"),
+))
+
+_TIMEOUT_ERRORS = (requests.exceptions.Timeout, httpx.TimeoutException, TimeoutError)
+# Upstream did not answer properly: worth a retry and counted by the circuit
+# breaker. Anything else (e.g. a result set missing from a 200 response) is
+# raised on the first attempt and leaves the breaker alone.
+_TRANSIENT_ERRORS = _TIMEOUT_ERRORS + (
+    requests.exceptions.ConnectionError, requests.exceptions.HTTPError,
+    httpx.TransportError, httpx.HTTPStatusError,
+)
 
+def upstream_outcome(error) -> str:
+    return "timeout" if isinstance(error, _TIMEOUT_ERRORS) else "error"
+
+@app.before_request
+def _start_request_timer():
+    request.environ["courtvision.started"] = time.perf_counter()
+    if SERVER_TIMING:
+        instrumentation.start_request()
+
+@app.after_request
+def _record_request(response):
+    started = request.environ.get("courtvision.started")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        ROUTE_LATENCY.observe(time.perf_counter() - started, route, request.method, str(response.status_code))
+    if SERVER_TIMING:
+        timings = instrumentation.current_timings()
+        if timings is not None:
+            response.headers["Server-Timing"] = instrumentation.server_timing_header(timings)
+    return response
+
+def get_team_aggregates_cached(team_id: int, season: str, timeout_sec: int = 10) -> dict:
+    """
+    Precomputed season aggregates for a team (see team_season_aggregates).
+    Falls back to empty aggregates if the game log cannot be loaded.
+    """
     try:
-        df = nbacall_retry(
-            TeamGameLog,
-            team_id=int(team_id),
-            season=season,
-            season_type_all_star="Regular Season",
-            timeout=timeout_sec,
-        ).get_data_frames()[0]
-        if df is None:
-            df = pd.DataFrame()
-        with _TGL_LOCK:
-            _TGL_CACHE[key] = {"ts": now, "df": df}
-        return df
+        return team_season_aggregates(team_id, season, timeout=timeout_sec)
     except Exception as e:
-        print(f"[WARN] get_team_gamelog_cached fallback due to: {e}")
-        with _TGL_LOCK:
-            entry = _TGL_CACHE.get(key)
-            if entry:
-                return entry["df"]
-        return pd.DataFrame()
+        print(f"[WARN] get_team_aggregates_cached fallback due to: {e}")
+        return empty_team_aggregates()
 
 def get_seasons(start_year: int = 1951):
     """
@@ -113,74 +231,1588 @@ def get_seasons(start_year: int = 1951):
         seasons.append(f"{year}-{str(year + 1)[-2:]}")
     return seasons
 
-def nbacall_retry(endpoint_cls, retries: int = 3, backoff: float = 0.5, **kwargs):
+UPSTREAM_FIXTURE_STORE = upstream_replay.FixtureStore(UPSTREAM_FIXTURES) if UPSTREAM_FIXTURES else None
+UPSTREAM_FAULTS = upstream_replay.FaultInjector(REPLAY_LATENCY_MS, REPLAY_JITTER_MS, REPLAY_ERROR_RATE)
+
+def _raise_for_upstream_status(response, *args, **kwargs):
+    # 429 and 5xx become HTTPError (retried) instead of a JSON parse error in nba_api
+    if response.status_code == 429 or response.status_code >= 500:
+        response.raise_for_status()
+
+def build_upstream_session() -> requests.Session:
     """
-    Wrapper for nba_api endpoint classes with consistent headers/timeout/proxy and
-    a simple retry with linear backoff.
+    The one requests.Session every nba_api call goes through. Its adapter keeps
+    up to UPSTREAM_POOL_SIZE idle keep-alive connections per host (requests'
+    default of 10 is smaller than the fan-out pool, so busy pages kept paying
+    for fresh TCP+TLS handshakes). Proxies are set here rather than per call.
+    With COURTVISION_UPSTREAM_FIXTURES set, the adapter records responses to,
+    or replays them from, that directory instead (see upstream_replay).
+    """
+    session = requests.Session()
+    if UPSTREAM_FIXTURES and UPSTREAM_FIXTURE_MODE == "replay":
+        adapter = upstream_replay.ReplayAdapter(UPSTREAM_FIXTURE_STORE, UPSTREAM_FAULTS)
+    elif UPSTREAM_FIXTURES:
+        adapter = upstream_replay.RecordingAdapter(
+            UPSTREAM_FIXTURE_STORE, pool_connections=4, pool_maxsize=UPSTREAM_POOL_SIZE
+        )
+    else:
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=UPSTREAM_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.proxies.update(PROXIES)
+    session.hooks["response"].append(_raise_for_upstream_status)
+    return session
+
+UPSTREAM_SESSION = build_upstream_session()
+NBAStatsHTTP.set_session(UPSTREAM_SESSION)
+
+def upstream_connection_stats() -> dict:
+    """Connections opened vs requests sent over the shared session's pools."""
+    opened = sent = pools = 0
+    for adapter in {id(a): a for a in UPSTREAM_SESSION.adapters.values()}.values():
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for pool_key in list(manager.pools.keys()):
+            pool = manager.pools.get(pool_key)
+            if pool is None:
+                continue
+            pools += 1
+            opened += pool.num_connections
+            sent += pool.num_requests
+    return {
+        "pools": pools,
+        "connections_opened": opened,
+        "requests": sent,
+        "reused_pct": round(100.0 * (sent - opened) / sent, 1) if sent else 0.0,
+    }
+
+UPSTREAM_LIMITER = TokenBucket(UPSTREAM_RATE, UPSTREAM_BURST)
+
+# Errors that look like stats.nba.com throttling us (it tends to stall or drop
+# connections rather than answer 429)
+_THROTTLE_ERRORS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+
+def backoff_delay(attempt: int, backoff: float = 0.5, max_backoff: float = 30.0) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max_backoff, backoff * 2**(attempt-1))]."""
+    return random.uniform(0, min(max_backoff, backoff * (2 ** (attempt - 1))))
+
+_ENDPOINT_HEALTH = {}
+_ENDPOINT_HEALTH_LOCK = threading.Lock()
+
+def endpoint_health(endpoint_cls) -> EndpointHealth:
+    name = endpoint_cls.__name__
+    with _ENDPOINT_HEALTH_LOCK:
+        health = _ENDPOINT_HEALTH.get(name)
+        if health is None:
+            health = _ENDPOINT_HEALTH[name] = EndpointHealth(
+                name, BREAKER_FAILURES, BREAKER_RESET_SECONDS, MIN_UPSTREAM_TIMEOUT, TIMEOUT_P99_MULTIPLIER
+            )
+        return health
+
+def upstream_health_stats() -> dict:
+    with _ENDPOINT_HEALTH_LOCK:
+        items = list(_ENDPOINT_HEALTH.items())
+    return {name: health.stats() for name, health in sorted(items)}
+
+def nbacall_retry(endpoint_cls, retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0, **kwargs):
+    """
+    Wrapper for nba_api endpoint classes with consistent headers/timeout over the
+    shared keep-alive session, the process-wide rate limit, the endpoint's circuit
+    breaker and adaptive timeout, and retries with jittered exponential backoff.
+    Connection errors and timeouts also pause the limiter for everyone. While the
+    circuit is open this raises CircuitOpen at once, without retrying.
     """
     kwargs.setdefault("headers", HEADERS)
     kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
-    if PROXIES:
-        kwargs.setdefault("proxy", PROXIES)
+    if ASYNC_UPSTREAM:
+        return ASYNC_CLIENT.submit(endpoint_cls, retries=retries, backoff=backoff,
+                                   max_backoff=max_backoff, **kwargs).result()
 
-    last_err = None
-    for attempt in range(1, retries + 1):
-        try:
-            return endpoint_cls(**kwargs)
-        except Exception as e:
-            last_err = e
-            if attempt < retries:
-                time.sleep(backoff * attempt)
-            else:
+    health = endpoint_health(endpoint_cls)
+    requested_timeout = kwargs["timeout"]
+    name = endpoint_cls.__name__
+    try:
+        health.before_call()
+    except CircuitOpen:
+        UPSTREAM_REJECTED.inc(name)
+        raise
+    settled = False
+    try:
+        for attempt in range(1, retries + 1):
+            UPSTREAM_LIMITER.acquire()
+            timeout = kwargs["timeout"] = health.timeout(requested_timeout)
+            started = time.monotonic()
+            try:
+                endpoint = endpoint_cls(**kwargs)
+            except _TRANSIENT_ERRORS as e:
+                elapsed = time.monotonic() - started
+                UPSTREAM_LATENCY.observe(elapsed, name, upstream_outcome(e))
+                if isinstance(e, _TIMEOUT_ERRORS):
+                    health.record(max(elapsed, timeout))
+                if attempt >= retries:
+                    health.failure()
+                    settled = True
+                    raise
+                UPSTREAM_RETRIES.inc(name)
+                delay = backoff_delay(attempt, backoff, max_backoff)
+                if isinstance(e, _THROTTLE_ERRORS):
+                    UPSTREAM_LIMITER.pause(delay)
+                time.sleep(delay)
+                continue
+            except Exception as e:
+                UPSTREAM_LATENCY.observe(time.monotonic() - started, name, upstream_outcome(e))
                 raise
-    if last_err:
-        raise last_err
-
-def calculate_true_shooting(row):
-    pts = row.get("PTS", 0)
-    fga = row.get("FGA", 0)
-    fta = row.get("FTA", 0)
-    denom = fga + 0.44 * fta
-    if denom == 0:
-        return 0
-    return (pts / (2 * denom)) * 100
-
-def calculate_efficiency(row):
-    positive = row.get("PTS", 0) + row.get("REB", 0) + row.get("AST", 0) + row.get("STL", 0) + row.get("BLK", 0)
-    negative = (row.get("FGA", 0) - row.get("FGM", 0)) + (row.get("FTA", 0) - row.get("FTM", 0)) + row.get("TOV", 0)
-    return positive - negative
+            elapsed = time.monotonic() - started
+            health.success(elapsed)
+            settled = True
+            UPSTREAM_LATENCY.observe(elapsed, name, "ok")
+            return endpoint
+    finally:
+        if not settled:
+            health.release()
 
-@app.route("/")
-def home():
-    today = datetime.now().strftime("%m/%d/%Y")
-    games = []
+# ------------------------------------------------------------------------------
+# Async upstream transport: one event loop, pooled httpx client, per-host limits
+# ------------------------------------------------------------------------------
+async def _async_nbacall(client, endpoint_cls, retries: int, backoff: float, max_backoff: float, kwargs: dict):
+    """
+    nbacall_retry as a coroutine on ASYNC_CLIENT's event loop: the same breaker,
+    limiter, retries and metrics, with requests sent through the pooled httpx
+    client and the response parsed by the endpoint's own load_response().
+    """
+    endpoint = endpoint_cls(get_request=False, **kwargs)
+    url = NBAStatsHTTP.base_url.format(endpoint=endpoint.endpoint)
+    # Same parameter order as nba_api; requests drops None values, so do we
+    params = [(k, v) for k, v in sorted(endpoint.parameters.items()) if v is not None]
+    headers = dict(endpoint.headers or HEADERS)
+    health = endpoint_health(endpoint_cls)
+
+    name = endpoint_cls.__name__
+    try:
+        health.before_call()
+    except CircuitOpen:
+        UPSTREAM_REJECTED.inc(name)
+        raise
+    settled = False
+    try:
+        for attempt in range(1, retries + 1):
+            await UPSTREAM_LIMITER.acquire_async()
+            timeout = health.timeout(endpoint.timeout)
+            started = time.monotonic()
+            try:
+                resp = await client.get(url, params=params, headers=headers, timeout=timeout)
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    resp.raise_for_status()
+            except _TRANSIENT_ERRORS as e:
+                elapsed = time.monotonic() - started
+                UPSTREAM_LATENCY.observe(elapsed, name, upstream_outcome(e))
+                if isinstance(e, _TIMEOUT_ERRORS):
+                    health.record(max(elapsed, timeout))
+                if attempt >= retries:
+                    health.failure()
+                    settled = True
+                    raise
+                UPSTREAM_RETRIES.inc(name)
+                delay = backoff_delay(attempt, backoff, max_backoff)
+                if isinstance(e, (httpx.TimeoutException, httpx.TransportError)):
+                    UPSTREAM_LIMITER.pause(delay)
+                await asyncio.sleep(delay)
+                continue
+            elapsed = time.monotonic() - started
+            endpoint.nba_response = NBAStatsResponse(
+                response=resp.text, status_code=resp.status_code, url=str(resp.url)
+            )
+            try:
+                # JSON decoding and DataFrame building stay off the loop thread
+                await asyncio.to_thread(endpoint.load_response)
+            except Exception as e:
+                UPSTREAM_LATENCY.observe(time.monotonic() - started, name, upstream_outcome(e))
+                raise
+            health.success(elapsed)
+            settled = True
+            UPSTREAM_LATENCY.observe(elapsed, name, "ok")
+            return endpoint
+    finally:
+        # Also reached on cancellation, which must not leave a half-open probe claimed
+        if not settled:
+            health.release()
+
+ASYNC_CLIENT = AsyncUpstream(
+    UPSTREAM_HOST_CONNECTIONS, UPSTREAM_MAX_PENDING, _async_nbacall,
+    proxy=PROXIES.get("https") or PROXIES.get("http") or None,
+    transport=upstream_replay.AsyncReplayTransport(UPSTREAM_FIXTURE_STORE, UPSTREAM_FAULTS)
+    if UPSTREAM_FIXTURES and UPSTREAM_FIXTURE_MODE == "replay" else None,
+)
+
+# ------------------------------------------------------------------------------
+# Season warehouse: columnar (Parquet) copies of nba_api results on disk
+# ------------------------------------------------------------------------------
+_TRANSPORT_KWARGS = {"headers", "timeout", "proxy"}
+_WAREHOUSE_LOCK = threading.Lock()
+
+class NBAFrames:
+    """
+    Named result sets of one nba_api call, exposing the same accessors the routes
+    already use on endpoint objects (get_data_frames / get_normalized_dict).
+    """
+
+    def __init__(self, frames: dict):
+        self.frames = frames
+
+    def get_data_frames(self):
+        return list(self.frames.values())
+
+    def get_normalized_dict(self):
+        return {name: frame_records(df) for name, df in self.frames.items()}
+
+def _is_missing(value) -> bool:
+    return value is None or value is pd.NaT or value is pd.NA or (isinstance(value, float) and value != value)
+
+def frame_records(df: pd.DataFrame) -> list:
+    """DataFrame rows as JSON-ready dicts, with NaN/NaT as None."""
+    records = df.to_dict("records")
+    if len(df) and df.isna().to_numpy().any():
+        records = [{k: None if _is_missing(v) else v for k, v in row.items()} for row in records]
+    return records
+
+def endpoint_frames(endpoint) -> dict:
+    """Result sets of a live nba_api endpoint as {data set name: DataFrame}."""
+    data_sets = endpoint.nba_response.get_data_sets()
+    return {name: Endpoint.DataSet(data=ds).get_data_frame() for name, ds in data_sets.items()}
+
+def request_params(kwargs: dict) -> dict:
+    """Endpoint kwargs without transport settings, values normalized to strings."""
+    return {k: str(v) for k, v in sorted(kwargs.items()) if k not in _TRANSPORT_KWARGS}
+
+def season_of(kwargs: dict):
+    return kwargs.get("season") or kwargs.get("season_nullable")
+
+def is_completed_season(season: str) -> bool:
+    """Anything older than the newest season in get_seasons() is final."""
+    return bool(season) and season < get_seasons()[0]
+
+def warehouse_path(endpoint_cls, kwargs: dict) -> str:
+    params = request_params(kwargs)
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(WAREHOUSE_DIR, endpoint_cls.__name__, str(season_of(kwargs)), digest)
+
+def warehouse_read(endpoint_cls, kwargs: dict):
+    """Return {name: DataFrame} from the warehouse, or None when not ingested yet."""
+    path = warehouse_path(endpoint_cls, kwargs)
     try:
-        scoreboard = nbacall_retry(ScoreboardV2, game_date=today, timeout=30)
-        raw = scoreboard.get_normalized_dict()
-        games = raw.get("GameHeader", []) or []
-    except KeyError as e:
-        print(f"[WARN] ScoreboardV2 missing dataset: {e}. Showing empty games list.")
+        with open(os.path.join(path, "_manifest.json")) as f:
+            manifest = json.load(f)
+        return {
+            name: pd.read_parquet(os.path.join(path, f"{i:02d}.parquet"))
+            for i, name in enumerate(manifest["data_sets"])
+        }
+    except FileNotFoundError:
+        return None
     except Exception as e:
-        print(f"[ERROR] Could not fetch scoreboard: {e}. Showing empty games list.")
+        print(f"[WARN] warehouse read failed for {endpoint_cls.__name__} {path}: {e}")
+        return None
 
-    games_today = []
-    for g in games:
-        try:
-            games_today.append(
+def warehouse_write(endpoint_cls, kwargs: dict, frames: dict) -> bool:
+    """
+    Write one result to the warehouse. Files land in a temp dir first and are
+    swapped in, so readers never see a half-written entry.
+    """
+    path = warehouse_path(endpoint_cls, kwargs)
+    tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        os.makedirs(tmp, exist_ok=True)
+        for i, df in enumerate(frames.values()):
+            df.to_parquet(os.path.join(tmp, f"{i:02d}.parquet"), index=False)
+        with open(os.path.join(tmp, "_manifest.json"), "w") as f:
+            json.dump(
                 {
-                    "game_id": g.get("GAME_ID"),
-                    "matchup": f"{g.get('VISITOR_TEAM_ABBREVIATION')} @ {g.get('HOME_TEAM_ABBREVIATION')}",
-                    "game_time": g.get("GAME_TIME"),
-                    "arena": g.get("ARENA_NAME"),
-                }
+                    "endpoint": endpoint_cls.__name__,
+                    "params": request_params(kwargs),
+                    "data_sets": list(frames.keys()),
+                    "fetched_at": datetime.now().isoformat(timespec="seconds"),
+                },
+                f,
             )
-        except Exception:
+        with _WAREHOUSE_LOCK:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            os.replace(tmp, path)
+        return True
+    except Exception as e:
+        print(f"[WARN] warehouse write failed for {endpoint_cls.__name__} {path}: {e}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        return False
+
+# ------------------------------------------------------------------------------
+# Host-wide cache shared by worker processes: Arrow IPC files + SQLite index
+# ------------------------------------------------------------------------------
+SHARED_CACHE = SharedCache(SHARED_CACHE_DIR, SHARED_CACHE_MAX_BYTES)
+os.register_at_fork(after_in_child=SHARED_CACHE._after_fork)
+
+# ------------------------------------------------------------------------------
+# Shared response cache: bounded LRU with per-endpoint TTLs
+# ------------------------------------------------------------------------------
+_PAST_SEASON_TTL = 7 * 24 * 3600      # completed seasons never change
+_LIVE_SEASON_TTL = 15 * 60
+_ENDPOINT_TTLS = {                    # overrides for the live season / season-less calls
+    "ScoreboardV2": 5,                # the live scoreboard's poll interval
+    "TeamGameLog": 30 * 60,
+    "LeagueGameLog": 30 * 60,
+    "CommonPlayerInfo": 6 * 3600,
+    "PlayerProfileV2": 60 * 60,
+}
+# Stale-while-revalidate: once past its TTL, an entry of these endpoints is
+# still served (and refreshed in the background) for up to this many seconds.
+_SWR_MAX_STALE = {
+    "TeamGameLog": 6 * 3600,
+    "LeagueDashPlayerStats": 6 * 3600,
+    "LeagueDashTeamStats": 6 * 3600,
+}
+
+def cache_ttl(endpoint_cls, kwargs: dict) -> int:
+    season = season_of(kwargs)
+    if season and is_completed_season(season):
+        return _PAST_SEASON_TTL
+    return _ENDPOINT_TTLS.get(endpoint_cls.__name__, _LIVE_SEASON_TTL)
+
+RESPONSE_CACHE = ResponseCache(min(CACHE_MAX_BYTES, SHARED_CACHE_L1_BYTES) if SHARED_CACHE.directory else CACHE_MAX_BYTES)
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the
+    function, everyone else arriving before it finishes waits and shares its
+    result (or its exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call["done"].set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+UPSTREAM_FLIGHTS = SingleFlight()
+
+def _load_frames(endpoint_cls, key, kwargs: dict) -> dict:
+    """
+    Cache-miss path: a fresh copy another worker put in the shared cache, the
+    warehouse for completed seasons, else stats.nba.com. Only the worker
+    holding the shared lease calls upstream; the others wait for its result.
+    """
+    season = season_of(kwargs)
+    ttl = cache_ttl(endpoint_cls, kwargs)
+    name = endpoint_cls.__name__
+    frames, fresh, stored_at = SHARED_CACHE.get(key)
+    if fresh:
+        CACHE_RESULTS.inc(name, "shared")
+        RESPONSE_CACHE.set(key, frames, ttl, stored_at=stored_at)
+        return frames
+
+    if season and is_completed_season(season):
+        frames = warehouse_read(endpoint_cls, kwargs)
+        if frames is not None:
+            CACHE_RESULTS.inc(name, "warehouse")
+            RESPONSE_CACHE.set(key, frames, ttl)
+            return frames
+
+    started = _now()
+    token = SHARED_CACHE.lease(key, REQUEST_DEADLINE_SECONDS)
+    if token is None:
+        frames = SHARED_CACHE.wait_for(key, since=started, timeout=REQUEST_DEADLINE_SECONDS)
+        if frames is not None:
+            CACHE_RESULTS.inc(name, "waited")
+            RESPONSE_CACHE.set(key, frames, ttl)
+            return frames
+        # The other worker gave up or its lease ran out; fetch, holding the lease if it is free
+        token = SHARED_CACHE.lease(key, REQUEST_DEADLINE_SECONDS)
+
+    CACHE_RESULTS.inc(name, "upstream")
+    try:
+        if ASYNC_UPSTREAM:
+            return _load_frames_async(endpoint_cls, key, kwargs, ttl)
+        return store_frames(endpoint_cls, key, kwargs, endpoint_frames(nbacall_retry(endpoint_cls, **kwargs)), ttl)
+    finally:
+        if token is not None:
+            SHARED_CACHE.release(key, token)
+
+def store_frames(endpoint_cls, key, kwargs: dict, frames: dict, ttl: int) -> dict:
+    """Put a fresh upstream result in this worker's cache, the shared cache and the warehouse."""
+    RESPONSE_CACHE.set(key, frames, ttl)
+    SHARED_CACHE.set(key, endpoint_cls.__name__, frames, ttl)
+    if season_of(kwargs):
+        warehouse_write(endpoint_cls, kwargs, frames)
+    return frames
+
+def _load_frames_async(endpoint_cls, key, kwargs: dict, ttl: int) -> dict:
+    """
+    Async-mode miss: the caller waits at most REQUEST_DEADLINE_SECONDS. A call
+    that is still running after that keeps going on the event loop and fills
+    the cache and warehouse when it lands, while the caller falls back to
+    stale data (see nba_fetch) and its worker thread is free again.
+    """
+    call_kwargs = {"headers": HEADERS, "timeout": DEFAULT_TIMEOUT, **kwargs}
+    fut = ASYNC_CLIENT.submit(endpoint_cls, **call_kwargs)
+
+    def store(endpoint):
+        return store_frames(endpoint_cls, key, kwargs, endpoint_frames(endpoint), ttl)
+
+    try:
+        return store(fut.result(timeout=REQUEST_DEADLINE_SECONDS))
+    except FutureTimeout:
+        fut.add_done_callback(
+            lambda f: None if f.cancelled() or f.exception() else _REFRESH_POOL.submit(store, f.result())
+        )
+        raise TimeoutError(f"{endpoint_cls.__name__} still pending after {REQUEST_DEADLINE_SECONDS:g}s")
+
+_REFRESH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="nba-refresh")
+_REFRESHING = set()
+_REFRESHING_LOCK = threading.Lock()
+
+def schedule_refresh(endpoint_cls, key, kwargs: dict):
+    """Reload one cache entry in the background, at most once at a time per key."""
+    with _REFRESHING_LOCK:
+        if key in _REFRESHING:
+            return
+        _REFRESHING.add(key)
+
+    def refresh():
+        try:
+            UPSTREAM_FLIGHTS.do(key, lambda: _load_frames(endpoint_cls, key, kwargs))
+        except Exception as e:
+            print(f"[WARN] background refresh of {endpoint_cls.__name__} failed: {e}")
+        finally:
+            with _REFRESHING_LOCK:
+                _REFRESHING.discard(key)
+
+    _REFRESH_POOL.submit(refresh)
+
+def nba_fetch(endpoint_cls, **kwargs) -> NBAFrames:
+    """
+    Cached nba_api call. Lookup order: in-memory cache, the host's shared cache,
+    then the season warehouse for completed seasons, then stats.nba.com.
+    Concurrent misses for the same request share one upstream call. If that
+    call fails, an expired cache entry or the warehouse copy is served instead
+    of the error.
+    Endpoints in _SWR_MAX_STALE return expired entries right away and refresh
+    them in the background.
+    """
+    name = endpoint_cls.__name__
+    started = time.perf_counter()
+    key = (name, tuple(request_params(kwargs).items()))
+    max_stale = _SWR_MAX_STALE.get(name, 0)
+    frames, fresh = RESPONSE_CACHE.get(key, max_stale=max_stale)
+    if frames is None and max_stale:
+        frames, fresh, stored_at = SHARED_CACHE.get(key, max_stale=max_stale)
+        if frames is not None:
+            RESPONSE_CACHE.set(key, frames, cache_ttl(endpoint_cls, kwargs), stored_at=stored_at)
+    if frames is not None:
+        result = "hit" if fresh else "stale"
+        CACHE_RESULTS.inc(name, result)
+        if not fresh:
+            schedule_refresh(endpoint_cls, key, kwargs)
+        record_fetch(name, started, result)
+        return NBAFrames(frames)
+
+    result = "miss"
+    try:
+        frames = UPSTREAM_FLIGHTS.do(key, lambda: _load_frames(endpoint_cls, key, kwargs))
+    except Exception as e:
+        frames = RESPONSE_CACHE.get_stale(key)
+        if frames is None:
+            frames = SHARED_CACHE.get(key, max_stale=None)[0]
+        if frames is None and season_of(kwargs):
+            frames = warehouse_read(endpoint_cls, kwargs)
+        if frames is None:
+            record_fetch(name, started, "error")
+            raise
+        result = "fallback"
+        CACHE_RESULTS.inc(name, result)
+        print(f"[WARN] {name} failed ({e}); serving cached copy")
+    record_fetch(name, started, result)
+    return NBAFrames(frames)
+
+def record_fetch(name: str, started: float, result: str):
+    elapsed = time.perf_counter() - started
+    FETCH_LATENCY.observe(elapsed, name)
+    instrumentation.add_timing(f"nba-{name}", elapsed, result)
+
+# ------------------------------------------------------------------------------
+# Parallel fan-out of independent upstream calls within one request
+# ------------------------------------------------------------------------------
+FANOUT_WORKERS = int(os.environ.get("COURTVISION_FANOUT_WORKERS", 16))
+REQUEST_DEADLINE_SECONDS = float(os.environ.get("COURTVISION_REQUEST_DEADLINE", 20))
+
+_FANOUT_POOL = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="nba-fanout")
+
+def fetch_source(source, kwargs: dict):
+    """nba_fetch for an endpoint class; any other callable is just called."""
+    if isinstance(source, type) and issubclass(source, Endpoint):
+        return nba_fetch(source, **kwargs)
+    started = time.perf_counter()
+    try:
+        return source(**kwargs)
+    finally:
+        instrumentation.add_timing(source.__name__, time.perf_counter() - started)
+
+def fetch_parallel(calls: dict, deadline: float) -> dict:
+    """
+    Run independent nba_fetch calls concurrently.
+    `calls` maps a label to (endpoint class, kwargs); `deadline` is an absolute
+    _now() timestamp. A plain function (e.g. team_game_log) can stand in for
+    the endpoint class; it is called with the kwargs and its result returned
+    as is. Returns label -> NBAFrames, with None for calls that failed or were
+    still running at the deadline. Late calls keep running in the pool
+    and land in the response cache for the next request.
+    """
+    # Each task runs in a copy of the caller's context so its timings count toward this request
+    futures = {
+        label: _FANOUT_POOL.submit(contextvars.copy_context().run, fetch_source, endpoint_cls, kwargs)
+        for label, (endpoint_cls, kwargs) in calls.items()
+    }
+    wait(futures.values(), timeout=max(0.0, deadline - _now()))
+
+    results = {}
+    for label, fut in futures.items():
+        endpoint_name = calls[label][0].__name__
+        if not fut.done():
+            print(f"[WARN] {endpoint_name} missed the request deadline; returning partial results")
+            results[label] = None
+        elif fut.exception() is not None:
+            print(f"[WARN] {endpoint_name} failed: {fut.exception()}")
+            results[label] = None
+        else:
+            results[label] = fut.result()
+    return results
+
+# ------------------------------------------------------------------------------
+# Game logs: per-season store kept current with incremental (date_from) syncs
+# ------------------------------------------------------------------------------
+class GameLogStore:
+    """
+    Season game logs keyed by (endpoint, season, team_id). The first load is the
+    full season (warehouse or upstream); after that a sync only asks
+    stats.nba.com for games on or after the latest GAME_DATE already held and
+    upserts them on (GAME_ID, TEAM_ID), so repeating a sync changes nothing.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.full_loads = 0
+        self.delta_syncs = 0
+        self.delta_rows = 0
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, df: pd.DataFrame, name: str, synced: float = None):
+        with self._lock:
+            self._entries[key] = {"df": df, "name": name, "synced": _now() if synced is None else synced}
+            return self._entries[key]
+
+    def count(self, full_loads: int = 0, delta_syncs: int = 0, delta_rows: int = 0):
+        with self._lock:
+            self.full_loads += full_loads
+            self.delta_syncs += delta_syncs
+            self.delta_rows += delta_rows
+
+    def touch(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]["synced"] = _now()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "logs": len(self._entries),
+                "rows": int(sum(len(e["df"]) for e in self._entries.values())),
+                "full_loads": self.full_loads,
+                "delta_syncs": self.delta_syncs,
+                "delta_rows": self.delta_rows,
+            }
+
+GAME_LOGS = GameLogStore()
+
+def _column(df: pd.DataFrame, name: str):
+    """TeamGameLog spells its ids Game_ID / Team_ID; LeagueGameLog uses GAME_ID / TEAM_ID."""
+    for c in df.columns:
+        if c.upper() == name:
+            return c
+    return None
+
+def game_dates(df: pd.DataFrame) -> pd.Series:
+    """GAME_DATE parsed from either 'APR 14, 2024' (TeamGameLog) or '2024-04-14' (LeagueGameLog)."""
+    return pd.to_datetime(df["GAME_DATE"], errors="coerce", format="mixed")
+
+def upsert_games(current: pd.DataFrame, new: pd.DataFrame, newest_first: bool = True) -> pd.DataFrame:
+    """
+    current + new with one row per (GAME_ID, TEAM_ID), new rows winning, in the
+    upstream order (TeamGameLog is newest first, LeagueGameLog oldest first).
+    TeamGameLog's running W/L/W_PCT columns are recomputed since a date-bounded
+    response counts from its first row.
+    """
+    if current is None or current.empty:
+        merged = new
+    elif new is None or new.empty:
+        return current
+    else:
+        merged = pd.concat([current, new], ignore_index=True)
+    keys = [c for c in (_column(merged, "GAME_ID"), _column(merged, "TEAM_ID")) if c]
+    if keys:
+        merged = merged.drop_duplicates(subset=keys, keep="last")
+
+    game_ids = merged[keys[0]].astype(str).to_numpy() if keys else np.zeros(len(merged))
+    order = np.lexsort((game_ids, game_dates(merged).to_numpy()))
+    merged = merged.iloc[order].reset_index(drop=True)
+    if {"W", "L", "WL"} <= set(merged.columns):
+        wins = (merged["WL"] == "W").cumsum()
+        losses = (merged["WL"] == "L").cumsum()
+        merged["W"] = wins
+        merged["L"] = losses
+        if "W_PCT" in merged.columns:
+            merged["W_PCT"] = np.round(metrics.ratio(wins, wins + losses), 3)
+    return merged.iloc[::-1].reset_index(drop=True) if newest_first else merged
+
+def game_log_kwargs(endpoint_cls, season: str, team_id=None) -> dict:
+    """The kwargs the routes and ingest use, so cache and warehouse keys line up."""
+    if team_id is not None or endpoint_cls is TeamGameLog:
+        return {"team_id": int(team_id), "season": season, "season_type_all_star": "Regular Season"}
+    return {"season": season, "season_type_all_star": "Regular Season", "league_id": "00"}
+
+def _delta_sync_game_log(endpoint_cls, season: str, team_id, kwargs: dict, entry: dict, timeout: int) -> dict:
+    """Fetch games since the last one held, merge them in and publish the result."""
+    key = (endpoint_cls.__name__, season, kwargs.get("team_id"))
+    df = entry["df"]
+    dates = game_dates(df) if not df.empty else pd.Series(dtype="datetime64[ns]")
+    last = dates.max() if len(dates) else pd.NaT
+    delta_kwargs = dict(kwargs)
+    if pd.notna(last):
+        # Inclusive of the last known day: games still in progress then are re-read
+        delta_kwargs["date_from_nullable"] = last.strftime("%m/%d/%Y")
+    try:
+        resp = nbacall_retry(endpoint_cls, timeout=timeout, **delta_kwargs)
+        new = endpoint_frames(resp).get(entry["name"], pd.DataFrame())
+    except Exception as e:
+        print(f"[WARN] game log sync {endpoint_cls.__name__} {season} {team_id}: {e}")
+        GAME_LOGS.touch(key)  # retry after another TTL rather than on every request
+        return entry
+
+    GAME_LOGS.count(delta_syncs=1, delta_rows=len(new))
+    merged = upsert_games(df, new, newest_first=endpoint_cls is TeamGameLog)
+    if not merged.equals(df):
+        warehouse_write(endpoint_cls, kwargs, {entry["name"]: merged})
+    SHARED_CACHE.set(("game_log",) + key, endpoint_cls.__name__, {entry["name"]: merged},
+                     cache_ttl(endpoint_cls, kwargs))
+    return GAME_LOGS.put(key, merged, entry["name"])
+
+def schedule_game_log_sync(endpoint_cls, season: str, team_id, kwargs: dict, timeout: int):
+    """Delta-sync one held game log in the background, at most once at a time per log."""
+    key = (endpoint_cls.__name__, season, kwargs.get("team_id"))
+    refresh_key = ("game_log_sync",) + key
+    with _REFRESHING_LOCK:
+        if refresh_key in _REFRESHING:
+            return
+        _REFRESHING.add(refresh_key)
+
+    def refresh():
+        try:
+            entry = GAME_LOGS.get(key)
+            if entry is not None and _now() - entry["synced"] >= cache_ttl(endpoint_cls, kwargs):
+                _delta_sync_game_log(endpoint_cls, season, team_id, kwargs, entry, timeout)
+        except Exception as e:
+            print(f"[WARN] background game log sync {endpoint_cls.__name__} {season} {team_id}: {e}")
+        finally:
+            with _REFRESHING_LOCK:
+                _REFRESHING.discard(refresh_key)
+
+    _REFRESH_POOL.submit(refresh)
+
+def sync_game_log(endpoint_cls, season: str, team_id=None, timeout: int = 30) -> NBAFrames:
+    """
+    Current game log for a season (TeamGameLog with team_id, LeagueGameLog without).
+    Completed seasons load once. Once its TTL passes, a live-season log is
+    returned as held and re-synced incrementally in the background; only a
+    cold load (nothing held, or a warehouse copy that may be days old) waits
+    for upstream. If a delta sync fails the log already held is kept. Synced
+    logs go to the shared cache, where other workers pick them up instead of
+    running their own sync.
+    """
+    kwargs = game_log_kwargs(endpoint_cls, season, team_id)
+    key = (endpoint_cls.__name__, season, kwargs.get("team_id"))
+
+    shared_key = ("game_log",) + key
+
+    def load():
+        entry = GAME_LOGS.get(key)
+        if entry is None or (
+            not is_completed_season(season) and _now() - entry["synced"] >= cache_ttl(endpoint_cls, kwargs)
+        ):
+            # Another worker may have synced this log more recently
+            frames, _, stored_at = SHARED_CACHE.get(shared_key, max_stale=None)
+            if frames is not None and (entry is None or stored_at > entry["synced"]):
+                name, df = next(iter(frames.items()))
+                entry = GAME_LOGS.put(key, df, name, synced=stored_at)
+
+        if entry is None:
+            frames = warehouse_read(endpoint_cls, kwargs)
+            if frames is None:
+                frames = nba_fetch(endpoint_cls, timeout=timeout, **kwargs).frames
+                GAME_LOGS.count(full_loads=1)
+                name, df = next(iter(frames.items()))
+                SHARED_CACHE.set(shared_key, endpoint_cls.__name__, frames, cache_ttl(endpoint_cls, kwargs))
+                return GAME_LOGS.put(key, df, name)
+            # A live-season warehouse copy may be days old, so it is synced right away
+            name, df = next(iter(frames.items()))
+            entry = GAME_LOGS.put(key, df, name, synced=None if is_completed_season(season) else 0)
+            if not is_completed_season(season):
+                return _delta_sync_game_log(endpoint_cls, season, team_id, kwargs, entry, timeout)
+
+        if not is_completed_season(season) and _now() - entry["synced"] >= cache_ttl(endpoint_cls, kwargs):
+            schedule_game_log_sync(endpoint_cls, season, team_id, kwargs, timeout)
+        return entry
+
+    entry = UPSTREAM_FLIGHTS.do(("game_log",) + key, load)
+    return NBAFrames({entry["name"]: entry["df"]})
+
+# ------------------------------------------------------------------------------
+# Per-team season aggregates computed once per game-log version
+# ------------------------------------------------------------------------------
+# Regular-season months in calendar order of the season: (month, name, short name)
+SEASON_MONTHS = [
+    (10, "October", "Oct"), (11, "November", "Nov"), (12, "December", "Dec"),
+    (1, "January", "Jan"), (2, "February", "Feb"), (3, "March", "Mar"), (4, "April", "Apr"),
+]
+EAST_TEAMS = {"ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DET", "IND", "MIA", "MIL", "NYK", "ORL", "PHI", "TOR", "WAS"}
+
+def _record(wins, losses, pts_avg) -> dict:
+    return {"wins": int(wins), "losses": int(losses), "pts_avg": round(float(pts_avg), 1) if pd.notna(pts_avg) else 0.0}
+
+def empty_team_aggregates() -> dict:
+    return {
+        "games": 0, "wins": 0, "losses": 0,
+        "monthly": {},
+        "home": _record(0, 0, None), "road": _record(0, 0, None),
+        "east_pts_avg": 0.0, "west_pts_avg": 0.0,
+    }
+
+def build_team_aggregates(df: pd.DataFrame) -> dict:
+    """
+    TEAM_ID -> season aggregates for every team in a game log (league or team):
+    overall W/L, per-month W/L and points, home/road records and points, and
+    points against East/West opponents. GAME_DATE is parsed and MATCHUP split
+    once for the whole log, and each figure is one grouped pass over it.
+    """
+    team_col = _column(df, "TEAM_ID") if not df.empty else None
+    if team_col is None or "WL" not in df.columns:
+        return {}
+
+    matchup = df["MATCHUP"].fillna("").astype(str) if "MATCHUP" in df.columns else pd.Series("", index=df.index)
+    frame = pd.DataFrame({
+        "team": pd.to_numeric(df[team_col], errors="coerce").fillna(-1).astype(np.int64).to_numpy(),
+        "month": game_dates(df).dt.month.fillna(0).astype(np.int64).to_numpy(),
+        "win": (df["WL"] == "W").to_numpy(),
+        "loss": (df["WL"] == "L").to_numpy(),
+        "pts": pd.to_numeric(df["PTS"], errors="coerce").to_numpy() if "PTS" in df.columns else np.nan,
+        "home": matchup.str.contains("vs", regex=False).to_numpy(),
+        "road": matchup.str.contains("@", regex=False).to_numpy(),
+        # Opponent is the trailing abbreviation of "LAL vs. BOS" / "LAL @ BOS"
+        "east": matchup.str[-3:].isin(EAST_TEAMS).to_numpy(),
+    })
+    sums = {"win": ("win", "sum"), "loss": ("loss", "sum"), "pts": ("pts", "mean")}
+
+    out = {}
+    for team, row in frame.groupby("team").agg(games=("win", "size"), **sums).iterrows():
+        agg = empty_team_aggregates()
+        agg.update(games=int(row["games"]), wins=int(row["win"]), losses=int(row["loss"]))
+        out[int(team)] = agg
+
+    for (team, month), row in frame.groupby(["team", "month"]).agg(**sums).iterrows():
+        out[int(team)]["monthly"][int(month)] = _record(row["win"], row["loss"], row["pts"])
+    for flag in ("home", "road"):
+        for team, row in frame[frame[flag]].groupby("team").agg(**sums).iterrows():
+            out[int(team)][flag] = _record(row["win"], row["loss"], row["pts"])
+    for (team, east), pts in frame.groupby(["team", "east"])["pts"].mean().items():
+        out[int(team)]["east_pts_avg" if east else "west_pts_avg"] = round(float(pts), 1) if pd.notna(pts) else 0.0
+    return out
+
+# ------------------------------------------------------------------------------
+# Per-team game logs served from one LeagueGameLog per season
+# ------------------------------------------------------------------------------
+class LeagueGameLogIndex:
+    """
+    A season's LeagueGameLog sorted by (TEAM_ID, newest game first) with each
+    team's row range precomputed, so a team's log is a contiguous slice of one
+    columnar frame rather than a filter over ~2,500 rows or its own upstream call.
+    """
+
+    def __init__(self, season: str, source: pd.DataFrame):
+        self.season = season
+        self.source = source
+        self._aggregates = None
+        self._lock = threading.Lock()
+        if source.empty or "TEAM_ID" not in source.columns:
+            self.frame = source
+            self._ranges = {}
+            return
+
+        team_ids = pd.to_numeric(source["TEAM_ID"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+        dates = game_dates(source).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        game_ids = pd.to_numeric(source["GAME_ID"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+        order = np.lexsort((-game_ids, -dates, team_ids))
+        self.frame = source.iloc[order].reset_index(drop=True)
+
+        sorted_ids = team_ids[order]
+        ids, starts, counts = np.unique(sorted_ids, return_index=True, return_counts=True)
+        self._ranges = {int(t): (int(s), int(s + c)) for t, s, c in zip(ids, starts, counts)}
+
+    def team_ids(self) -> list:
+        return sorted(self._ranges)
+
+    def team(self, team_id: int) -> pd.DataFrame:
+        """That team's games, newest first (a view; copy before adding columns)."""
+        start, end = self._ranges.get(int(team_id), (0, 0))
+        return self.frame.iloc[start:end]
+
+    def aggregates(self, team_id: int) -> dict:
+        """Season aggregates for one team; all 30 are built together on first use."""
+        with self._lock:
+            if self._aggregates is None:
+                self._aggregates = build_team_aggregates(self.frame)
+        return self._aggregates.get(int(team_id)) or empty_team_aggregates()
+
+_GAMELOG_INDEXES = OrderedDict()  # season -> LeagueGameLogIndex
+_GAMELOG_INDEXES_LOCK = threading.Lock()
+_GAMELOG_INDEXES_MAX = 8
+
+def league_game_log_index(season: str) -> LeagueGameLogIndex:
+    """Index over the season's synced LeagueGameLog, rebuilt only when the log changes."""
+    source = sync_game_log(LeagueGameLog, season).get_data_frames()[0]
+    with _GAMELOG_INDEXES_LOCK:
+        index = _GAMELOG_INDEXES.get(season)
+        if index is not None and index.source is source:
+            _GAMELOG_INDEXES.move_to_end(season)
+            return index
+
+    index = LeagueGameLogIndex(season, source)
+    with _GAMELOG_INDEXES_LOCK:
+        _GAMELOG_INDEXES[season] = index
+        _GAMELOG_INDEXES.move_to_end(season)
+        while len(_GAMELOG_INDEXES) > _GAMELOG_INDEXES_MAX:
+            _GAMELOG_INDEXES.popitem(last=False)
+    return index
+
+def team_game_log(team_id, season: str, timeout: int = 30) -> pd.DataFrame:
+    """
+    One team's regular-season games, newest first. With GAMELOG_SOURCE "league"
+    this is a slice of the season's LeagueGameLog (one upstream call covers all
+    30 teams); with "team" it is that team's own TeamGameLog.
+    """
+    if GAMELOG_SOURCE == "league":
+        return league_game_log_index(season).team(int(team_id))
+    return sync_game_log(TeamGameLog, season, team_id=int(team_id), timeout=timeout).get_data_frames()[0]
+
+_TEAM_AGGREGATES = OrderedDict()  # (team_id, season) -> (source log, aggregates)
+_TEAM_AGGREGATES_LOCK = threading.Lock()
+_TEAM_AGGREGATES_MAX = 256
+
+def team_season_aggregates(team_id, season: str, timeout: int = 30) -> dict:
+    """
+    Aggregates for one team-season (see build_team_aggregates), recomputed only
+    when the underlying game log changes. Callers must not mutate the result.
+    """
+    team_id = int(team_id)
+    if GAMELOG_SOURCE == "league":
+        return league_game_log_index(season).aggregates(team_id)
+
+    source = sync_game_log(TeamGameLog, season, team_id=team_id, timeout=timeout).get_data_frames()[0]
+    key = (team_id, season)
+    with _TEAM_AGGREGATES_LOCK:
+        entry = _TEAM_AGGREGATES.get(key)
+        if entry is not None and entry[0] is source:
+            _TEAM_AGGREGATES.move_to_end(key)
+            return entry[1]
+
+    agg = build_team_aggregates(source).get(team_id) or empty_team_aggregates()
+    with _TEAM_AGGREGATES_LOCK:
+        _TEAM_AGGREGATES[key] = (source, agg)
+        _TEAM_AGGREGATES.move_to_end(key)
+        while len(_TEAM_AGGREGATES) > _TEAM_AGGREGATES_MAX:
+            _TEAM_AGGREGATES.popitem(last=False)
+    return agg
+
+INGEST_DATASETS = ("players", "teams", "gamelogs", "shots")
+INGEST_CHECKPOINT = os.path.join(WAREHOUSE_DIR, "_ingest", "checkpoint.jsonl")
+INGEST_CIRCUIT_WAITS = 3  # open-circuit waits per call before it is recorded as failed
+
+def season_ingest_requests(season: str, datasets=("players", "teams", "gamelogs")):
+    """
+    (endpoint class, kwargs) pairs that the data routes issue for one season.
+    The kwargs must match the routes' calls so the warehouse keys line up.
+    Shots are per player and need the season's player list; see shot_ingest_requests.
+    """
+    reqs = []
+    if "players" in datasets:
+        reqs.append((leaguedashplayerstats.LeagueDashPlayerStats,
+                     {"season": season, "season_type_all_star": "Regular Season"}))
+    if "teams" in datasets:
+        reqs.append((leaguedashteamstats.LeagueDashTeamStats,
+                     {"season": season, "season_type_all_star": "Regular Season",
+                      "per_mode_detailed": "PerGame", "league_id_nullable": "00"}))
+        reqs.append((teamestimatedmetrics.TeamEstimatedMetrics,
+                     {"season": season, "season_type": "Regular Season"}))
+    if "gamelogs" in datasets:
+        reqs.append((LeagueGameLog,
+                     {"season": season, "season_type_all_star": "Regular Season", "league_id": "00"}))
+    for t in teams.get_teams():
+        tid = int(t["id"])
+        if "gamelogs" in datasets and GAMELOG_SOURCE != "league":
+            reqs.append((TeamGameLog, {"team_id": tid, "season": season, "season_type_all_star": "Regular Season"}))
+        if "teams" in datasets:
+            reqs.append((TeamPlayerDashboard, {"team_id": tid, "season": season}))
+            reqs.append((TeamDashboardByGeneralSplits, {"team_id": tid, "season": season,
+                         "season_type_all_star": "Regular Season", "league_id_nullable": "00"}))
+    return reqs
+
+def shot_ingest_requests(season: str, player_ids):
+    """ShotChartDetail calls for get_shot_chart(), one per player."""
+    return [
+        (shotchartdetail.ShotChartDetail,
+         {"team_id": 0, "player_id": int(pid), "season_nullable": season,
+          "season_type_all_star": "Regular Season", "context_measure_simple": "FGA"})
+        for pid in player_ids
+    ]
+
+def parse_seasons(spec: str):
+    """
+    '2015-16:2025-26' (inclusive range, either order), '2019-20,2021-22' or a mix.
+    Returned newest -> oldest, restricted to get_seasons().
+    """
+    known = get_seasons()
+    wanted = set()
+    for part in (p.strip() for p in spec.split(",")):
+        if not part:
+            continue
+        if ":" in part:
+            lo, hi = sorted(x.strip() for x in part.split(":", 1))
+            wanted.update(s for s in known if lo <= s <= hi)
+        elif part in known:
+            wanted.add(part)
+        else:
+            raise click.BadParameter(f"unknown season {part!r}")
+    return [s for s in known if s in wanted]
+
+def ingest_key(endpoint_cls, kwargs) -> str:
+    return f"{endpoint_cls.__name__}/{season_of(kwargs)}/{os.path.basename(warehouse_path(endpoint_cls, kwargs))}"
+
+class IngestCheckpoint:
+    """
+    Append-only log of finished ingest calls, so an interrupted backfill resumes
+    where it stopped. Completed seasons stay done; live-season entries expire
+    with the live-season cache TTL so a rerun refreshes them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a killed run
+                    if entry.get("ok"):
+                        self.done[entry["key"]] = entry["ts"]
+
+    def is_done(self, key: str, season: str) -> bool:
+        ts = self.done.get(key)
+        if ts is None:
+            return False
+        return is_completed_season(season) or _now() - ts < _LIVE_SEASON_TTL
+
+    def record(self, key: str, ok: bool, error: str = None):
+        entry = {"key": key, "ok": ok, "ts": _now()}
+        if error:
+            entry["error"] = error[:200]
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            if ok:
+                self.done[key] = entry["ts"]
+
+def run_ingest(reqs, checkpoint: IngestCheckpoint, workers: int, retries: int, force: bool, label: str):
+    """Fetch and warehouse `reqs` on a small pool; every call passes UPSTREAM_LIMITER."""
+    counts = {"written": 0, "skipped": 0, "failed": 0}
+    todo = []
+    for endpoint_cls, kwargs in reqs:
+        key = ingest_key(endpoint_cls, kwargs)
+        season = season_of(kwargs)
+        if not force and (
+            checkpoint.is_done(key, season)
+            or (is_completed_season(season) and warehouse_read(endpoint_cls, kwargs) is not None)
+        ):
+            counts["skipped"] += 1
             continue
+        todo.append((key, endpoint_cls, kwargs))
+
+    def one(key, endpoint_cls, kwargs):
+        waits = 0
+        while True:
+            try:
+                endpoint = nbacall_retry(endpoint_cls, retries=retries, backoff=1.0, timeout=30, **kwargs)
+                break
+            except CircuitOpen as e:
+                # A backfill can afford to wait for the endpoint to recover, but not
+                # forever: an endpoint that keeps failing is checkpointed as failed
+                waits += 1
+                if waits > INGEST_CIRCUIT_WAITS:
+                    raise
+                time.sleep(e.retry_in)
+        frames = endpoint_frames(endpoint)
+        if not warehouse_write(endpoint_cls, kwargs, frames):
+            raise RuntimeError("warehouse write failed")
+
+    started = _now()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(one, *item): item for item in todo}
+        for n, fut in enumerate(as_completed(futures), 1):
+            key = futures[fut][0]
+            try:
+                fut.result()
+                counts["written"] += 1
+                checkpoint.record(key, True)
+            except Exception as e:
+                counts["failed"] += 1
+                checkpoint.record(key, False, str(e))
+                print(f"[WARN] ingest {key}: {e}")
+            if n % 25 == 0 or n == len(todo):
+                rate = n / max(_now() - started, 1e-9)
+                click.echo(f"  {label}: {n}/{len(todo)} fetched ({rate:.2f}/s)")
+    return counts
+
+@app.cli.command("ingest")
+@click.option("--season", "seasons", multiple=True, help="Season like 2023-24; repeatable.")
+@click.option("--seasons", "season_spec", default=None,
+              help="Range and/or list, e.g. 2015-16:2025-26 or 2019-20,2021-22. Defaults to the newest season.")
+@click.option("--datasets", default="players,teams,gamelogs", show_default=True,
+              help=f"Comma-separated subset of {','.join(INGEST_DATASETS)}.")
+@click.option("--rate", type=float, default=1.0, show_default=True, help="Upstream requests per second.")
+@click.option("--burst", type=int, default=2, show_default=True, help="Token bucket size.")
+@click.option("--workers", type=int, default=2, show_default=True, help="Concurrent upstream calls.")
+@click.option("--retries", type=int, default=5, show_default=True, help="Attempts per call.")
+@click.option("--checkpoint", "checkpoint_path", default=INGEST_CHECKPOINT, show_default=True,
+              help="Resume log; finished calls listed here are skipped.")
+@click.option("--force", is_flag=True, help="Re-fetch entries that are already in the warehouse or checkpoint.")
+def ingest_command(seasons, season_spec, datasets, rate, burst, workers, retries, checkpoint_path, force):
+    """Backfill the season warehouse from stats.nba.com, politely."""
+    selected = list(seasons) + (parse_seasons(season_spec) if season_spec else [])
+    selected = list(dict.fromkeys(selected)) or [get_seasons()[0]]
+    datasets = [d.strip() for d in datasets.split(",") if d.strip()]
+    unknown = set(datasets) - set(INGEST_DATASETS)
+    if unknown:
+        raise click.BadParameter(f"unknown datasets: {', '.join(sorted(unknown))}")
+
+    CACHE_WARMER.stop()
+    UPSTREAM_LIMITER.configure(rate=rate, burst=burst)
+    checkpoint = IngestCheckpoint(checkpoint_path)
+    click.echo(f"Ingesting {len(selected)} season(s) [{', '.join(datasets)}] at {rate:g} req/s; "
+               f"{len(checkpoint.done)} calls already checkpointed")
+
+    totals = {"written": 0, "skipped": 0, "failed": 0}
+    for season in selected:
+        counts = run_ingest(season_ingest_requests(season, datasets), checkpoint, workers, retries, force, season)
+        if "shots" in datasets:
+            # The shot list is per player, so it comes from the season's player table
+            try:
+                player_df = nba_fetch(leaguedashplayerstats.LeagueDashPlayerStats,
+                                      season=season, season_type_all_star="Regular Season").get_data_frames()[0]
+                player_ids = player_df["PLAYER_ID"].tolist() if "PLAYER_ID" in player_df.columns else []
+            except Exception as e:
+                print(f"[WARN] ingest shots {season}: no player list ({e})")
+                player_ids = []
+            shots = run_ingest(shot_ingest_requests(season, player_ids), checkpoint, workers, retries, force,
+                               f"{season} shots")
+            counts = {k: counts[k] + shots[k] for k in counts}
+        click.echo(f"{season}: {counts['written']} written, {counts['skipped']} already present, {counts['failed']} failed")
+        totals = {k: totals[k] + counts[k] for k in totals}
+
+    click.echo(f"Done: {totals['written']} written, {totals['skipped']} skipped, {totals['failed']} failed; "
+               f"limiter {UPSTREAM_LIMITER.stats()}")
+
+# ------------------------------------------------------------------------------
+# League player table: per-season LeagueDashPlayerStats with derived metrics
+# ------------------------------------------------------------------------------
+PLAYER_DISPLAY_COLUMNS = [
+    "PLAYER_ID",
+    "PLAYER_NAME",
+    "TEAM_ABBREVIATION",
+    "POSITION",
+    "AGE",
+    "GP",
+    "MIN",
+    "PTS",
+    "REB",
+    "AST",
+    "STL",
+    "BLK",
+    "FG_PCT",
+    "FG3_PCT",
+    "FT_PCT",
+    "TS_PCT",
+    "EFF",
+    "USG_PCT",
+    "AST_PCT",
+    "REB_PCT",
+    "PIE",
+    "PF",
+]
+_PLAYER_PCT_COLUMNS = ["FG_PCT", "FG3_PCT", "FT_PCT"]
+_PLAYER_ROUNDED_COLUMNS = _PLAYER_PCT_COLUMNS + [
+    "TS_PCT", "EFF", "USG_PCT", "AST_PCT", "REB_PCT", "PIE",
+    "MIN", "PTS", "REB", "AST", "STL", "BLK", "PF",
+]
+
+class LeaguePlayerTable:
+    """
+    One season of LeagueDashPlayerStats with every derived column computed over
+    the whole league, plus a display copy (percentages scaled, values rounded)
+    and lowercase names for search. Requests filter and sort this in memory.
+    """
+
+    def __init__(self, season: str, source: pd.DataFrame):
+        self.season = season
+        self.source = source
+        # Content hash of the upstream table: the ETag basis for responses built from it
+        self.version = hashlib.blake2b(
+            pd.util.hash_pandas_object(source, index=False).to_numpy().tobytes(), digest_size=12
+        ).hexdigest()
+        self.full = metrics.add_league_metrics(source)
+
+        columns = [c for c in PLAYER_DISPLAY_COLUMNS if c in self.full.columns]
+        self.sort_values = self.full[columns].fillna(0)
+        display = self.sort_values.copy()
+        pct_cols = [c for c in _PLAYER_PCT_COLUMNS if c in display.columns]
+        display[pct_cols] = display[pct_cols] * 100
+        round_cols = [c for c in _PLAYER_ROUNDED_COLUMNS if c in display.columns]
+        display[round_cols] = display[round_cols].round(1)
+        self.display = display
+        self.names_lc = self.full["PLAYER_NAME"].str.lower() if "PLAYER_NAME" in self.full.columns else None
+
+    def query(self, search: str = "", team: str = "all", position: str = "all", sort_by: str = None,
+              offset: int = 0, limit: int = None, fields: list = None):
+        """
+        Display rows matching the filters, sorted descending by the unrounded
+        sort_by, sliced to [offset, offset + limit) and projected to `fields`.
+        Returns (rows DataFrame, total number of matches); ties keep table order.
+        When only the first pages of a numeric sort are needed, np.partition
+        finds the cut-off key and only rows at or above it are sorted.
+        """
+        mask = np.ones(len(self.full), dtype=bool)
+        if search and self.names_lc is not None:
+            mask &= self.names_lc.str.contains(search, regex=False, na=False).to_numpy()
+        if team != "all":
+            mask &= (self.full["TEAM_ABBREVIATION"] == team).to_numpy()
+        if position != "all" and "POSITION" in self.full.columns:
+            mask &= self.full["POSITION"].str.contains(position, regex=False, na=False).to_numpy()
+
+        rows = np.flatnonzero(mask)
+        total = len(rows)
+        end = total if limit is None else min(total, offset + limit)
+
+        if sort_by in self.sort_values.columns:
+            # Ties keep table order, so every page is a slice of the same full sort
+            keys = self.sort_values[sort_by].to_numpy()[rows]
+            if np.issubdtype(keys.dtype, np.number):
+                if 0 < end < total:
+                    # Every row tied with the end-th largest key stays a candidate
+                    cutoff = -np.partition(-keys, end - 1)[end - 1]
+                    candidates = keys >= cutoff
+                    rows, keys = rows[candidates], keys[candidates]
+                rows = rows[np.lexsort((rows, -keys))]
+            else:
+                backwards = np.argsort(keys[::-1], kind="stable")[::-1]
+                rows = rows[::-1][backwards]
+        rows = rows[offset:end]
+
+        display = self.display
+        if fields:
+            display = display[[c for c in fields if c in display.columns]]
+        return display.iloc[rows], total
+
+    def export_rows(self, teams=None, sort_by: str = None) -> pd.DataFrame:
+        """
+        Full-precision rows (every LeagueDashPlayerStats column plus the derived
+        metrics) with a leading SEASON column, limited to the `teams`
+        abbreviations if given and sorted descending by sort_by.
+        """
+        df = self.full
+        if teams:
+            df = df[df["TEAM_ABBREVIATION"].isin(teams)]
+        if sort_by in df.columns:
+            df = df.sort_values(by=sort_by, ascending=False, kind="stable")
+        return pd.concat([pd.DataFrame({"SEASON": self.season}, index=df.index), df], axis=1)
+
+_LEAGUE_TABLES = OrderedDict()  # season -> LeaguePlayerTable
+_LEAGUE_TABLES_LOCK = threading.Lock()
+_LEAGUE_TABLES_MAX = 8
+
+def get_league_player_table(season: str) -> LeaguePlayerTable:
+    """
+    Enriched league table for a season. It is rebuilt only when nba_fetch hands
+    back a different LeagueDashPlayerStats frame (i.e. the cached response was
+    refreshed), so repeated requests reuse the same table.
+    """
+    source = nba_fetch(
+        leaguedashplayerstats.LeagueDashPlayerStats,
+        season=season,
+        season_type_all_star="Regular Season",
+    ).get_data_frames()[0]
+
+    with _LEAGUE_TABLES_LOCK:
+        table = _LEAGUE_TABLES.get(season)
+        if table is not None and table.source is source:
+            _LEAGUE_TABLES.move_to_end(season)
+            return table
+
+    table = LeaguePlayerTable(season, source)
+    with _LEAGUE_TABLES_LOCK:
+        _LEAGUE_TABLES[season] = table
+        _LEAGUE_TABLES.move_to_end(season)
+        while len(_LEAGUE_TABLES) > _LEAGUE_TABLES_MAX:
+            _LEAGUE_TABLES.popitem(last=False)
+    return table
+
+# ------------------------------------------------------------------------------
+# Shot charts: ShotChartDetail per player-season with memoized aggregates
+# ------------------------------------------------------------------------------
+class ShotChart:
+    """
+    Shots and league averages for one player-season. Zone/hex views are
+    computed on first use per (period, result, hex size) and kept with it.
+    """
+
+    def __init__(self, shots: pd.DataFrame, league: pd.DataFrame):
+        self.shots = shots
+        self.league = league
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def view(self, period: str, result: str, hex_size: float) -> dict:
+        key = (str(period), str(result), float(hex_size))
+        with self._lock:
+            cached = self._views.get(key)
+        if cached is not None:
+            return cached
+
+        shots = shotcharts.filter_shots(self.shots, period, result)
+        made = int(shots["SHOT_MADE_FLAG"].sum()) if not shots.empty else 0
+        view = {
+            "summary": {
+                "fga": len(shots),
+                "fgm": made,
+                "fg_pct": round(100.0 * made / len(shots), 1) if len(shots) else 0.0,
+            },
+            "zones": shotcharts.zone_summary(shots, self.league),
+            "hexbins": shotcharts.hex_bins(shots, hex_size, self.league),
+            "hex_size": hex_size,
+        }
+        with self._lock:
+            self._views[key] = view
+        return view
+
+_SHOT_CHARTS = OrderedDict()  # (player_id, season, season_type) -> (source frames, ShotChart)
+_SHOT_CHARTS_LOCK = threading.Lock()
+_SHOT_CHARTS_MAX = 256
+
+def get_shot_chart(player_id: int, season: str, season_type: str = "Regular Season") -> ShotChart:
+    """
+    ShotChart for a player-season. The raw ShotChartDetail response is cached by
+    nba_fetch; the aggregates are rebuilt only when that response changes.
+    """
+    frames = nba_fetch(
+        shotchartdetail.ShotChartDetail,
+        team_id=0,
+        player_id=int(player_id),
+        season_nullable=season,
+        season_type_all_star=season_type,
+        context_measure_simple="FGA",
+        timeout=30,
+    ).frames
+    key = (int(player_id), season, season_type)
+
+    with _SHOT_CHARTS_LOCK:
+        entry = _SHOT_CHARTS.get(key)
+        if entry is not None and entry[0] is frames:
+            _SHOT_CHARTS.move_to_end(key)
+            return entry[1]
+
+    shots = frames.get("Shot_Chart_Detail", pd.DataFrame())
+    if shots.empty:
+        shots = pd.DataFrame(columns=shotcharts.CHART_COLUMNS + shotcharts.ZONE_KEYS)
+    chart = ShotChart(shots, frames.get("LeagueAverages"))
+    with _SHOT_CHARTS_LOCK:
+        _SHOT_CHARTS[key] = (frames, chart)
+        _SHOT_CHARTS.move_to_end(key)
+        while len(_SHOT_CHARTS) > _SHOT_CHARTS_MAX:
+            _SHOT_CHARTS.popitem(last=False)
+    return chart
+
+# ------------------------------------------------------------------------------
+# API responses: fast JSON, ETag / 304, gzip and brotli
+# ------------------------------------------------------------------------------
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def dumps(value) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, default=_json_default, separators=(",", ":"))
+
+def encode_json(value) -> str:
+    """
+    JSON text for a payload whose values may include DataFrames. A DataFrame is
+    written as a list of row objects by pandas' C encoder (NaN as null), so the
+    rows never become Python dicts.
+    """
+    if isinstance(value, pd.DataFrame):
+        return value.to_json(orient="records", date_format="iso", double_precision=15)
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{dumps(str(k))}:{encode_json(v)}" for k, v in value.items()) + "}"
+    return dumps(value)
+
+def json_response(payload, status: int = 200, etag: str = None) -> Response:
+    response = Response(encode_json(payload), status=status, mimetype="application/json")
+    if etag:
+        response.set_etag(etag)
+    return response
+
+def api_etag(version: str) -> str:
+    """Strong ETag for this request (path and query) over one dataset version."""
+    return hashlib.blake2b(f"{version}|{request.full_path}".encode("utf-8"), digest_size=16).hexdigest()
+
+def _etag_matches(etag: str) -> bool:
+    # Compressed variants carry a -gzip / -br suffix on the same tag
+    return any(request.if_none_match.contains_weak(tag) for tag in (etag, f"{etag}-gzip", f"{etag}-br"))
+
+def not_modified(etag: str):
+    """A 304 response when the client already has `etag`, else None."""
+    if request.if_none_match and _etag_matches(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.vary.add("Accept-Encoding")
+        return response
+    return None
+
+def _accepted_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+@app.after_request
+def _finish_api_response(response):
+    """
+    For JSON under /api/: add a content ETag when the route did not set one,
+    answer If-None-Match with 304, and compress per Accept-Encoding.
+    """
+    if (
+        not request.path.startswith("/api/")
+        or response.status_code != 200
+        or response.mimetype != "application/json"
+        or response.is_streamed
+        or response.direct_passthrough
+    ):
+        return response
+
+    etag, _ = response.get_etag()
+    if etag is None:
+        response.add_etag()
+        etag, _ = response.get_etag()
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    response.vary.add("Accept-Encoding")
+    encoding = _accepted_encoding()
+    if encoding is None or "Content-Encoding" in response.headers:
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    if encoding == "br":
+        response.set_data(brotli.compress(body, quality=BROTLI_QUALITY))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+    response.headers["Content-Encoding"] = encoding
+    response.set_etag(f"{etag}-{encoding}")
+    return response
+
+# ------------------------------------------------------------------------------
+# Live scoreboard: one background poll shared by every visitor, pushed over SSE
+# ------------------------------------------------------------------------------
+SCOREBOARD_POLL_SECONDS = float(os.environ.get("COURTVISION_SCOREBOARD_POLL", _ENDPOINT_TTLS["ScoreboardV2"]))
+SCOREBOARD_IDLE_POLL_SECONDS = float(os.environ.get("COURTVISION_SCOREBOARD_IDLE_POLL", 60))  # no game in progress
+SCOREBOARD_IDLE_TIMEOUT = float(os.environ.get("COURTVISION_SCOREBOARD_IDLE_TIMEOUT", 300))
+SCOREBOARD_WAIT_SECONDS = 5  # longest a read waits for a poll when the snapshot is out of date
+# Each open event stream holds a server thread. Serve the app with threaded
+# workers (gunicorn -k gthread --threads N, N comfortably above SSE_MAX_STREAMS);
+# streams beyond SSE_MAX_STREAMS per worker get one snapshot and are told to
+# reconnect later, so they fall back to polling instead of starving the pool.
+SSE_HEARTBEAT_SECONDS = 15
+SSE_MAX_SECONDS = 60  # then the client reconnects with Last-Event-ID
+SSE_MAX_STREAMS = int(os.environ.get("COURTVISION_SSE_MAX_STREAMS", 8))
+SSE_RETRY_MS = 3000
+SSE_BUSY_RETRY_MS = 30000
+
+def _text(value):
+    return value.strip() if isinstance(value, str) else value
+
+def _int_or_none(value):
+    number = pd.to_numeric(value, errors="coerce")
+    return None if pd.isna(number) else int(number)
+
+def scoreboard_games(frames: dict) -> list:
+    """
+    Today's games from a ScoreboardV2 response: the GameHeader row joined with
+    each side's LineScore points. Scores are None until a game has started.
+    """
+    header = frames.get("GameHeader", pd.DataFrame())
+    line_score = frames.get("LineScore", pd.DataFrame())
+    points = {}
+    abbrs = {}
+    if not line_score.empty and {"GAME_ID", "TEAM_ID"} <= set(line_score.columns):
+        for row in frame_records(line_score):
+            side = (row["GAME_ID"], _int_or_none(row["TEAM_ID"]))
+            points[side] = _int_or_none(row.get("PTS"))
+            abbrs[side[1]] = row.get("TEAM_ABBREVIATION")
+
+    games = []
+    for g in frame_records(header.drop_duplicates("GAME_ID") if "GAME_ID" in header.columns else header):
+        game_id = g.get("GAME_ID")
+        sides = {}
+        for side in ("HOME", "VISITOR"):
+            team_id = _int_or_none(g.get(f"{side}_TEAM_ID"))
+            abbr = g.get(f"{side}_TEAM_ABBREVIATION") or _TEAM_ABBRS.get(team_id) or abbrs.get(team_id)
+            sides[side] = {"team_id": team_id, "abbr": abbr, "pts": points.get((game_id, team_id))}
+        games.append(
+            {
+                "game_id": game_id,
+                "matchup": f"{sides['VISITOR']['abbr']} @ {sides['HOME']['abbr']}",
+                "game_time": _text(g.get("GAME_TIME") or g.get("GAME_STATUS_TEXT")),
+                "arena": g.get("ARENA_NAME"),
+                "status": _int_or_none(g.get("GAME_STATUS_ID")),
+                "status_text": _text(g.get("GAME_STATUS_TEXT")),
+                "period": _int_or_none(g.get("LIVE_PERIOD")),
+                "clock": _text(g.get("LIVE_PC_TIME")) or None,
+                "home": sides["HOME"],
+                "visitor": sides["VISITOR"],
+            }
+        )
+    return games
+
+def fetch_scoreboard_games(day: datetime) -> list:
+    """The day's games, polled by SCOREBOARD through nba_fetch and its caches."""
+    return scoreboard_games(nba_fetch(ScoreboardV2, game_date=day.strftime("%m/%d/%Y"), timeout=30).frames)
+
+SCOREBOARD = ScoreboardPoller(
+    fetch_scoreboard_games, SCOREBOARD_POLL_SECONDS, SCOREBOARD_IDLE_POLL_SECONDS, SCOREBOARD_IDLE_TIMEOUT,
+    wait_seconds=SCOREBOARD_WAIT_SECONDS, heartbeat_seconds=SSE_HEARTBEAT_SECONDS,
+)
+os.register_at_fork(after_in_child=SCOREBOARD._after_fork)
+
+@app.route("/api/scoreboard")
+def scoreboard_api():
+    return json_response(dict(SCOREBOARD.snapshot(), success=True))
 
+@app.route("/api/scoreboard/stream")
+def scoreboard_stream():
+    """
+    Server-Sent Events: a `scoreboard` event with the full snapshot on every
+    change. A stream lasts SSE_MAX_SECONDS and holds a server thread meanwhile
+    (see SSE_MAX_STREAMS); once a worker has that many open, further clients
+    get the current snapshot and a long retry, i.e. they poll.
+    """
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    last_version = int(last_id) if last_id and last_id.isdigit() else None
+    busy = SCOREBOARD.stats()["subscribers"] >= SSE_MAX_STREAMS
+
+    def event(snapshot):
+        return f"id: {snapshot['version']}\nevent: scoreboard\ndata: {dumps(snapshot)}\n\n"
+
+    def stream():
+        if busy:
+            yield f"retry: {SSE_BUSY_RETRY_MS}\n\n"
+            snapshot = SCOREBOARD.snapshot()
+            if snapshot["version"] != last_version:
+                yield event(snapshot)
+            return
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        for snapshot in SCOREBOARD.events(last_version, SSE_MAX_SECONDS):
+            yield ": keep-alive\n\n" if snapshot is None else event(snapshot)
+
+    response = Response(stream(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # no proxy buffering of events
+    return response
+
+@app.route("/")
+def home():
+    scoreboard = SCOREBOARD.snapshot()
     return render_template(
         "home.html",
-        games_today=games_today,
-        games_count=len(games_today),
+        games_today=scoreboard["games"],
+        games_count=len(scoreboard["games"]),
+        scoreboard_version=scoreboard["version"],
         seasons=get_seasons(),
     )
 
@@ -208,31 +1840,33 @@ def team_trends():
 def compare_players():
     return render_template("compare.html", seasons=get_seasons())
 
+LEADER_CATEGORIES = {
+    "PTS": "Points",
+    "REB": "Rebounds",
+    "AST": "Assists",
+    "STL": "Defense",
+    "BLK": "Defense",
+}
+
+def leaders_kwargs(season: str, stat_category: str) -> dict:
+    return {
+        "game_scope_detailed": "Season",
+        "league_id": "00",
+        "player_or_team": "Player",
+        "player_scope": "All Players",
+        "season": season,
+        "season_type_playoffs": "Regular Season",
+        "stat_category": stat_category,
+        "timeout": 30,
+    }
+
 @app.route("/api/leaders")
 def get_homepage_leaders():
     stat = request.args.get("stat", "Points")
     season = request.args.get("season", get_seasons()[0])
 
-    stat_category_map = {
-        "PTS": "Points",
-        "REB": "Rebounds",
-        "AST": "Assists",
-        "STL": "Defense",
-        "BLK": "Defense",
-    }
-
     try:
-        homepage = nbacall_retry(
-            HomePageLeaders,
-            game_scope_detailed="Season",
-            league_id="00",
-            player_or_team="Player",
-            player_scope="All Players",
-            season=season,
-            season_type_playoffs="Regular Season",
-            stat_category=stat_category_map.get(stat, "Points"),
-            timeout=30,
-        )
+        homepage = nba_fetch(HomePageLeaders, **leaders_kwargs(season, LEADER_CATEGORIES.get(stat, "Points")))
         df = homepage.get_data_frames()[0]
         return jsonify({"success": True, "data": df.to_dict(orient="records"), "count": len(df)})
     except Exception as e:
@@ -249,17 +1883,10 @@ def api_team_monthly():
     except (TypeError, ValueError):
         return jsonify({"success": True, "wins": 0, "losses": 0})
 
-    gl_df = get_team_gamelog_cached(tid, season, timeout_sec=30)
-
-    if gl_df is None or gl_df.empty:
+    rec = get_team_aggregates_cached(tid, season, timeout_sec=30)["monthly"].get(month)
+    if rec is None:
         return jsonify({"success": True, "wins": 0, "losses": 0})
-
-    gl_df = gl_df.copy()
-    gl_df["GAME_DATE"] = pd.to_datetime(gl_df["GAME_DATE"], errors="coerce")
-
-    wins = int(((gl_df["GAME_DATE"].dt.month == month) & (gl_df["WL"] == "W")).sum())
-    losses = int(((gl_df["GAME_DATE"].dt.month == month) & (gl_df["WL"] == "L")).sum())
-    return jsonify({"success": True, "wins": wins, "losses": losses})
+    return jsonify({"success": True, "wins": rec["wins"], "losses": rec["losses"]})
 
 @app.route("/api/team-monthly-series")
 def api_team_monthly_series():
@@ -269,65 +1896,63 @@ def api_team_monthly_series():
     if not team_id:
         return jsonify({"success": False, "error": "team_id required"}), 400
 
-    df = get_team_gamelog_cached(team_id, season, timeout_sec=30)  # longer timeout
-    if df is None or df.empty:
-        return jsonify({"success": True, "months": ["Oct","Nov","Dec","Jan","Feb","Mar","Apr"], "win_pct": [0]*7})
-
-    df = df.copy()
-    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], errors="coerce")
-    df["M"] = df["GAME_DATE"].dt.month
+    monthly = get_team_aggregates_cached(team_id, season, timeout_sec=30)["monthly"]  # longer timeout
+    if not monthly:
+        return jsonify({"success": True, "months": [m[2] for m in SEASON_MONTHS], "win_pct": [0]*7})
 
-    order = [(10,"Oct"),(11,"Nov"),(12,"Dec"),(1,"Jan"),(2,"Feb"),(3,"Mar"),(4,"Apr")]
     labels, values = [], []
-    for mnum, mlabel in order:
-        sub = df[df["M"] == mnum]
-        w = int((sub["WL"] == "W").sum()) if not sub.empty else 0
-        l = int((sub["WL"] == "L").sum()) if not sub.empty else 0
-        total = w + l
+    for mnum, _, mlabel in SEASON_MONTHS:
+        rec = monthly.get(mnum)
+        total = rec["wins"] + rec["losses"] if rec else 0
         labels.append(mlabel)
-        values.append(round((w/total)*100, 1) if total else 0.0)
+        values.append(round((rec["wins"]/total)*100, 1) if total else 0.0)
 
     return jsonify({"success": True, "months": labels, "win_pct": values})
 
+def team_stats_calls(team_id: int, season: str) -> dict:
+    """The fetch_parallel calls behind /api/team-stats (the warm-up replays them)."""
+    return {
+        "gamelog": (team_game_log, {"team_id": team_id, "season": season}),
+        "team_stats": (leaguedashteamstats.LeagueDashTeamStats, {
+            "season": season, "season_type_all_star": "Regular Season",
+            "per_mode_detailed": "PerGame", "league_id_nullable": "00",
+        }),
+        "metrics": (teamestimatedmetrics.TeamEstimatedMetrics, {
+            "season": season, "season_type": "Regular Season", "timeout": 30,
+        }),
+    }
+
 @app.route("/api/team-stats/<team_id>")
 def api_team_stats(team_id):
     season = request.args.get("season", get_seasons()[0])
 
     try:
         team_id_int = int(team_id)
+        deadline = _now() + REQUEST_DEADLINE_SECONDS
 
-        def get_teamgamelog_df():
-            try:
-                tgl = nbacall_retry(
-                    TeamGameLog,
-                    team_id=team_id_int,
-                    season=season,
-                    season_type_all_star="Regular Season",
-                    timeout=30,
-                ).get_data_frames()[0]
-                return tgl if tgl is not None else pd.DataFrame()
-            except Exception as e:
-                print(f"[WARN] TeamGameLog failed: {e}")
-                return pd.DataFrame()
+        # Independent sources go out together; anything slower than the
+        # request deadline is treated as missing.
+        fetched = fetch_parallel(team_stats_calls(team_id_int, season), deadline=deadline)
 
-        gl_df = get_teamgamelog_df()
+        gl_df = fetched["gamelog"] if fetched["gamelog"] is not None else pd.DataFrame()
 
+        # No game log: fetch the location splits, plus the league log when the
+        # team log came from TeamGameLog, in case that is empty too.
+        splits = None
         if gl_df.empty:
-            try:
-                lgl = nbacall_retry(
-                    LeagueGameLog,
-                    season=season,
-                    season_type_all_star="Regular Season",
-                    league_id="00",
-                    timeout=30,
-                ).get_data_frames()[0]
-                if lgl is not None and not lgl.empty:
-                    gl_df = lgl[lgl["TEAM_ID"] == team_id_int].copy()
-                else:
-                    gl_df = pd.DataFrame()
-            except Exception as e:
-                print(f"[WARN] LeagueGameLog fallback failed: {e}")
-                gl_df = pd.DataFrame()
+            fallback_calls = {
+                "splits": (teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits, {
+                    "team_id": team_id_int, "season": season,
+                    "season_type_all_star": "Regular Season",
+                    "league_id_nullable": "00", "timeout": 30,
+                }),
+            }
+            if GAMELOG_SOURCE != "league":
+                fallback_calls["league_gamelog"] = (league_game_log_index, {"season": season})
+            fallback = fetch_parallel(fallback_calls, deadline=deadline)
+            splits = fallback["splits"]
+            if fallback.get("league_gamelog") is not None:
+                gl_df = fallback["league_gamelog"].team(team_id_int)
 
         if gl_df is not None and not gl_df.empty and "WL" in gl_df.columns:
             wl_w = int((gl_df["WL"] == "W").sum())
@@ -351,15 +1976,8 @@ def api_team_stats(team_id):
         opp_ppg = 0.0
         sanity_ok = False
 
-        try:
-            stats = nbacall_retry(
-                leaguedashteamstats.LeagueDashTeamStats,
-                season=season,
-                season_type_all_star="Regular Season",
-                per_mode_detailed="PerGame",
-                league_id_nullable="00",
-            )
-            df = stats.get_data_frames()[0]
+        if fetched["team_stats"] is not None:
+            df = fetched["team_stats"].get_data_frames()[0]
             row_df = df[df["TEAM_ID"] == team_id_int]
             if not row_df.empty:
                 row = row_df.iloc[0]
@@ -377,8 +1995,6 @@ def api_team_stats(team_id):
                 ft_pct  = float(row.get("FT_PCT", 0.0)) * 100.0
 
                 sanity_ok = ppg >= 90 or season < "1980-81"
-        except Exception as e:
-            print(f"[WARN] LeagueDashTeamStats failed: {e}")
 
         if not sanity_ok and gl_df is not None and not gl_df.empty:
             ppg = float(gl_df["PTS"].mean()) if "PTS" in gl_df.columns else 0.0
@@ -390,13 +2006,8 @@ def api_team_stats(team_id):
                 opp_ppg = float((gl_df["PTS"] - gl_df["PLUS_MINUS"]).mean())
 
         off_rating = def_rating = net_rating = pace = 0.0
-        try:
-            em_df = nbacall_retry(
-                teamestimatedmetrics.TeamEstimatedMetrics,
-                season=season,
-                season_type="Regular Season",
-                timeout=30,
-            ).get_data_frames()[0]
+        if fetched["metrics"] is not None:
+            em_df = fetched["metrics"].get_data_frames()[0]
             em_row = em_df[em_df["TEAM_ID"] == team_id_int]
             if not em_row.empty:
                 em = em_row.iloc[0]
@@ -404,31 +2015,19 @@ def api_team_stats(team_id):
                 def_rating = float(em.get("E_DEF_RATING", 0.0))
                 net_rating = float(em.get("E_NET_RATING", 0.0))
                 pace       = float(em.get("E_PACE", 0.0))
-        except Exception as e:
-            print(f"[WARN] TeamEstimatedMetrics failed: {e}")
 
         home_record = f"{home_w}-{home_l}"
         road_record = f"{road_w}-{road_l}"
 
-        if gl_df is None or gl_df.empty:
-            try:
-                splits = nbacall_retry(
-                    teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits,
-                    team_id=team_id_int,
-                    season=season,
-                    season_type_all_star="Regular Season",
-                    timeout=30,
-                ).get_data_frames()
-                by_loc = splits[1] if len(splits) > 1 else None
-                if by_loc is not None and not by_loc.empty:
-                    home_df = by_loc[by_loc["GROUP_VALUE"] == "Home"]
-                    road_df = by_loc[by_loc["GROUP_VALUE"] == "Road"]
-                    if not home_df.empty:
-                        home_record = f"{int(home_df['W'].iloc[0])}-{int(home_df['L'].iloc[0])}"
-                    if not road_df.empty:
-                        road_record = f"{int(road_df['W'].iloc[0])}-{int(road_df['L'].iloc[0])}"
-            except Exception as e:
-                print(f"[WARN] GeneralSplits failed: {e}")
+        if gl_df.empty and splits is not None:
+            by_loc = splits.frames.get("LocationTeamDashboard")
+            if by_loc is not None and not by_loc.empty:
+                home_df = by_loc[by_loc["GROUP_VALUE"] == "Home"]
+                road_df = by_loc[by_loc["GROUP_VALUE"] == "Road"]
+                if not home_df.empty:
+                    home_record = f"{int(home_df['W'].iloc[0])}-{int(home_df['L'].iloc[0])}"
+                if not road_df.empty:
+                    road_record = f"{int(road_df['W'].iloc[0])}-{int(road_df['L'].iloc[0])}"
 
         stats_dict = {
             "W": wl_w,
@@ -463,7 +2062,7 @@ def api_roster_analysis(team_id):
     season = request.args.get("season", get_seasons()[0])
 
     try:
-        dash = nbacall_retry(TeamPlayerDashboard, team_id=team_id, season=season, timeout=30)
+        dash = nba_fetch(TeamPlayerDashboard, team_id=team_id, season=season, timeout=30)
         dfs = dash.get_data_frames()
         stats = dfs[1] if len(dfs) > 1 else pd.DataFrame()
         if stats is None or stats.empty:
@@ -478,8 +2077,7 @@ def api_roster_analysis(team_id):
             )
 
         stats = stats.copy()
-        stats["EFF_RAW"] = stats.apply(calculate_efficiency, axis=1)
-        stats["EFF"] = stats.apply(lambda r: (r["EFF_RAW"] / (r.get("GP", 1) or 1)), axis=1)
+        stats["EFF"] = metrics.efficiency(stats) / metrics.games(stats)
 
         def build_player_dict(row, stat_col):
             if row is None:
@@ -514,63 +2112,38 @@ def team_trends_data():
     season = request.args.get("season", get_seasons()[0])
 
     try:
-        general = nbacall_retry(
-            TeamDashboardByGeneralSplits,
-            team_id=team_id,
-            season=season,
-            season_type_all_star="Regular Season",
-            league_id="00",
-            timeout=30,
-        ).get_normalized_dict()
+        # The shooting splits this route used to request were never read, so
+        # only the four sources the payload needs are fetched, concurrently.
+        team_kwargs = {"team_id": team_id, "season": season, "timeout": 30}
+        fetched = fetch_parallel(
+            {
+                "general": (TeamDashboardByGeneralSplits, {
+                    **team_kwargs, "season_type_all_star": "Regular Season", "league_id_nullable": "00",
+                }),
+                "aggregates": (team_season_aggregates, {"team_id": team_id, "season": season}),
+                "players": (TeamPlayerDashboard, team_kwargs),
+            },
+            deadline=_now() + REQUEST_DEADLINE_SECONDS,
+        )
+
+        general = fetched["general"].get_normalized_dict() if fetched["general"] else {}
         overall_stats = (general.get("OverallTeamDashboard") or [{}])[0] if general else {}
 
-        _shooting = nbacall_retry(
-            TeamDashboardByShootingSplits,
-            team_id=team_id,
-            season=season,
-            season_type_all_star="Regular Season",
-            league_id="00",
-            timeout=30,
-        ).get_normalized_dict()
-
-        gl_df = nbacall_retry(
-            TeamGameLog,
-            team_id=team_id,
-            season=season,
-            season_type_all_star="Regular Season",
-            timeout=30,
-        ).get_data_frames()[0]
-        if gl_df is None or gl_df.empty:
-            monthly_avg = {m: 0 for m in ["October", "November", "December", "January", "February", "March", "April"]}
-            home_avg_pts = away_avg_pts = 0.0
-            east_avg = west_avg = 0.0
+        agg = fetched["aggregates"] or empty_team_aggregates()
+        if not agg["games"]:
+            monthly_avg = {name: 0 for _, name, _ in SEASON_MONTHS}
         else:
-            gl_df = gl_df.copy()
-            gl_df["GAME_DATE"] = pd.to_datetime(gl_df["GAME_DATE"])
-            gl_df["MONTH"] = gl_df["GAME_DATE"].dt.month_name()
-
-            month_order = ["October", "November", "December", "January", "February", "March", "April"]
-            monthly_avg = (
-                gl_df.groupby("MONTH")["PTS"].mean().reindex(month_order).fillna(0).round(1).to_dict()
-            )
-
-            home_games = gl_df[gl_df["MATCHUP"].str.contains("vs", na=False)]
-            away_games = gl_df[gl_df["MATCHUP"].str.contains("@", na=False)]
-            home_avg_pts = round(home_games["PTS"].mean(), 1) if not home_games.empty else 0.0
-            away_avg_pts = round(away_games["PTS"].mean(), 1) if not away_games.empty else 0.0
-
-            east = {"ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DET", "IND", "MIA", "MIL", "NYK", "ORL", "PHI", "TOR", "WAS"}
-            gl_df["OPP_ABBR"] = gl_df["MATCHUP"].str.extract(r"([A-Z]{3})$")[0]
-            gl_df["OPP_CONF"] = gl_df["OPP_ABBR"].apply(lambda x: "East" if x in east else "West")
-            conf_avg_map = gl_df.groupby("OPP_CONF")["PTS"].mean().round(1).to_dict()
-            east_avg = float(conf_avg_map.get("East", 0.0))
-            west_avg = float(conf_avg_map.get("West", 0.0))
+            monthly_avg = {
+                name: agg["monthly"][m]["pts_avg"] if m in agg["monthly"] else 0.0
+                for m, name, _ in SEASON_MONTHS
+            }
+        home_avg_pts = agg["home"]["pts_avg"]
+        away_avg_pts = agg["road"]["pts_avg"]
+        east_avg = agg["east_pts_avg"]
+        west_avg = agg["west_pts_avg"]
 
-        try:
-            pdash = nbacall_retry(TeamPlayerDashboard, team_id=team_id, season=season, timeout=30).get_normalized_dict()
-            roster_list = sorted(pdash.get("TeamPlayerDashboard", []), key=lambda x: x.get("GP", 0), reverse=True)[:5]
-        except Exception:
-            roster_list = []
+        pdash = fetched["players"].get_normalized_dict() if fetched["players"] else {}
+        roster_list = sorted(pdash.get("TeamPlayerDashboard", []), key=lambda x: x.get("GP", 0), reverse=True)[:5]
 
         payload = {
             "basic": {
@@ -627,124 +2200,37 @@ def get_players():
         sort_by = request.args.get("sort_by", "PTS")
         search = request.args.get("search", "").lower()
 
-        time.sleep(0.25)
-        stats = nbacall_retry(
-            leaguedashplayerstats.LeagueDashPlayerStats,
-            season=season,
-            season_type_all_star="Regular Season",
-        )
-        df = stats.get_data_frames()[0]
-
-        if search:
-            df = df[df["PLAYER_NAME"].str.lower().str.contains(search)]
-        if team_code != "all":
-            df = df[df["TEAM_ABBREVIATION"] == team_code]
-        if position_filter != "all" and "POSITION" in df.columns:
-            df = df[df["POSITION"].str.contains(position_filter, na=False)]
-
-        df = df.copy()
-        df["TS_PCT"] = df.apply(lambda r: calculate_true_shooting(r), axis=1)
-        df["EFF"] = df.apply(lambda r: calculate_efficiency(r) / (r["GP"] or 1), axis=1)
-
-        tot_mp = df["MIN"].sum()
-        tot_fga = df["FGA"].sum()
-        tot_fta = df["FTA"].sum()
-        tot_tov = df["TOV"].sum()
-        tot_fgm = df["FGM"].sum()
-        tot_reb = df["REB"].sum()
-
-        df["USG_PCT"] = (
-            100
-            * ((df["FGA"] + 0.44 * df["FTA"] + df["TOV"]) * (tot_mp / 5))
-            / (df["MIN"] * (tot_fga + 0.44 * tot_fta + tot_tov))
-        ).fillna(0)
-
-        df["AST_PCT"] = (
-            100
-            * df["AST"]
-            / ((((df["MIN"] / (tot_mp / 5)) * tot_fgm) - df["FGM"]).replace(0, pd.NA))
-        ).fillna(0)
-
-        df["REB_PCT"] = (100 * (df["REB"] * (tot_mp / 5)) / (df["MIN"] * (tot_reb + tot_reb))).fillna(0)
-
-        num = (
-            df["PTS"]
-            + df["FGM"]
-            + df["FTM"]
-            - df["FGA"]
-            - df["FTA"]
-            + df["DREB"]
-            + 0.5 * df["OREB"]
-            + df["AST"]
-            + df["STL"]
-            + 0.5 * df["BLK"]
-            - df["PF"]
-            - df["TOV"]
+        offset = max(0, request.args.get("offset", 0, type=int))
+        limit = request.args.get("limit", type=int)
+        if limit is not None:
+            limit = max(0, limit)
+        fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()] or None
+
+        table = get_league_player_table(season)
+        etag = api_etag(table.version)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        df_display, total = table.query(
+            search=search,
+            team=team_code,
+            position=position_filter,
+            sort_by=sort_by,
+            offset=offset,
+            limit=limit,
+            fields=fields,
         )
-        total_num = num.sum() if num.sum() != 0 else 1
-        df["PIE"] = (num / total_num * 100).fillna(0)
-
-        display_columns = [
-            "PLAYER_ID",
-            "PLAYER_NAME",
-            "TEAM_ABBREVIATION",
-            "POSITION",
-            "AGE",
-            "GP",
-            "MIN",
-            "PTS",
-            "REB",
-            "AST",
-            "STL",
-            "BLK",
-            "FG_PCT",
-            "FG3_PCT",
-            "FT_PCT",
-            "TS_PCT",
-            "EFF",
-            "USG_PCT",
-            "AST_PCT",
-            "REB_PCT",
-            "PIE",
-            "PF",
-        ]
-        display_columns = [c for c in display_columns if c in df.columns]
-        df_display = df[display_columns].fillna(0)
-
-        if sort_by in df_display.columns:
-            df_display = df_display.sort_values(by=sort_by, ascending=False)
-
-        players_data = df_display.to_dict("records")
-        for p in players_data:
-            if "FG_PCT" in p:
-                p["FG_PCT"] = round(p["FG_PCT"] * 100, 1)
-            if "FG3_PCT" in p:
-                p["FG3_PCT"] = round(p["FG3_PCT"] * 100, 1)
-            if "FT_PCT" in p:
-                p["FT_PCT"] = round(p["FT_PCT"] * 100, 1)
-            if "TS_PCT" in p:
-                p["TS_PCT"] = round(p["TS_PCT"], 1)
-            if "EFF" in p:
-                p["EFF"] = round(p["EFF"], 1)
-            if "USG_PCT" in p:
-                p["USG_PCT"] = round(p["USG_PCT"], 1)
-            if "AST_PCT" in p:
-                p["AST_PCT"] = round(p["AST_PCT"], 1)
-            if "REB_PCT" in p:
-                p["REB_PCT"] = round(p["REB_PCT"], 1)
-            if "PIE" in p:
-                p["PIE"] = round(p["PIE"], 1)
-            for stat in ["MIN", "PTS", "REB", "AST", "STL", "BLK", "PF"]:
-                if stat in p:
-                    p[stat] = round(p[stat], 1)
-
-        return jsonify(
+        return json_response(
             {
                 "success": True,
-                "data": players_data,
-                "count": len(players_data),
+                "data": df_display,
+                "count": len(df_display),
+                "total": total,
+                "offset": offset,
+                "limit": limit,
                 "meta": {"estimated_fields": ["USG_PCT", "AST_PCT", "REB_PCT", "PIE"]},
-            }
+            },
+            etag=etag,
         )
 
     except Exception as e:
@@ -753,6 +2239,102 @@ def get_players():
             {"success": False, "error": "Unable to fetch player data from NBA API. Please try again later."}
         ), 503
 
+# ------------------------------------------------------------------------------
+# Player profiles (detail + compare)
+# ------------------------------------------------------------------------------
+# TEAM_ID -> names for per-season team labels; the static team list never changes
+TEAM_MAP = {
+    int(t["id"]): {
+        "TEAM_NAME": t["full_name"],
+        "TEAM_ABBREVIATION": t["abbreviation"],
+        "TEAM_CITY": t.get("city", ""),
+    }
+    for t in teams.get_teams()
+}
+_TEAM_NAMES = {tid: t["TEAM_NAME"] for tid, t in TEAM_MAP.items()}
+_TEAM_ABBRS = {tid: t["TEAM_ABBREVIATION"] for tid, t in TEAM_MAP.items()}
+
+# Stats the compare page shows, in display order
+COMPARE_COLUMNS = [
+    "SEASON_ID", "TEAM_ID", "TEAM_ABBREVIATION", "TEAM_NAME", "GP", "MIN",
+    "PPG", "RPG", "APG", "SPG", "BPG", "PFPG", "TOV",
+    "FG_PCT", "FG3_PCT", "FT_PCT", "EFG_PCT", "TS_PCT", "EFF",
+]
+MAX_COMPARE_PLAYERS = 8
+
+def player_fetch_calls(player_id: int) -> dict:
+    """The two nba_fetch calls behind a player profile, in fetch_parallel form."""
+    return {
+        "info": (commonplayerinfo.CommonPlayerInfo, {"player_id": player_id, "timeout": 30}),
+        "profile": (playerprofilev2.PlayerProfileV2, {"player_id": player_id, "timeout": 30}),
+    }
+
+_PLAYER_SEASON_TABLES = OrderedDict()  # id(source frame) -> (source frame, enriched table)
+_PLAYER_SEASON_TABLES_LOCK = threading.Lock()
+_PLAYER_SEASON_TABLES_MAX = 256
+
+def player_season_table(prof: NBAFrames) -> pd.DataFrame:
+    """
+    SeasonTotalsRegularSeason sorted newest -> oldest by the season's start year,
+    with derived per-game, shooting and per-36 columns and per-season team labels.
+    Built once per cached profile frame and reused until the profile is refreshed.
+    """
+    seasons_df = prof.frames.get("SeasonTotalsRegularSeason", pd.DataFrame())
+    if seasons_df.empty:
+        return seasons_df
+
+    key = id(seasons_df)
+    with _PLAYER_SEASON_TABLES_LOCK:
+        entry = _PLAYER_SEASON_TABLES.get(key)
+        if entry is not None and entry[0] is seasons_df:
+            _PLAYER_SEASON_TABLES.move_to_end(key)
+            return entry[1]
+
+    enriched = build_player_season_table(seasons_df)
+    with _PLAYER_SEASON_TABLES_LOCK:
+        _PLAYER_SEASON_TABLES[key] = (seasons_df, enriched)
+        _PLAYER_SEASON_TABLES.move_to_end(key)
+        while len(_PLAYER_SEASON_TABLES) > _PLAYER_SEASON_TABLES_MAX:
+            _PLAYER_SEASON_TABLES.popitem(last=False)
+    return enriched
+
+def build_player_season_table(seasons_df: pd.DataFrame) -> pd.DataFrame:
+    start_year = pd.to_numeric(
+        seasons_df["SEASON_ID"].astype(str).str.split("-").str[0], errors="coerce"
+    ).fillna(-1)
+    seasons_df = seasons_df.iloc[(-start_year.to_numpy()).argsort(kind="stable")]
+
+    # Derived per-game, shooting and per-36 columns for every season at once
+    enriched = metrics.add_season_metrics(seasons_df)
+
+    # Per-season team name/abbr come from the season row (not the current team);
+    # TEAM_ABBREVIATION from the row stays as the fallback.
+    team_ids = pd.to_numeric(enriched["TEAM_ID"], errors="coerce")
+    enriched["TEAM_NAME"] = team_ids.map(_TEAM_NAMES)
+    if "TEAM_ABBREVIATION" in enriched.columns:
+        enriched["TEAM_ABBREVIATION"] = team_ids.map(_TEAM_ABBRS).fillna(enriched["TEAM_ABBREVIATION"])
+    return enriched
+
+def compare_row(seasons: pd.DataFrame, season: str):
+    """
+    One COMPARE_COLUMNS row for `season`, or None if the player did not play it.
+    Traded players have a row per team plus a combined TEAM_ID 0 row; the
+    combined row is the one compared.
+    """
+    if seasons.empty:
+        return None
+    rows = seasons[seasons["SEASON_ID"] == season]
+    if rows.empty:
+        return None
+    combined = rows[pd.to_numeric(rows["TEAM_ID"], errors="coerce") == 0]
+    row = (combined if not combined.empty else rows).iloc[[0]]
+    row = metrics.with_columns(row, {
+        "PFPG": metrics.col(row, "PF") / metrics.games(row),
+        # TOV is already per game after add_season_metrics; EFF needs totals
+        "EFF": metrics.efficiency(row.assign(TOV=row["TOV_TOTAL"])) / metrics.games(row),
+    })
+    return frame_records(row.reindex(columns=COMPARE_COLUMNS))[0]
+
 @app.route("/api/player/<int:player_id>")
 def get_player_detail(player_id: int):
     """
@@ -767,113 +2349,32 @@ def get_player_detail(player_id: int):
         # Optional season query (e.g., "2018-19")
         req_season = request.args.get("season")
 
-        # 0) Build a fast TEAM_ID -> names map for accurate per-season team labeling
-        team_map = {}
-        try:
-            for t in teams.get_teams():
-                team_map[int(t["id"])] = {
-                    "TEAM_NAME": t["full_name"],
-                    "TEAM_ABBREVIATION": t["abbreviation"],
-                    "TEAM_CITY": t.get("city", ""),
-                }
-        except Exception:
-            pass
-
-        # 1) Player bio
-        cpi = nbacall_retry(commonplayerinfo.CommonPlayerInfo, player_id=player_id, timeout=30)
-        info_df = cpi.get_data_frames()[0]
-        info = info_df.to_dict("records")[0] if len(info_df) > 0 else {}
-
-        # 2) Player profile (regular season tables)
-        prof = nbacall_retry(playerprofilev2.PlayerProfileV2, player_id=player_id, timeout=30)
-        norm = prof.get_normalized_dict()
-
-        seasons_regular = norm.get("SeasonTotalsRegularSeason", []) or []
-        career_regular  = norm.get("CareerTotalsRegularSeason", []) or []
-
-        # Sort newest -> oldest
-        def season_key(row):
-            try:
-                return int(str(row.get("SEASON_ID", "0-00")).split("-")[0])
-            except Exception:
-                return -1
-        seasons_regular = sorted(seasons_regular, key=season_key, reverse=True)
-
-        # Available seasons list
-        available_seasons = [r.get("SEASON_ID") for r in seasons_regular if r.get("SEASON_ID")]
-
-        # Helper to compute derived metrics for a season row
-        def enrich(row):
-            r = dict(row)  # copy
-            gp  = max(int(r.get("GP") or 0), 1)
-            min_tot = float(r.get("MIN") or 0.0)
-            r["MPG"] = (min_tot / gp) if gp else 0.0
-            r["PPG"] = float(r.get("PTS") or 0.0) / gp
-            r["RPG"] = float(r.get("REB") or 0.0) / gp
-            r["APG"] = float(r.get("AST") or 0.0) / gp
-            r["SPG"] = float(r.get("STL") or 0.0) / gp
-            r["BPG"] = float(r.get("BLK") or 0.0) / gp
-            r["TOV"] = float(r.get("TOV") or 0.0) / gp
-
-            # Totals (rename for clarity)
-            r["MIN_TOTAL"] = min_tot
-            r["PTS_TOTAL"] = float(r.get("PTS") or 0.0)
-            r["REB_TOTAL"] = float(r.get("REB") or 0.0)
-            r["AST_TOTAL"] = float(r.get("AST") or 0.0)
-            r["STL_TOTAL"] = float(r.get("STL") or 0.0)
-            r["BLK_TOTAL"] = float(r.get("BLK") or 0.0)
-            r["TOV_TOTAL"] = float(r.get("TOV") or 0.0)
-
-            # Advanced shooting
-            fg_pct  = float(r.get("FG_PCT") or 0.0) * 100.0
-            fg3_pct = float(r.get("FG3_PCT") or 0.0) * 100.0
-            ft_pct  = float(r.get("FT_PCT") or 0.0) * 100.0
-            fga     = float(r.get("FGA") or 0.0)
-            fta     = float(r.get("FTA") or 0.0)
-            fgm     = float(r.get("FGM") or 0.0)
-            fg3a    = float(r.get("FG3A") or 0.0)
-            fg3m    = float(r.get("FG3M") or 0.0)
-            pts     = float(r.get("PTS") or 0.0)
-
-            # eFG%: (FGM + 0.5*3PM) / FGA
-            r["EFG_PCT"] = ((fgm + 0.5 * fg3m) / fga * 100.0) if fga else None
-            # TS%: PTS / (2*(FGA + 0.44*FTA))
-            denom = fga + 0.44 * fta
-            r["TS_PCT"] = ((pts / (2.0 * denom)) * 100.0) if denom else None
-            # Volume rates
-            r["THREEPAR"] = ((fg3a / fga) * 100.0) if fga else None  # 3PA rate
-            r["FTR"]      = ((fta / fga) * 100.0) if fga else None   # FT rate
-
-            # Per‑36
-            mpg = r["MPG"]
-            scale = (36.0 / mpg) if mpg else 0.0
-            for k in ("PTS","REB","AST","STL","BLK","TOV","OREB","DREB","FG3M","FTA","FGA"):
-                val = float(r.get(k) or 0.0) / gp
-                r[f"{k}_P36"] = val * scale if scale else 0.0
-
-            # Ensure per‑season team name/abbr come from the season row (not current team)
-            team_id = r.get("TEAM_ID")
-            if isinstance(team_id, str) and team_id.isdigit():
-                team_id = int(team_id)
-            team_label = team_map.get(team_id, {})
-            if team_label:
-                r["TEAM_NAME"] = team_label.get("TEAM_NAME")
-                r["TEAM_ABBREVIATION"] = team_label.get("TEAM_ABBREVIATION", r.get("TEAM_ABBREVIATION"))
-            # leave TEAM_ABBREVIATION from the row as a fallback
-
-            return r
-
-        # Enrich all rows for front‑end (keeps TEAM_ABBREVIATION from the season)
-        seasons_regular = [enrich(r) for r in seasons_regular]
+        # Player bio and profile tables are independent; fetch them together
+        res = fetch_parallel(player_fetch_calls(player_id), _now() + REQUEST_DEADLINE_SECONDS)
+        if res["profile"] is None:
+            raise RuntimeError("player profile unavailable")
+        info_df = res["info"].get_data_frames()[0] if res["info"] is not None else pd.DataFrame()
+        info = frame_records(info_df)[0] if len(info_df) > 0 else {}
+
+        prof = res["profile"]
+        career_regular = frame_records(prof.frames.get("CareerTotalsRegularSeason", pd.DataFrame()))
+        enriched = player_season_table(prof)
+        if enriched.empty:
+            seasons_regular, available_seasons = [], []
+        else:
+            available_seasons = [s for s in enriched["SEASON_ID"].tolist() if s]
+            seasons_regular = enriched
 
         # Determine selected_season
         selected = None
-        if req_season:
-            selected = next((r for r in seasons_regular if r.get("SEASON_ID") == req_season), None)
-        if not selected and seasons_regular:
-            selected = seasons_regular[0]
-
-        return jsonify({
+        if not enriched.empty:
+            position = 0
+            if req_season:
+                matches = np.flatnonzero((enriched["SEASON_ID"] == req_season).to_numpy())
+                position = matches[0] if len(matches) else 0
+            selected = frame_records(enriched.iloc[[position]])[0]
+
+        return json_response({
             "success": True,
             "player_info": info,                 # current team/bio
             "seasons_regular": seasons_regular,  # enriched rows (newest->oldest)
@@ -886,60 +2387,283 @@ def get_player_detail(player_id: int):
         print(f"[ERROR] /api/player/{player_id}: {e}")
         return jsonify({"success": False, "error": str(e)})
 
+@app.route("/api/players/compare")
+def api_compare_players():
+    """
+    Side-by-side season rows for several players in one request.
+      ?ids=2544,201939,203999&season=2023-24
+    Every player's CommonPlayerInfo and PlayerProfileV2 are fetched concurrently,
+    so the request takes about as long as the slowest player. Rows come back in
+    `ids` order with the same COMPARE_COLUMNS keys; `season` is null for a player
+    who did not play that season and `error` is set if their profile failed.
+    """
+    try:
+        season = request.args.get("season", get_seasons()[0])
+        ids = []
+        for part in request.args.get("ids", "").split(","):
+            part = part.strip()
+            if part.isdigit() and int(part) not in ids:
+                ids.append(int(part))
+        if not ids:
+            return jsonify({"success": False, "error": "ids is required"}), 400
+        if len(ids) > MAX_COMPARE_PLAYERS:
+            return jsonify({"success": False, "error": f"at most {MAX_COMPARE_PLAYERS} players"}), 400
+
+        calls = {}
+        for pid in ids:
+            for kind, call in player_fetch_calls(pid).items():
+                calls[(pid, kind)] = call
+        res = fetch_parallel(calls, _now() + REQUEST_DEADLINE_SECONDS)
+
+        players_out = []
+        for pid in ids:
+            entry = {"player_id": pid, "name": None, "team_abbreviation": None, "season": None}
+            info = res[(pid, "info")]
+            if info is not None:
+                info_df = info.get_data_frames()[0]
+                if len(info_df) > 0:
+                    first = info_df.iloc[0]
+                    entry["name"] = first.get("DISPLAY_FIRST_LAST")
+                    entry["team_abbreviation"] = first.get("TEAM_ABBREVIATION") or None
+            prof = res[(pid, "profile")]
+            if prof is None:
+                entry["error"] = "player profile unavailable"
+            else:
+                entry["season"] = compare_row(player_season_table(prof), season)
+            players_out.append(entry)
+
+        return jsonify({
+            "success": True,
+            "season": season,
+            "columns": COMPARE_COLUMNS,
+            "players": players_out,
+        })
+    except Exception as e:
+        print(f"[ERROR] /api/players/compare: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route("/player/<int:player_id>")
 def player_detail(player_id: int):
     return render_template("player_detail.html", player_id=player_id, seasons=get_seasons())
 
 @app.route("/api/export/players")
 def export_players():
+    """
+    League player tables with the /api/players derived columns, streamed.
+      ?season=2023-24 or ?seasons=2015-16:2024-25 (ranges and/or comma lists)
+      ?team=BOS,NYK|all    ?sort_by=PTS    ?format=csv|parquet|arrow
+    Every season's table is fetched (concurrently) before the first byte goes
+    out, so an upstream failure still gets a 500; rows are then derived and
+    encoded one season at a time.
+    """
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in exports.FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(exports.FORMATS)}"}), 400
     try:
-        season = request.args.get("season", get_seasons()[0])
-        team_code = request.args.get("team", "all")
-        sort_by = request.args.get("sort_by", "PTS")
+        seasons = parse_seasons(request.args["seasons"]) if request.args.get("seasons") else []
+    except click.BadParameter as e:
+        return jsonify({"error": e.message}), 400
+    seasons = seasons or [request.args.get("season", get_seasons()[0])]
+    team_code = request.args.get("team", "all")
+    teams_wanted = None if team_code == "all" else [t.strip() for t in team_code.split(",") if t.strip()]
+    sort_by = request.args.get("sort_by", "PTS")
+
+    pending = [_FANOUT_POOL.submit(get_league_player_table, season) for season in seasons]
+    tables = []
+    for season, fut in zip(seasons, pending):
+        try:
+            tables.append(fut.result())
+        except Exception as e:
+            print(f"Error in /api/export/players {season}: {e}")
+            return jsonify({"error": f"{season}: {e}"}), 500
 
-        player_stats = nbacall_retry(
-            leaguedashplayerstats.LeagueDashPlayerStats,
-            season=season,
-            season_type_all_star="Regular Season",
-            timeout=30,
-        )
-        df = player_stats.get_data_frames()[0]
-        if team_code != "all":
-            df = df[df["TEAM_ABBREVIATION"] == team_code]
-        if sort_by in df.columns:
-            df = df.sort_values(by=sort_by, ascending=False)
-
-        output = io.StringIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
-        mem = io.BytesIO()
-        mem.write(output.getvalue().encode("utf-8"))
-        mem.seek(0)
-        return send_file(
-            mem,
-            mimetype="text/csv",
-            as_attachment=True,
-            download_name=f"nba_players_{season}_{datetime.now().strftime('%Y%m%d')}.csv",
-        )
+    def frames():
+        for table in tables:
+            yield table.export_rows(teams_wanted, sort_by)
+
+    def body():
+        sent = 0
+        try:
+            for chunk in exports.encode(frames(), fmt):
+                sent += len(chunk)
+                yield chunk
+        except Exception as e:
+            # Headers are gone: the encoder has already marked the file as
+            # incomplete, and re-raising aborts the transfer instead of ending it
+            print(f"[ERROR] /api/export/players: {e}; export truncated after {sent} bytes")
+            raise
+
+    mimetype, ext = exports.FORMATS[fmt]
+    label = seasons[0] if len(seasons) == 1 else f"{seasons[-1]}_to_{seasons[0]}"
+    filename = f"nba_players_{label}_{datetime.now().strftime('%Y%m%d')}.{ext}"
+    return Response(
+        body(),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@app.route("/api/shot-chart/<int:player_id>")
+def api_shot_chart(player_id: int):
+    """
+    Shot chart for one player-season.
+      ?season=2023-24&season_type=Regular Season
+      ?period=1..4|all&result=made|missed|all   filters applied before binning
+      ?hex_size=15                               hex radius in tenths of a foot
+      ?shots=columnar                            also return raw shots column-wise
+      ?columns=LOC_X,LOC_Y,...                   columns for the raw shots
+    Zone and hex aggregates carry league-average FG% for comparison.
+    """
+    season = request.args.get("season", get_seasons()[0])
+    season_type = request.args.get("season_type", "Regular Season")
+    period = request.args.get("period", "all")
+    result = request.args.get("result", "all")
+    hex_size = min(max(request.args.get("hex_size", 15.0, type=float), 5.0), 60.0)
+    columns = [c.strip() for c in request.args.get("columns", "").split(",") if c.strip()] or None
+
+    try:
+        chart = get_shot_chart(player_id, season, season_type)
+        view = chart.view(period, result, hex_size)
+        payload = {
+            "success": True,
+            "player_id": player_id,
+            "season": season,
+            "season_type": season_type,
+            **view,
+        }
+        if request.args.get("shots") == "columnar":
+            payload["shots"] = shotcharts.columnar(
+                shotcharts.filter_shots(chart.shots, period, result), columns
+            )
+        return jsonify(payload)
     except Exception as e:
-        print(f"Error in /api/export/players: {e}")
-        return jsonify({"error": str(e)}), 500
+        print(f"[ERROR] /api/shot-chart/{player_id}: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+# Built once at import: the static player list never changes while the app runs
+PLAYER_INDEX = player_search.PlayerIndex(players.get_players())
+PLAYER_INDEX.warm()
 
 @app.route("/api/search-players")
 def search_players():
     try:
-        query = request.args.get("q", "").lower()
-        all_players = players.get_players()
-        matching = [
-            {"id": p["id"], "name": p["full_name"], "is_active": p["is_active"]}
-            for p in all_players
-            if query in p["full_name"].lower()
-        ][:10]
-        return jsonify({"success": True, "players": matching})
+        query = request.args.get("q", "")
+        limit = min(max(request.args.get("limit", 10, type=int), 1), 50)
+        return jsonify({"success": True, "players": PLAYER_INDEX.search(query, limit)})
     except Exception as e:
         print(f"Error in /api/search-players: {e}")
         return jsonify({"success": False, "error": str(e)})
 
+# ------------------------------------------------------------------------------
+# Cache warm-up
+# ------------------------------------------------------------------------------
+# Whether server entry points (gunicorn.conf.py, python app.py) warm the caches
+# at boot; importing app never starts it
+WARMUP_ENABLED = os.environ.get("COURTVISION_WARMUP", "1") == "1"
+WARMUP_INTERVAL_SECONDS = float(os.environ.get("COURTVISION_WARMUP_INTERVAL", 600))  # 0: only at startup
+WARMUP_MIN_LEASE_SECONDS = 300  # with interval 0, how long one worker's pass stands for the host
+WARMUP_CONCURRENCY = int(os.environ.get("COURTVISION_WARMUP_CONCURRENCY", 4))
+
+def warmup_tasks(season: str) -> list:
+    """
+    (label, source, kwargs) for everything a cold worker would otherwise fetch on
+    the first requests: the league player table, each team's /api/team-stats
+    calls (league team stats and estimated metrics dedupe to one call each), the
+    team trend aggregates, and the home-page leaders. League-wide tasks come
+    first so the per-team ones mostly find them cached.
+    """
+    league = [("players", get_league_player_table, {"season": season})]
+    per_team = []
+    seen = set()
+    for team in teams.get_teams():
+        for label, (source, kwargs) in team_stats_calls(team["id"], season).items():
+            key = (source.__name__, json.dumps(request_params(kwargs), sort_keys=True, default=str))
+            if key in seen:
+                continue
+            seen.add(key)
+            task = (f"{label} {team['abbreviation']}" if "team_id" in kwargs else label, source, kwargs)
+            (per_team if "team_id" in kwargs else league).append(task)
+        per_team.append((f"aggregates {team['abbreviation']}", team_season_aggregates,
+                         {"team_id": team["id"], "season": season}))
+    for category in dict.fromkeys(LEADER_CATEGORIES.values()):
+        league.append((f"leaders {category}", HomePageLeaders, leaders_kwargs(season, category)))
+    return league + per_team
+
+CACHE_WARMER = CacheWarmer(
+    warmup_tasks, fetch_source, lambda: get_seasons()[0], WARMUP_CONCURRENCY, WARMUP_INTERVAL_SECONDS,
+    lease=SHARED_CACHE.lease, min_lease=WARMUP_MIN_LEASE_SECONDS,
+)
+os.register_at_fork(after_in_child=CACHE_WARMER._after_fork)
+
+@app.cli.command("warmup")
+@click.option("--season", default=None, help="Season like 2025-26. Defaults to the newest season.")
+@click.option("--concurrency", type=int, default=WARMUP_CONCURRENCY, show_default=True)
+def warmup_command(season, concurrency):
+    """Run one cache warm-up pass in the foreground and report progress."""
+    CACHE_WARMER.stop()
+    warmer = CacheWarmer(warmup_tasks, fetch_source, lambda: get_seasons()[0], concurrency, 0)
+    progress = warmer.run(season, echo=click.echo)
+    click.echo(f"Warmed {progress['done'] - progress['failed']}/{progress['total']} in {progress['last_duration_s']}s")
+    for error in progress["errors"]:
+        click.echo(f"  failed: {error}")
+
+def start_warmup():
+    """
+    Boot-time warm-up, called by server entry points once the app is loaded
+    (gunicorn's post_worker_init, python app.py). Every worker may call it;
+    the shared-cache lease lets one worker per host do the passes.
+    """
+    if WARMUP_ENABLED:
+        CACHE_WARMER.start()
+
+_CIRCUIT_STATES = {EndpointHealth.CLOSED: 0, EndpointHealth.HALF_OPEN: 1, EndpointHealth.OPEN: 2}
+
+METRICS.register(instrumentation.Gauge(
+    "courtvision_cache_bytes", "DataFrame bytes held by this worker's response cache.",
+    lambda: RESPONSE_CACHE.stats()["bytes"],
+))
+METRICS.register(instrumentation.Gauge(
+    "courtvision_shared_cache_bytes", "Bytes held by the host-wide shared cache.",
+    lambda: SHARED_CACHE.stats().get("bytes", 0),
+))
+METRICS.register(instrumentation.Gauge(
+    "courtvision_upstream_in_flight", "Distinct upstream fetches currently running.",
+    UPSTREAM_FLIGHTS.in_flight,
+))
+METRICS.register(instrumentation.Gauge(
+    "courtvision_circuit_state", "Circuit breaker state per endpoint (0 closed, 1 half-open, 2 open).",
+    lambda: {(name,): _CIRCUIT_STATES[h["state"]] for name, h in upstream_health_stats().items()},
+    labels=("endpoint",),
+))
+
+METRICS.register(instrumentation.Gauge(
+    "courtvision_scoreboard_subscribers", "Open scoreboard event streams in this worker.",
+    lambda: SCOREBOARD.stats()["subscribers"],
+))
+
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(METRICS.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/api/cache-stats")
+def cache_stats():
+    return jsonify(
+        {
+            "success": True,
+            "cache": RESPONSE_CACHE.stats(),
+            "shared_cache": SHARED_CACHE.stats(),
+            "upstream": {"in_flight": UPSTREAM_FLIGHTS.in_flight(), "coalesced": UPSTREAM_FLIGHTS.coalesced},
+            "async_upstream": dict(ASYNC_CLIENT.stats(), enabled=ASYNC_UPSTREAM),
+            "connections": upstream_connection_stats(),
+            "endpoints": upstream_health_stats(),
+            "fixtures": dict(UPSTREAM_FIXTURE_STORE.stats(), mode=UPSTREAM_FIXTURE_MODE)
+            if UPSTREAM_FIXTURE_STORE else None,
+            "player_search": PLAYER_INDEX.stats(),
+            "game_logs": GAME_LOGS.stats(),
+            "warmup": CACHE_WARMER.stats(),
+            "scoreboard": SCOREBOARD.stats(),
+        }
+    )
+
 @app.route("/test-api")
 def test_api():
     try:
@@ -958,5 +2682,7 @@ def test_api():
         return jsonify({"success": False, "error": str(e)})
 
 if __name__ == "__main__":
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_warmup()  # in the reloader's serving process only
     port = int(os.environ.get("PORT", 5001))
     app.run(debug=True, port=port)
\ No newline at end of file
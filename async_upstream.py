@@ -0,0 +1,99 @@
+"""
+Async transport for upstream (stats.nba.com) calls.
+
+One background event loop per process and one pooled httpx.AsyncClient, with a
+cap on connections in use per host and on calls waiting. Retry, breaker and
+rate-limit policy live in the coroutine the caller supplies.
+"""
+import asyncio
+import os
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+
+class UpstreamOverloaded(RuntimeError):
+    """Raised instead of queueing once `max_pending` calls are waiting."""
+
+class AsyncUpstream:
+    """
+    Runs nba_api requests as coroutines on a background event loop. submit()
+    schedules `call(client, endpoint_cls, retries, backoff, max_backoff, kwargs)`,
+    a coroutine that sends its requests through client.get() and returns the
+    loaded endpoint, so callers get the same object a blocking call returns.
+    An upstream wait costs a coroutine and a pooled connection rather than a
+    thread, so one process can keep hundreds of slow calls in flight; at most
+    `per_host` of them hold a connection to any one host at a time.
+    """
+
+    def __init__(self, per_host: int, max_pending: int, call, proxy: str = None, transport=None):
+        self.per_host = per_host
+        self.max_pending = max_pending
+        self.call = call
+        self.proxy = proxy
+        self.transport = transport  # httpx transport override, e.g. httpx.MockTransport
+        self._loop = None
+        self._client = None
+        self._pid = None
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _ensure_loop(self):
+        """Start the loop on first use, and again in a forked worker (threads do not survive fork)."""
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="nba-async-upstream", daemon=True).start()
+            self._loop = loop
+            self._pid = os.getpid()
+            self._hosts = {}
+            limits = httpx.Limits(max_connections=None, max_keepalive_connections=self.per_host)
+            self._client = httpx.AsyncClient(limits=limits, transport=self.transport, proxy=self.proxy)
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._hosts.get(host)
+        if slot is None:
+            slot = self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return slot
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the pooled client while holding one of the host's slots."""
+        async with self._host_slot(urlsplit(url).hostname):
+            return await self._client.get(url, **kwargs)
+
+    def submit(self, endpoint_cls, retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0, **kwargs):
+        """Schedule one endpoint call; returns a concurrent.futures.Future of the loaded endpoint."""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise UpstreamOverloaded(f"{self.pending} upstream calls already pending")
+            self.pending += 1
+        self._ensure_loop()
+        fut = asyncio.run_coroutine_threadsafe(
+            self.call(self, endpoint_cls, retries, backoff, max_backoff, kwargs), self._loop
+        )
+        fut.add_done_callback(self._finished)
+        return fut
+
+    def _finished(self, fut):
+        with self._lock:
+            self.pending -= 1
+            if fut.cancelled() or fut.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "per_host": self.per_host,
+                "pending": self.pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,117 @@
+"""
+Row-wise vs column-wise advanced metrics.
+
+Times the DataFrame.apply(axis=1) implementation that /api/players and the
+player-detail page used to run against metrics.py on synthetic tables shaped
+like LeagueDashPlayerStats: one season (~550 players) and stacks of seasons.
+
+    python benchmarks/bench_metrics.py [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import metrics  # noqa: E402
+
+def synthetic_league(n_players: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    fga = rng.uniform(0, 20, n_players)
+    fgm = fga * rng.uniform(0.3, 0.6, n_players)
+    fg3a = fga * rng.uniform(0, 0.5, n_players)
+    fg3m = fg3a * rng.uniform(0.2, 0.45, n_players)
+    fta = rng.uniform(0, 8, n_players)
+    ftm = fta * rng.uniform(0.5, 0.95, n_players)
+    oreb = rng.uniform(0, 4, n_players)
+    dreb = rng.uniform(0, 9, n_players)
+    return pd.DataFrame({
+        "PLAYER_ID": np.arange(n_players),
+        "GP": rng.integers(0, 83, n_players),
+        "MIN": rng.uniform(0, 38, n_players),
+        "FGM": fgm, "FGA": fga, "FG3M": fg3m, "FG3A": fg3a, "FTM": ftm, "FTA": fta,
+        "OREB": oreb, "DREB": dreb, "REB": oreb + dreb,
+        "AST": rng.uniform(0, 10, n_players), "STL": rng.uniform(0, 2, n_players),
+        "BLK": rng.uniform(0, 2, n_players), "TOV": rng.uniform(0, 4, n_players),
+        "PF": rng.uniform(0, 4, n_players), "PTS": 2 * fgm + fg3m + ftm,
+    })
+
+# --- Previous implementation, kept here as the baseline -------------------------
+
+def _row_true_shooting(row):
+    denom = row.get("FGA", 0) + 0.44 * row.get("FTA", 0)
+    return 0 if denom == 0 else (row.get("PTS", 0) / (2 * denom)) * 100
+
+def _row_efficiency(row):
+    positive = row.get("PTS", 0) + row.get("REB", 0) + row.get("AST", 0) + row.get("STL", 0) + row.get("BLK", 0)
+    negative = (row.get("FGA", 0) - row.get("FGM", 0)) + (row.get("FTA", 0) - row.get("FTM", 0)) + row.get("TOV", 0)
+    return positive - negative
+
+def rowwise_league_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["TS_PCT"] = df.apply(_row_true_shooting, axis=1)
+    df["EFF"] = df.apply(lambda r: _row_efficiency(r) / (r["GP"] or 1), axis=1)
+    tot_mp, tot_fga, tot_fta = df["MIN"].sum(), df["FGA"].sum(), df["FTA"].sum()
+    tot_tov, tot_fgm, tot_reb = df["TOV"].sum(), df["FGM"].sum(), df["REB"].sum()
+    df["USG_PCT"] = (100 * ((df["FGA"] + 0.44 * df["FTA"] + df["TOV"]) * (tot_mp / 5))
+                     / (df["MIN"] * (tot_fga + 0.44 * tot_fta + tot_tov))).fillna(0)
+    df["AST_PCT"] = (100 * df["AST"] / ((((df["MIN"] / (tot_mp / 5)) * tot_fgm) - df["FGM"])
+                                       .replace(0, pd.NA))).fillna(0)
+    df["REB_PCT"] = (100 * (df["REB"] * (tot_mp / 5)) / (df["MIN"] * (tot_reb + tot_reb))).fillna(0)
+    num = (df["PTS"] + df["FGM"] + df["FTM"] - df["FGA"] - df["FTA"] + df["DREB"] + 0.5 * df["OREB"]
+           + df["AST"] + df["STL"] + 0.5 * df["BLK"] - df["PF"] - df["TOV"])
+    df["PIE"] = (num / (num.sum() or 1) * 100).fillna(0)
+    return df
+
+def rowwise_season_metrics(df: pd.DataFrame) -> list:
+    out = []
+    for row in df.to_dict("records"):
+        r = dict(row)
+        gp = max(int(r.get("GP") or 0), 1)
+        r["MPG"] = float(r.get("MIN") or 0.0) / gp
+        for stat, label in (("PTS", "PPG"), ("REB", "RPG"), ("AST", "APG"), ("STL", "SPG"), ("BLK", "BPG")):
+            r[label] = float(r.get(stat) or 0.0) / gp
+        fga, fta = float(r.get("FGA") or 0.0), float(r.get("FTA") or 0.0)
+        r["EFG_PCT"] = ((r["FGM"] + 0.5 * r["FG3M"]) / fga * 100.0) if fga else None
+        denom = fga + 0.44 * fta
+        r["TS_PCT"] = (r["PTS"] / (2.0 * denom) * 100.0) if denom else None
+        r["THREEPAR"] = (r["FG3A"] / fga * 100.0) if fga else None
+        r["FTR"] = (fta / fga * 100.0) if fga else None
+        scale = (36.0 / r["MPG"]) if r["MPG"] else 0.0
+        for k in metrics.PER_36_STATS:
+            r[f"{k}_P36"] = float(r.get(k) or 0.0) / gp * scale
+        out.append(r)
+    return out
+
+# -------------------------------------------------------------------------------
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [("1 season", 550), ("10 seasons", 5_500), ("30 seasons", 16_500)]
+    print(f"{'table':<12}{'rows':>8}  {'metric set':<8}{'row-wise':>12}{'columnar':>12}{'speedup':>10}")
+    for label, rows in cases:
+        df = synthetic_league(rows)
+        for name, old, new in (
+            ("league", lambda: rowwise_league_metrics(df), lambda: metrics.add_league_metrics(df)),
+            ("season", lambda: rowwise_season_metrics(df), lambda: metrics.add_season_metrics(df)),
+        ):
+            t_old = best_of(old, args.repeat)
+            t_new = best_of(new, args.repeat)
+            print(f"{label:<12}{rows:>8}  {name:<8}{t_old * 1e3:>10.1f}ms{t_new * 1e3:>10.2f}ms{t_old / t_new:>9.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Route latency and throughput against recorded stats.nba.com responses.
+
+Record fixtures once (live upstream, every call the benchmarked routes make is
+saved), then replay them offline at a set concurrency with optional injected
+upstream latency and errors:
+
+    python benchmarks/bench_routes.py --fixtures fixtures/ --record
+    python benchmarks/bench_routes.py --fixtures fixtures/ --concurrency 16 --requests 400 \\
+        --latency-ms 150 --jitter-ms 100 --error-rate 0.02
+
+Each run starts with empty caches (temporary warehouse, no shared cache, no
+warm-up), so the "first" column is the cold path. With the default --cache warm
+the percentiles are mostly cache hits and the injected latency and errors barely
+show; --cache cold empties the response cache, game logs and warehouse after
+every round of --concurrency requests, so each round goes upstream:
+
+    python benchmarks/bench_routes.py --fixtures fixtures/ --cache cold --latency-ms 150 --error-rate 0.05
+
+--url drives an already running server instead of the in-process app (warm
+only); start it with COURTVISION_UPSTREAM_FIXTURES set to replay.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEARCH_QUERIES = ["le", "lebron", "curry", "jok", "giannis", "tatum", "luka", "antetok", "wemb", "edwards"]
+
+def configure_app(args):
+    """Environment for a self-contained run; must happen before app is imported."""
+    os.environ["COURTVISION_WAREHOUSE"] = args.warehouse = tempfile.mkdtemp(prefix="courtvision-bench-")
+    os.environ["COURTVISION_SHARED_CACHE"] = ""
+    os.environ["COURTVISION_WARMUP"] = "0"
+    os.environ["COURTVISION_UPSTREAM_FIXTURES"] = args.fixtures
+    os.environ["COURTVISION_UPSTREAM_FIXTURE_MODE"] = "record" if args.record else "replay"
+    os.environ["COURTVISION_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["COURTVISION_REPLAY_JITTER_MS"] = str(args.jitter_ms)
+    os.environ["COURTVISION_REPLAY_ERROR_RATE"] = str(args.error_rate)
+    if not args.record:
+        os.environ.setdefault("COURTVISION_UPSTREAM_RATE", "0")
+    sys.path.insert(0, ROOT)
+
+class Client:
+    """GET returning (status, json) through the Flask test client or over HTTP."""
+
+    def __init__(self, base_url: str = None):
+        self.base_url = base_url
+        self._local = threading.local()
+        if base_url:
+            import requests
+            self._session_cls = requests.Session
+        else:
+            import app
+            self._app = app.app
+
+    def get(self, path: str):
+        if self.base_url:
+            session = getattr(self._local, "session", None) or self._session_cls()
+            self._local.session = session
+            resp = session.get(self.base_url + path, timeout=120)
+            return resp.status_code, (resp.json() if resp.headers.get("Content-Type", "").startswith("application/json") else None)
+        client = getattr(self._local, "client", None) or self._app.test_client()
+        self._local.client = client
+        resp = client.get(path)
+        return resp.status_code, resp.get_json(silent=True)
+
+def route_urls(client: Client, season: str, n_teams: int, n_players: int) -> dict:
+    from nba_api.stats.static import teams
+    team_ids = [t["id"] for t in sorted(teams.get_teams(), key=lambda t: t["id"])][:n_teams]
+    _, top = client.get(f"/api/players?season={season}&sort_by=PTS&limit={n_players}&fields=PLAYER_ID")
+    player_ids = [row["PLAYER_ID"] for row in (top or {}).get("data", [])]
+    return {
+        "players": [f"/api/players?season={season}&sort_by=PTS&limit=50"],
+        "team-stats": [f"/api/team-stats/{tid}?season={season}" for tid in team_ids],
+        "team-trends": [f"/api/team_trends_data?team_id={tid}&season={season}" for tid in team_ids],
+        "player": [f"/api/player/{pid}?season={season}" for pid in player_ids],
+        "search": [f"/api/search-players?q={q}" for q in SEARCH_QUERIES],
+    }
+
+def clear_caches(warehouse: str):
+    """Forget everything the in-process app has fetched, so the next request goes upstream."""
+    import app
+    app.RESPONSE_CACHE.clear()
+    app.GAME_LOGS.clear()
+    for name in os.listdir(warehouse):
+        shutil.rmtree(os.path.join(warehouse, name), ignore_errors=True)
+
+def run_route(client: Client, urls: list, total: int, concurrency: int, cold_in: str = None) -> dict:
+    started = time.perf_counter()
+    status, _ = client.get(urls[0])
+    first = time.perf_counter() - started
+
+    def one(i):
+        t0 = time.perf_counter()
+        code, _ = client.get(urls[i % len(urls)])
+        return time.perf_counter() - t0, code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if cold_in is None:
+            results = list(pool.map(one, range(total)))
+        else:
+            # Caches are emptied between rounds, never under a request in flight
+            results = []
+            for start in range(0, total, concurrency):
+                clear_caches(cold_in)
+                results += pool.map(one, range(start, min(start + concurrency, total)))
+    wall = time.perf_counter() - started
+    latencies = np.array([r[0] for r in results])
+    errors = sum(1 for _, code in results if code >= 400)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {"first": first, "rps": total / wall, "p50": p50, "p95": p95, "p99": p99, "errors": errors}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", required=True, help="Fixture directory to record into or replay from.")
+    parser.add_argument("--record", action="store_true", help="Call stats.nba.com once per URL and save fixtures.")
+    parser.add_argument("--season", default=None, help="Defaults to the newest completed season.")
+    parser.add_argument("--teams", type=int, default=5)
+    parser.add_argument("--players", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected upstream latency (replay).")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random latency up to this (replay).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream calls failed (replay).")
+    parser.add_argument("--url", default=None, help="Benchmark a running server instead, e.g. http://127.0.0.1:5001")
+    parser.add_argument("--routes", default=None, help="Comma-separated subset of route names.")
+    parser.add_argument("--cache", choices=("warm", "cold"), default="warm",
+                        help="cold: empty the app's caches after every round of --concurrency requests.")
+    args = parser.parse_args()
+    if args.url and args.cache == "cold":
+        parser.error("--cache cold needs the in-process app; it cannot clear a running server's caches")
+
+    if not args.url:
+        configure_app(args)
+    client = Client(args.url)
+    if args.season is None:
+        sys.path.insert(0, ROOT)
+        from app import get_seasons
+        args.season = get_seasons()[1]
+
+    urls = route_urls(client, args.season, args.teams, args.players)
+    if args.routes:
+        urls = {name: urls[name] for name in args.routes.split(",")}
+
+    if args.record:
+        for name, paths in urls.items():
+            for path in paths:
+                status, _ = client.get(path)
+                print(f"{status}  {path}")
+        import app
+        print(f"Recorded {app.UPSTREAM_FIXTURE_STORE.stats()['recorded']} responses into {args.fixtures}")
+        return
+
+    print(f"season {args.season}, concurrency {args.concurrency}, {args.requests} requests/route, "
+          f"upstream latency {args.latency_ms:g}+{args.jitter_ms:g}ms, error rate {args.error_rate:g}, "
+          f"{args.cache} cache")
+    print(f"{'route':<13}{'urls':>5}{'first':>10}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>8}")
+    for name, paths in urls.items():
+        if not paths:
+            print(f"{name:<13}{0:>5}  (no URLs; were fixtures recorded for this season?)")
+            continue
+        r = run_route(client, paths, args.requests, args.concurrency,
+                      cold_in=args.warehouse if args.cache == "cold" else None)
+        print(f"{name:<13}{len(paths):>5}{r['first'] * 1e3:>8.1f}ms{r['rps']:>10.1f}"
+              f"{r['p50'] * 1e3:>8.1f}ms{r['p95'] * 1e3:>8.1f}ms{r['p99'] * 1e3:>8.1f}ms{r['errors']:>8}")
+
+if __name__ == "__main__":
+    main()
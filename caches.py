@@ -0,0 +1,318 @@
+"""
+Response caches for nba_api results (dicts of data set name -> DataFrame).
+
+ResponseCache is the in-process LRU every nba_fetch goes through first;
+SharedCache is the host-wide second level all worker processes share.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from time import time as _now
+
+import pyarrow as pa
+
+def frames_nbytes(frames: dict) -> int:
+    return int(sum(df.memory_usage(index=True, deep=True).sum() for df in frames.values()))
+
+class ResponseCache:
+    """
+    Thread-safe LRU of nba_api results bounded by total DataFrame bytes.
+    Expired entries are kept (until evicted) so callers can fall back to them
+    when stats.nba.com is failing.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> {"ts", "ttl", "frames", "nbytes"}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.stale_hits = self.evictions = 0
+
+    def get(self, key, max_stale: float = 0):
+        """
+        Return (frames, fresh). Entries past their TTL are still returned, marked
+        not fresh, while they are less than max_stale seconds over it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            overdue = _now() - entry["ts"] - entry["ttl"]
+            if overdue >= max(max_stale, 0):
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if overdue < 0:
+                self.hits += 1
+                return entry["frames"], True
+            self.stale_hits += 1
+            return entry["frames"], False
+
+    def get_stale(self, key):
+        """Last cached frames for key regardless of age (fallback when upstream fails)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.stale_hits += 1
+            return entry["frames"]
+
+    def set(self, key, frames: dict, ttl: int, stored_at: float = None):
+        nbytes = frames_nbytes(frames)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.bytes -= old["nbytes"]
+            ts = _now() if stored_at is None else stored_at
+            self._entries[key] = {"ts": ts, "ttl": ttl, "frames": frames, "nbytes": nbytes}
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted["nbytes"]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+class SharedCache:
+    """
+    Second-level cache every worker process on the host reads and fills, so a
+    dataset is fetched from stats.nba.com once per host rather than once per
+    worker. Each entry is one file of Arrow IPC streams (one per data set),
+    written under a temp name and renamed into place; a SQLite table next to
+    the files holds each key's age, TTL, size and stream offsets. Reads
+    memory-map the file, so the Arrow buffers come from the page cache all
+    workers share and only the pandas conversion allocates.
+    Leases let one worker fetch a missing key while the others wait for it to
+    land. When over max_bytes, the least recently read entries go first.
+    With no directory the cache is disabled and every lookup misses.
+    """
+
+    # Reads refresh an entry's last_access at most this often, so hot keys do
+    # not turn every hit into a SQLite write
+    ACCESS_RESOLUTION = 60
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory or None
+        self.max_bytes = max_bytes
+        self._conn = self._inherited = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.writes = self.evictions = self.lease_waits = 0
+        if self.directory:
+            try:
+                os.makedirs(os.path.join(self.directory, "entries"), exist_ok=True)
+                with self._db() as db:
+                    db.execute("""CREATE TABLE IF NOT EXISTS entries (
+                        digest TEXT PRIMARY KEY, endpoint TEXT, stored_at REAL, ttl REAL,
+                        nbytes INTEGER, layout TEXT, last_access REAL)""")
+                    if "last_access" not in {row[1] for row in db.execute("PRAGMA table_info(entries)")}:
+                        db.execute("ALTER TABLE entries ADD COLUMN last_access REAL")
+                        db.execute("UPDATE entries SET last_access = stored_at")
+                    db.execute("CREATE TABLE IF NOT EXISTS leases (digest TEXT PRIMARY KEY, expires REAL, owner TEXT)")
+                    if "owner" not in {row[1] for row in db.execute("PRAGMA table_info(leases)")}:
+                        db.execute("ALTER TABLE leases ADD COLUMN owner TEXT")
+            except Exception as e:
+                print(f"[WARN] shared cache disabled ({self.directory}): {e}")
+                self.directory = None
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per process; a forked worker opens its own
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite"), timeout=10,
+                                   check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _after_fork(self):
+        # The parent's lock may have been held mid-query at fork() and its SQLite
+        # connection must not be used from two processes; the child starts fresh.
+        # The inherited connection is kept referenced, never closed, so the child
+        # does not finalise the parent's handle.
+        self._lock = threading.Lock()
+        self._inherited, self._conn, self._pid = self._conn, None, None
+
+    def _query(self, sql: str, params=(), many: bool = False):
+        with self._lock:
+            cur = self._db().execute(sql, params)
+            return cur.fetchall() if many else cur.fetchone()
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @staticmethod
+    def digest(key) -> str:
+        return hashlib.sha1(json.dumps(key, default=str).encode("utf-8")).hexdigest()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, "entries", f"{digest}.arrow")
+
+    def get(self, key, max_stale=0):
+        """
+        (frames, fresh, stored_at), or (None, False, None) on a miss. Entries
+        past their TTL count while less than max_stale seconds over it; with
+        max_stale=None any age is returned.
+        """
+        if not self.directory:
+            return None, False, None
+        digest = self.digest(key)
+        try:
+            row = self._query("SELECT stored_at, ttl, layout, last_access FROM entries WHERE digest = ?", (digest,))
+            overdue = _now() - row[0] - row[1] if row else None
+            if row is None or (max_stale is not None and overdue >= max(max_stale, 0)):
+                self._count("misses")
+                return None, False, None
+            frames = self._read(self._path(digest), json.loads(row[2]))
+            now = _now()
+            if (row[3] or 0) < now - self.ACCESS_RESOLUTION:
+                self._query("UPDATE entries SET last_access = ? WHERE digest = ?", (now, digest))
+        except FileNotFoundError:
+            self._count("misses")
+            return None, False, None
+        except Exception as e:
+            print(f"[WARN] shared cache read failed: {e}")
+            self._count("misses")
+            return None, False, None
+        self._count("hits")
+        return frames, overdue < 0, row[0]
+
+    @staticmethod
+    def _read(path: str, layout: list) -> dict:
+        frames = {}
+        with pa.memory_map(path) as source:
+            buf = source.read_buffer()
+            for name, offset, length in layout:
+                frames[name] = pa.ipc.open_stream(buf.slice(offset, length)).read_all().to_pandas()
+        return frames
+
+    def set(self, key, endpoint_name: str, frames: dict, ttl: float, stored_at: float = None):
+        if not self.directory:
+            return
+        digest = self.digest(key)
+        path = self._path(digest)
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            layout = []
+            with pa.OSFile(tmp, "wb") as sink:
+                for name, df in frames.items():
+                    start = sink.tell()
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    with pa.ipc.new_stream(sink, table.schema) as writer:
+                        writer.write_table(table)
+                    layout.append([name, start, sink.tell() - start])
+            nbytes = os.path.getsize(tmp)
+            os.replace(tmp, path)
+            self._query(
+                "INSERT OR REPLACE INTO entries (digest, endpoint, stored_at, ttl, nbytes, layout, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (digest, endpoint_name, _now() if stored_at is None else stored_at, ttl, nbytes,
+                 json.dumps(layout), _now()),
+            )
+            self._count("writes")
+            self._evict()
+        except Exception as e:
+            print(f"[WARN] shared cache write failed for {endpoint_name}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _evict(self):
+        total = (self._query("SELECT COALESCE(SUM(nbytes), 0) FROM entries") or (0,))[0]
+        if total <= self.max_bytes:
+            return
+        for digest, nbytes in self._query("SELECT digest, nbytes FROM entries ORDER BY last_access", many=True):
+            self._query("DELETE FROM entries WHERE digest = ?", (digest,))
+            try:
+                os.remove(self._path(digest))
+            except FileNotFoundError:
+                pass
+            self._count("evictions")
+            total -= nbytes
+            if total <= self.max_bytes:
+                break
+
+    def lease(self, key, seconds: float):
+        """
+        Claim the right to fetch key for `seconds`. Returns the token to pass to
+        release(), or None if another worker holds the lease.
+        """
+        token = os.urandom(8).hex()
+        if not self.directory:
+            return token
+        digest = self.digest(key)
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    db.execute("DELETE FROM leases WHERE digest = ? AND expires < ?", (digest, _now()))
+                    claimed = db.execute("INSERT OR IGNORE INTO leases (digest, expires, owner) VALUES (?, ?, ?)",
+                                         (digest, _now() + seconds, token)).rowcount == 1
+                finally:
+                    db.execute("COMMIT")
+            return token if claimed else None
+        except Exception as e:
+            print(f"[WARN] shared cache lease failed: {e}")
+            return token
+
+    def release(self, key, token: str):
+        """Drop the lease on key if it is still the one `token` was issued for."""
+        if self.directory:
+            try:
+                self._query("DELETE FROM leases WHERE digest = ? AND owner = ?", (self.digest(key), token))
+            except Exception as e:
+                print(f"[WARN] shared cache release failed: {e}")
+
+    def wait_for(self, key, since: float, timeout: float):
+        """Frames stored for key after `since`, polling until `timeout` seconds pass."""
+        self._count("lease_waits")
+        deadline = _now() + timeout
+        digest = self.digest(key)
+        while _now() < deadline:
+            row = self._query("SELECT stored_at FROM entries WHERE digest = ?", (digest,))
+            if row and row[0] >= since:
+                return self.get(key, max_stale=None)[0]
+            if self._query("SELECT 1 FROM leases WHERE digest = ?", (digest,)) is None:
+                return None  # the other worker gave up without storing anything
+            time.sleep(0.05)
+        return None
+
+    def stats(self) -> dict:
+        if not self.directory:
+            return {"enabled": False}
+        entries, nbytes = self._query("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM entries")
+        with self._lock:
+            counters = {"hits": self.hits, "misses": self.misses, "writes": self.writes,
+                        "evictions": self.evictions, "lease_waits": self.lease_waits}
+        return {
+            "enabled": True,
+            "entries": entries,
+            "bytes": nbytes,
+            "max_bytes": self.max_bytes,
+            **counters,
+        }
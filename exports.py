@@ -0,0 +1,131 @@
+"""
+Streaming encoders for tabular exports.
+
+Each encoder takes an iterator of DataFrames (e.g. one per season) and yields
+bytes as it goes, so a response can start after the first frame and never
+holds more than one frame plus one encoded chunk. The first frame fixes the
+columns; later frames are reindexed to them, with missing columns left empty.
+Parquet gets one row group per frame and Arrow IPC one record batch per frame.
+
+If the frames iterator raises after bytes have gone out, each encoder marks the
+file as incomplete before re-raising, so a cut-off export cannot pass for a
+whole one: CSV ends with a "# error: ..." comment row, Parquet is left without
+its footer, and Arrow IPC ends in a truncated message header instead of the
+end-of-stream marker.
+"""
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+FORMATS = {
+    # format: (mimetype, file extension)
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+CSV_ROWS_PER_CHUNK = 2000
+
+# Continuation marker plus a metadata length with no metadata after it: any IPC
+# reader fails on it rather than treating the stream as complete
+_ARROW_TRUNCATED = b"\xff\xff\xff\xff" + (8).to_bytes(4, "little")
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain()."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+def _aligned(frames):
+    columns = None
+    for df in frames:
+        if columns is None:
+            columns = list(df.columns)
+        elif list(df.columns) != columns:
+            df = df.reindex(columns=columns)
+        yield df
+
+def csv_chunks(frames, rows_per_chunk: int = CSV_ROWS_PER_CHUNK):
+    header = True
+    try:
+        for df in _aligned(frames):
+            if header:
+                yield df.head(0).to_csv(index=False).encode("utf-8")
+                header = False
+            for start in range(0, len(df), rows_per_chunk):
+                yield df.iloc[start:start + rows_per_chunk].to_csv(index=False, header=False).encode("utf-8")
+    except Exception as e:
+        message = " ".join(str(e).split())
+        yield f"# error: export incomplete: {message}\n".encode("utf-8")
+        raise
+
+def _tables(frames):
+    """Arrow tables with the first frame's schema (later frames are cast to it)."""
+    schema = None
+    for df in _aligned(frames):
+        if schema is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            schema = table.schema
+        else:
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        yield table
+
+def parquet_chunks(frames):
+    # On error the writer is never closed, so the footer is never sent
+    sink = ChunkSink()
+    writer = None
+    for table in _tables(frames):
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema)
+        writer.write_table(table)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+def arrow_chunks(frames):
+    sink = ChunkSink()
+    writer = None
+    try:
+        for table in _tables(frames):
+            if writer is None:
+                writer = pa.ipc.new_stream(sink, table.schema)
+            writer.write_table(table)
+            yield sink.drain()
+    except Exception:
+        if writer is not None:
+            yield _ARROW_TRUNCATED
+        raise
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+def encode(frames, fmt: str):
+    """Byte chunks of `frames` in one of FORMATS."""
+    if fmt == "csv":
+        return csv_chunks(frames)
+    if fmt == "parquet":
+        return parquet_chunks(frames)
+    if fmt == "arrow":
+        return arrow_chunks(frames)
+    raise ValueError(f"unknown export format {fmt!r}")
@@ -0,0 +1,19 @@
+"""
+gunicorn settings for CourtVision (read automatically from the working directory).
+
+Threaded workers, because each open scoreboard event stream holds a thread; see
+SSE_MAX_STREAMS in app.py. Every worker starts the cache warm-up once it has
+loaded the app, and the host-wide lease in the shared cache lets only one of
+them do each pass. Set COURTVISION_WARMUP=0 to boot cold.
+"""
+import os
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', 5001)}")
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+threads = int(os.environ.get("GUNICORN_THREADS", 16))
+timeout = 120
+
+def post_worker_init(worker):
+    import app
+    app.start_warmup()
@@ -0,0 +1,161 @@
+"""
+Counters and latency histograms rendered in the Prometheus text format.
+
+Series are keyed by their label values; an observation is a dict lookup, a
+bisect over the bucket bounds and two additions under a lock, so recording
+every request and upstream call costs a few microseconds. Gauges read their
+values from a callback at scrape time instead of being updated on the hot path.
+
+Per-request timings for the Server-Timing header accumulate in a context
+variable. Work submitted to a thread pool through contextvars.copy_context().run
+adds to the timings of the request that submitted it.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for values, total in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, values)} {_format_value(total)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *label_values):
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += seconds
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for values, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += n
+                labels = _format_labels(self.labels, values, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{labels} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class Gauge:
+    """Value(s) read at scrape time: `collect()` returns a number or {label values: number}."""
+
+    def __init__(self, name: str, documentation: str, collect, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.collect = collect
+
+    def render(self) -> list:
+        values = self.collect()
+        if not isinstance(values, dict):
+            values = {(): values}
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                lines.append(f"# {metric.name} unavailable: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+
+# --- Per-request timings (Server-Timing) ---------------------------------------
+
+_TIMINGS = contextvars.ContextVar("request_timings", default=None)
+_TIMINGS_LOCK = threading.Lock()  # fan-out threads add to the same request's timings
+
+def start_request() -> dict:
+    """Begin collecting timings for the current request; returns the collector."""
+    timings = {"_started": time.perf_counter()}
+    _TIMINGS.set(timings)
+    return timings
+
+def current_timings():
+    """The current request's timings, or None outside a timed request."""
+    return _TIMINGS.get()
+
+def add_timing(name: str, seconds: float, description: str = None):
+    """Add `seconds` to the named timing of the current request, if one is being collected."""
+    timings = _TIMINGS.get()
+    if timings is None:
+        return
+    with _TIMINGS_LOCK:
+        entry = timings.get(name)
+        if entry is None:
+            timings[name] = [seconds, description]
+        else:
+            entry[0] += seconds
+            if description and entry[1] != description:
+                entry[1] = "mixed"
+
+def server_timing_header(timings: dict) -> str:
+    """'name;desc="...";dur=ms' entries plus the request total, for the Server-Timing header."""
+    parts = []
+    with _TIMINGS_LOCK:
+        items = [(name, list(value)) for name, value in timings.items() if not name.startswith("_")]
+    for name, value in items:
+        seconds, description = value
+        desc = f';desc="{_escape(description)}"' if description else ""
+        parts.append(f"{name}{desc};dur={seconds * 1e3:.1f}")
+    parts.append(f"total;dur={(time.perf_counter() - timings['_started']) * 1e3:.1f}")
+    return ", ".join(parts)
@@ -0,0 +1,133 @@
+"""
+Column-wise basketball metrics over nba_api stat tables.
+
+Every function takes a DataFrame with nba_api column names (PTS, FGA, MIN, ...)
+and works on whole columns with NumPy, so a full league table or a stack of
+seasons costs a handful of vector operations instead of a Python call per row.
+Undefined ratios (zero denominators) come back as NaN; callers decide whether
+that is shown as 0 or None.
+"""
+import numpy as np
+import pandas as pd
+
+PER_36_STATS = ("PTS", "REB", "AST", "STL", "BLK", "TOV", "OREB", "DREB", "FG3M", "FTA", "FGA")
+
+def col(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Column as float64 with missing values as 0 (absent columns are all zeros)."""
+    if name not in df.columns:
+        return np.zeros(len(df))
+    values = df[name]
+    if not pd.api.types.is_numeric_dtype(values):
+        values = pd.to_numeric(values, errors="coerce")
+    return np.nan_to_num(values.to_numpy(dtype=np.float64, na_value=np.nan))
+
+def with_columns(df: pd.DataFrame, new: dict) -> pd.DataFrame:
+    """Copy of df with `new` columns added (or replaced) in one concat."""
+    kept = df.drop(columns=[c for c in new if c in df.columns])
+    return pd.concat([kept, pd.DataFrame(new, index=df.index)], axis=1)
+
+def ratio(num, denom) -> np.ndarray:
+    """num / denom with NaN wherever denom is 0."""
+    num = np.asarray(num, dtype=np.float64)
+    denom = np.asarray(denom, dtype=np.float64)
+    out = np.full(np.broadcast(num, denom).shape, np.nan)
+    np.divide(num, denom, out=out, where=denom != 0)
+    return out
+
+def games(df: pd.DataFrame) -> np.ndarray:
+    """GP with 0/missing treated as 1, the convention used for per-game stats."""
+    gp = col(df, "GP")
+    return np.where(gp > 0, gp, 1.0)
+
+def true_shooting_pct(df: pd.DataFrame) -> np.ndarray:
+    # TS%: PTS / (2 * (FGA + 0.44 * FTA))
+    return 100.0 * ratio(col(df, "PTS"), 2.0 * (col(df, "FGA") + 0.44 * col(df, "FTA")))
+
+def effective_fg_pct(df: pd.DataFrame) -> np.ndarray:
+    # eFG%: (FGM + 0.5 * 3PM) / FGA
+    return 100.0 * ratio(col(df, "FGM") + 0.5 * col(df, "FG3M"), col(df, "FGA"))
+
+def efficiency(df: pd.DataFrame) -> np.ndarray:
+    """Box-score EFF over whatever unit the table holds (totals or per game)."""
+    positive = col(df, "PTS") + col(df, "REB") + col(df, "AST") + col(df, "STL") + col(df, "BLK")
+    negative = (col(df, "FGA") - col(df, "FGM")) + (col(df, "FTA") - col(df, "FTM")) + col(df, "TOV")
+    return positive - negative
+
+def three_point_rate(df: pd.DataFrame) -> np.ndarray:
+    return 100.0 * ratio(col(df, "FG3A"), col(df, "FGA"))
+
+def free_throw_rate(df: pd.DataFrame) -> np.ndarray:
+    return 100.0 * ratio(col(df, "FTA"), col(df, "FGA"))
+
+def league_totals(df: pd.DataFrame) -> dict:
+    """Sums used by the league-relative estimates below."""
+    return {c: float(col(df, c).sum()) for c in ("MIN", "FGA", "FTA", "TOV", "FGM", "REB")}
+
+def usage_pct(df: pd.DataFrame, totals: dict) -> np.ndarray:
+    num = (col(df, "FGA") + 0.44 * col(df, "FTA") + col(df, "TOV")) * (totals["MIN"] / 5)
+    denom = col(df, "MIN") * (totals["FGA"] + 0.44 * totals["FTA"] + totals["TOV"])
+    return 100.0 * ratio(num, denom)
+
+def assist_pct(df: pd.DataFrame, totals: dict) -> np.ndarray:
+    teammate_fgm = (ratio(col(df, "MIN"), totals["MIN"] / 5) * totals["FGM"]) - col(df, "FGM")
+    return 100.0 * ratio(col(df, "AST"), teammate_fgm)
+
+def rebound_pct(df: pd.DataFrame, totals: dict) -> np.ndarray:
+    return 100.0 * ratio(col(df, "REB") * (totals["MIN"] / 5), col(df, "MIN") * (2 * totals["REB"]))
+
+def pie(df: pd.DataFrame) -> np.ndarray:
+    """Player Impact Estimate as a share of the table's combined contribution."""
+    num = (
+        col(df, "PTS") + col(df, "FGM") + col(df, "FTM") - col(df, "FGA") - col(df, "FTA")
+        + col(df, "DREB") + 0.5 * col(df, "OREB") + col(df, "AST") + col(df, "STL")
+        + 0.5 * col(df, "BLK") - col(df, "PF") - col(df, "TOV")
+    )
+    total = num.sum()
+    return 100.0 * num / (total if total != 0 else 1)
+
+def add_league_metrics(df: pd.DataFrame, totals: dict = None) -> pd.DataFrame:
+    """
+    Copy of a season-totals LeagueDashPlayerStats table (PerMode Totals) with
+    TS_PCT, EFF (totals divided by GP, i.e. per game), USG_PCT, AST_PCT, REB_PCT
+    and PIE. The rates are ratios of totals; league-relative estimates use
+    `totals` (default: the table's own sums).
+    """
+    totals = totals or league_totals(df)
+    return with_columns(df, {
+        "TS_PCT": np.nan_to_num(true_shooting_pct(df)),
+        "EFF": efficiency(df) / games(df),
+        "USG_PCT": np.nan_to_num(usage_pct(df, totals)),
+        "AST_PCT": np.nan_to_num(assist_pct(df, totals)),
+        "REB_PCT": np.nan_to_num(rebound_pct(df, totals)),
+        "PIE": np.nan_to_num(pie(df)),
+    })
+
+def add_season_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy of a season-totals table (e.g. PlayerProfileV2 SeasonTotalsRegularSeason)
+    with per-game values, *_TOTAL columns, shooting rates and per-36 stats.
+    TOV itself is overwritten with its per-game value, which the detail page expects.
+    """
+    out = {}
+    gp = games(df)
+    minutes = col(df, "MIN")
+    mpg = minutes / gp
+
+    out["MPG"] = mpg
+    for stat, label in (("PTS", "PPG"), ("REB", "RPG"), ("AST", "APG"), ("STL", "SPG"), ("BLK", "BPG")):
+        out[label] = col(df, stat) / gp
+    out["TOV"] = col(df, "TOV") / gp
+
+    out["MIN_TOTAL"] = minutes
+    for stat in ("PTS", "REB", "AST", "STL", "BLK", "TOV"):
+        out[f"{stat}_TOTAL"] = col(df, stat)
+
+    out["EFG_PCT"] = effective_fg_pct(df)
+    out["TS_PCT"] = true_shooting_pct(df)
+    out["THREEPAR"] = three_point_rate(df)
+    out["FTR"] = free_throw_rate(df)
+
+    scale = np.nan_to_num(ratio(36.0, mpg))
+    for stat in PER_36_STATS:
+        out[f"{stat}_P36"] = col(df, stat) / gp * scale
+    return with_columns(df, out)
@@ -0,0 +1,180 @@
+"""
+In-memory player name index for typeahead search.
+
+Names are normalized once (accents folded, punctuation dropped, lowercased) and
+indexed two ways: a sorted token list for prefix lookups via bisect, and a
+trigram -> player map for substring and misspelling matches. A query only
+touches the players that share its prefixes or trigrams, so lookups cost the
+same whether the index holds 500 players or 5,000. Results for recent queries
+are kept in an LRU since typeahead repeats the same short prefixes constantly.
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+
+import numpy as np
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Match tiers, best first
+EXACT, NAME_PREFIX, TOKEN_PREFIX, SUBSTRING, FUZZY = range(5)
+
+def normalize(text: str) -> str:
+    """'Nikola Jokić' -> 'nikola jokic'; "D'Angelo Russell" -> 'd angelo russell'."""
+    folded = unicodedata.normalize("NFKD", text or "")
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", folded.lower()).strip()
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class PlayerIndex:
+    """
+    Index over nba_api static player dicts ({"id", "full_name", "is_active", ...}).
+    Ranking: match tier, then active players, then closeness, then shorter names.
+    """
+
+    def __init__(self, player_list: list, cache_size: int = 2048, min_similarity: float = 0.35):
+        self.players = [
+            {"id": p["id"], "name": p["full_name"], "is_active": bool(p.get("is_active"))}
+            for p in player_list
+        ]
+        self.names = [normalize(p["name"]) for p in self.players]
+        self.min_similarity = min_similarity
+
+        # (token, player index) pairs sorted for bisect; includes the whole
+        # normalized name so "lebron ja" prefixes it directly
+        token_pairs = set()
+        self._grams = {}
+        self._name_grams = []
+        for i, name in enumerate(self.names):
+            for token in name.split():
+                token_pairs.add((token, i))
+            token_pairs.add((name, i))
+            grams = trigrams(name)
+            self._name_grams.append(grams)
+            for g in grams:
+                self._grams.setdefault(g, []).append(i)
+        self._grams = {g: np.asarray(ids, dtype=np.int32) for g, ids in self._grams.items()}
+        self._gram_sizes = np.fromiter((len(g) for g in self._name_grams), dtype=np.float64, count=len(self.names))
+        self._tokens = sorted(token_pairs)
+        self._token_keys = [t for t, _ in self._tokens]
+
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.players)
+
+    def _prefixed(self, prefix: str) -> set:
+        """Players with a token (or full name) starting with prefix."""
+        lo = bisect_left(self._token_keys, prefix)
+        hi = bisect_left(self._token_keys, prefix + "￿", lo)
+        return {i for _, i in self._tokens[lo:hi]}
+
+    def _similar(self, query_grams: set) -> tuple:
+        """(player indexes sharing a trigram with the query, their Jaccard similarity)."""
+        postings = [self._grams[g] for g in query_grams if g in self._grams]
+        if not postings:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        ids = np.flatnonzero(shared)
+        overlap = shared[ids]
+        return ids, overlap / (len(query_grams) + self._gram_sizes[ids] - overlap)
+
+    def _rank(self, query: str, limit: int) -> list:
+        tiers = {}
+        similarity = {}
+
+        query_tokens = query.split()
+        candidates = None
+        for token in query_tokens:
+            matched = self._prefixed(token)
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                break
+        for i in candidates or ():
+            name = self.names[i]
+            if name == query:
+                tiers[i] = EXACT
+            elif name.startswith(query):
+                tiers[i] = NAME_PREFIX
+            else:
+                tiers[i] = TOKEN_PREFIX
+
+        # Trigrams need at least three characters to say anything useful
+        if len(query) >= 3:
+            query_grams = trigrams(query)
+            if len(tiers) >= limit:
+                # Prefix matches already fill the page and outrank anything the
+                # trigram scan could add; only their closeness is needed
+                for i in tiers:
+                    shared = len(query_grams & self._name_grams[i])
+                    similarity[i] = shared / (len(query_grams) + len(self._name_grams[i]) - shared)
+            else:
+                ids, sims = self._similar(query_grams)
+                for i, sim in zip(ids.tolist(), sims.tolist()):
+                    similarity[i] = sim
+                    if i in tiers:
+                        continue
+                    if query in self.names[i]:
+                        tiers[i] = SUBSTRING
+                    elif sim >= self.min_similarity:
+                        tiers[i] = FUZZY
+
+        return heapq.nsmallest(
+            limit,
+            tiers,
+            key=lambda i: (
+                tiers[i],
+                not self.players[i]["is_active"],
+                -similarity.get(i, 0.0),
+                len(self.names[i]),
+                self.names[i],
+            ),
+        )
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """Up to `limit` player dicts ({"id", "name", "is_active"}) best match first."""
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        key = (query, limit)
+        with self._lock:
+            ranked = self._cache.get(key)
+            if ranked is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if ranked is None:
+            ranked = self._rank(query, limit)
+            with self._lock:
+                self.misses += 1
+                self._cache[key] = ranked
+                self._cache.move_to_end(key)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+        return [self.players[i] for i in ranked]
+
+    def warm(self, max_len: int = 2, limit: int = 10) -> int:
+        """
+        Rank every 1..max_len character token prefix up front. These are the
+        first keystrokes of every search and the widest candidate sets, so they
+        are the only lookups that would otherwise cost more than a millisecond.
+        """
+        prefixes = {t[:n] for t in self._token_keys for n in range(1, max_len + 1) if len(t) >= n}
+        for prefix in prefixes:
+            self.search(prefix, limit)
+        return len(prefixes)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"players": len(self.players), "cached_queries": len(self._cache), "hits": self.hits, "misses": self.misses}
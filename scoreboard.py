@@ -0,0 +1,192 @@
+"""
+Live scoreboard shared by every visitor of a worker.
+
+One background thread polls today's games and keeps a versioned snapshot;
+readers get the snapshot, and event-stream subscribers are woken when a game
+changes. Games are dicts with a "status" of GAME_SCHEDULED, GAME_LIVE or
+GAME_FINAL (ScoreboardV2's GAME_STATUS_ID).
+"""
+import threading
+from datetime import datetime
+from time import time as _now
+
+GAME_SCHEDULED, GAME_LIVE, GAME_FINAL = 1, 2, 3
+
+class ScoreboardPoller:
+    """
+    Polls today's games with `fetch_games(day)` every `interval` seconds while
+    a game is in progress (every `idle_interval` otherwise) and keeps the
+    result as one snapshot for all requests. The snapshot's version only changes when a game
+    does, and subscribers of events() are woken on each change. The thread
+    starts on the first read and stops after `idle_timeout` seconds without
+    readers. When fetch_games reads through a cache shared by the workers, they
+    still make about one upstream call per interval between them.
+    """
+
+    def __init__(self, fetch_games, interval: float, idle_interval: float, idle_timeout: float,
+                 wait_seconds: float = 5, heartbeat_seconds: float = 15):
+        self.fetch_games = fetch_games
+        self.interval = max(1.0, interval)
+        self.idle_interval = max(self.interval, idle_interval)
+        self.idle_timeout = idle_timeout
+        self.wait_seconds = wait_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self._changed = threading.Condition()
+        self._snapshot = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._last_read = 0.0
+        self._subscribers = 0
+        self._polled_at = 0.0
+        self._attempts = 0
+        self.polls = self.changes = self.errors = 0
+        self.last_error = None
+
+    def refresh(self) -> dict:
+        """Poll once; returns the (possibly unchanged) snapshot."""
+        day = datetime.now()
+        games = self.fetch_games(day)
+        updated = datetime.now().isoformat(timespec="seconds")
+        with self._changed:
+            self.polls += 1
+            self._polled_at = _now()
+            current = self._snapshot
+            if current is None or current["games"] != games or current["date"] != day.date().isoformat():
+                self.changes += 1
+                self._snapshot = {
+                    "version": (current["version"] if current else 0) + 1,
+                    "date": day.date().isoformat(),
+                    "updated": updated,
+                    "live": sum(1 for g in games if g["status"] == GAME_LIVE),
+                    "games": games,
+                }
+                self._changed.notify_all()
+            else:
+                self._snapshot = dict(current, updated=updated)
+            return self._snapshot
+
+    def _out_of_date(self, snapshot) -> bool:
+        return (
+            snapshot is None
+            or snapshot["date"] != datetime.now().date().isoformat()
+            or _now() - self._polled_at > self.idle_interval + self.interval
+        )
+
+    def snapshot(self) -> dict:
+        """
+        The current snapshot. When there is none yet, or it is from another day
+        or older than the idle poll interval (the poller went idle), the read
+        wakes the poller and waits up to `wait_seconds` for its next
+        poll. Without a snapshot for today it returns no games.
+        """
+        self._touch()
+        with self._changed:
+            snapshot = self._snapshot
+            if self._out_of_date(snapshot):
+                attempts = self._attempts
+                self._wake.set()
+                self._changed.wait_for(lambda: self._attempts != attempts, timeout=self.wait_seconds)
+                snapshot = self._snapshot
+        if snapshot is None or snapshot["date"] != datetime.now().date().isoformat():
+            return {"version": 0, "date": datetime.now().date().isoformat(), "updated": None,
+                    "live": 0, "games": []}
+        return snapshot
+
+    def events(self, last_version: int = None, max_seconds: float = 60):
+        """
+        Yield each new snapshot, starting with the current one unless its version
+        is `last_version`, and None every `heartbeat_seconds` without a change.
+        Ends after `max_seconds`.
+        """
+        deadline = _now() + max_seconds
+        snapshot = self.snapshot()
+        with self._changed:
+            self._subscribers += 1
+        try:
+            if snapshot["version"] != last_version:
+                last_version = snapshot["version"]
+                yield snapshot
+            while _now() < deadline:
+                with self._changed:
+                    self._changed.wait_for(
+                        lambda: self._snapshot is not None and self._snapshot["version"] != last_version,
+                        timeout=min(self.heartbeat_seconds, max(0.0, deadline - _now())),
+                    )
+                    snapshot = self._snapshot
+                self._touch()
+                if snapshot is None or snapshot["version"] == last_version:
+                    yield None
+                    continue
+                last_version = snapshot["version"]
+                yield snapshot
+        finally:
+            with self._changed:
+                self._subscribers -= 1
+
+    def _failed(self, error):
+        with self._changed:
+            self.errors += 1
+            self.last_error = str(error)
+        print(f"[WARN] scoreboard poll failed: {error}")
+
+    def _touch(self):
+        self._last_read = _now()
+        if self._thread is None:
+            self.start()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            with self._changed:
+                if not self._subscribers and _now() - self._last_read > self.idle_timeout:
+                    self._thread = None
+                    return
+                snapshot = self._snapshot
+            if self._out_of_date(snapshot) or _now() - self._polled_at >= self.interval:
+                try:
+                    snapshot = self.refresh()
+                except Exception as e:
+                    self._failed(e)
+                with self._changed:
+                    self._attempts += 1
+                    self._changed.notify_all()
+            live = snapshot is not None and snapshot["live"] > 0
+            self._wake.wait(self.interval if live else self.idle_interval)
+            self._wake.clear()
+
+    def start(self):
+        with self._changed:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="nba-scoreboard", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _after_fork(self):
+        # Threads do not survive fork(); each worker starts polling on its first read
+        self._changed = threading.Condition()
+        self._wake = threading.Event()
+        self._thread = None
+        self._subscribers = 0
+
+    def stats(self) -> dict:
+        with self._changed:
+            snapshot = self._snapshot or {}
+            return {
+                "polling": self._thread is not None and not self._stop.is_set(),
+                "subscribers": self._subscribers,
+                "version": snapshot.get("version"),
+                "updated": snapshot.get("updated"),
+                "games": len(snapshot.get("games", [])),
+                "live": snapshot.get("live", 0),
+                "polls": self.polls,
+                "changes": self.changes,
+                "errors": self.errors,
+                "last_error": self.last_error,
+            }
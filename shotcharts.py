@@ -0,0 +1,136 @@
+"""
+Shot chart aggregation over ShotChartDetail rows.
+
+LOC_X / LOC_Y are in tenths of a foot with the rim at (0, 0); LOC_X runs
+-250..250 sideline to sideline and LOC_Y from -50 (baseline) upward. Bins are
+computed column-wise so a season of shots (a few thousand rows) aggregates in
+well under a millisecond per view.
+"""
+import numpy as np
+import pandas as pd
+
+ZONE_KEYS = ["SHOT_ZONE_BASIC", "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE"]
+
+# Columns the shot chart page plots and filters on
+CHART_COLUMNS = ["LOC_X", "LOC_Y", "SHOT_MADE_FLAG", "PERIOD", "SHOT_TYPE", "SHOT_DISTANCE", "SHOT_ZONE_BASIC"]
+
+_SQRT3 = np.sqrt(3.0)
+
+def filter_shots(shots: pd.DataFrame, period: str = None, result: str = None) -> pd.DataFrame:
+    """Subset by PERIOD and made/missed, matching the page's filters."""
+    if shots.empty:
+        return shots
+    mask = np.ones(len(shots), dtype=bool)
+    if period and period != "all":
+        mask &= (shots["PERIOD"].astype(str) == str(period)).to_numpy()
+    if result in ("made", "missed"):
+        mask &= (shots["SHOT_MADE_FLAG"].to_numpy() == (1 if result == "made" else 0))
+    return shots[mask]
+
+def league_zone_pct(league: pd.DataFrame) -> pd.DataFrame:
+    """LeagueAverages rows reduced to one FG% per (basic, area, range) zone."""
+    if league is None or league.empty or not set(ZONE_KEYS) <= set(league.columns):
+        return pd.DataFrame(columns=ZONE_KEYS + ["LEAGUE_FGA", "LEAGUE_FGM"])
+    return (
+        league.groupby(ZONE_KEYS, as_index=False)[["FGA", "FGM"]].sum()
+        .rename(columns={"FGA": "LEAGUE_FGA", "FGM": "LEAGUE_FGM"})
+    )
+
+def _pct(made, attempts):
+    made = np.asarray(made, dtype=np.float64)
+    attempts = np.asarray(attempts, dtype=np.float64)
+    out = np.zeros_like(made)
+    np.divide(made, attempts, out=out, where=attempts > 0)
+    return np.round(100.0 * out, 1)
+
+def zone_summary(shots: pd.DataFrame, league: pd.DataFrame = None) -> list:
+    """
+    FGA/FGM/FG% per SHOT_ZONE_BASIC, most attempted first, with the league FG%
+    for the same zone (summed over its areas and ranges) when available.
+    """
+    if shots.empty:
+        return []
+    made = shots["SHOT_MADE_FLAG"].astype(int)
+    grouped = (
+        pd.DataFrame({"zone": shots["SHOT_ZONE_BASIC"].fillna("Unknown"), "FGM": made})
+        .groupby("zone")["FGM"].agg(FGA="size", FGM="sum")
+        .sort_values("FGA", ascending=False)
+    )
+    out = pd.DataFrame({
+        "zone": grouped.index,
+        "fga": grouped["FGA"].to_numpy(),
+        "fgm": grouped["FGM"].to_numpy(),
+        "fg_pct": _pct(grouped["FGM"], grouped["FGA"]),
+    })
+
+    lz = league_zone_pct(league)
+    if not lz.empty:
+        by_basic = lz.groupby("SHOT_ZONE_BASIC")[["LEAGUE_FGA", "LEAGUE_FGM"]].sum()
+        by_basic = by_basic.reindex(out["zone"])
+        league_pct = _pct(by_basic["LEAGUE_FGM"].fillna(0), by_basic["LEAGUE_FGA"].fillna(0))
+        has_league = by_basic["LEAGUE_FGA"].fillna(0).to_numpy() > 0
+        out["league_fg_pct"] = np.where(has_league, league_pct, np.nan)
+        out["vs_league"] = np.round(out["fg_pct"] - out["league_fg_pct"], 1)
+
+    return out.astype(object).where(out.notna(), None).to_dict("records")
+
+def hex_bins(shots: pd.DataFrame, size: float = 15.0, league: pd.DataFrame = None) -> list:
+    """
+    Pointy-top hexagonal bins of `size` (tenths of a foot, center to corner).
+    Each bin reports its center, attempts, makes and FG%, and, with league
+    data, the expected FG% of those same shots at league-average zone rates.
+    """
+    if shots.empty:
+        return []
+    x = shots["LOC_X"].to_numpy(dtype=np.float64)
+    y = shots["LOC_Y"].to_numpy(dtype=np.float64)
+
+    # Axial hex coordinates, then cube rounding to the nearest hex
+    q = (_SQRT3 / 3.0 * x - y / 3.0) / size
+    r = (2.0 / 3.0 * y) / size
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+
+    frame = pd.DataFrame({
+        "q": rq.astype(np.int64),
+        "r": rr.astype(np.int64),
+        "made": shots["SHOT_MADE_FLAG"].to_numpy(dtype=np.int64),
+    })
+    aggs = {"fga": ("made", "size"), "fgm": ("made", "sum")}
+
+    lz = league_zone_pct(league)
+    if not lz.empty and set(ZONE_KEYS) <= set(shots.columns):
+        expected = shots[ZONE_KEYS].merge(lz, on=ZONE_KEYS, how="left")
+        frame["expected"] = _pct(expected["LEAGUE_FGM"].fillna(0), expected["LEAGUE_FGA"].fillna(0)) / 100.0
+        frame.loc[expected["LEAGUE_FGA"].isna().to_numpy(), "expected"] = np.nan
+        aggs["expected"] = ("expected", "mean")
+
+    grouped = frame.groupby(["q", "r"], sort=False).agg(**aggs).reset_index()
+    centers_x = size * (_SQRT3 * grouped["q"] + _SQRT3 / 2.0 * grouped["r"])
+    centers_y = size * 1.5 * grouped["r"]
+    out = pd.DataFrame({
+        "x": np.round(centers_x, 1),
+        "y": np.round(centers_y, 1),
+        "fga": grouped["fga"],
+        "fgm": grouped["fgm"],
+        "fg_pct": _pct(grouped["fgm"], grouped["fga"]),
+    })
+    if "expected" in grouped.columns:
+        out["league_fg_pct"] = np.round(100.0 * grouped["expected"], 1)
+        out["vs_league"] = np.round(out["fg_pct"] - out["league_fg_pct"], 1)
+    out = out.sort_values("fga", ascending=False)
+    return out.astype(object).where(out.notna(), None).to_dict("records")
+
+def columnar(shots: pd.DataFrame, columns: list = None) -> dict:
+    """Raw shots as {"columns": [...], "data": {column: [values]}}, one list per column."""
+    columns = [c for c in (columns or CHART_COLUMNS) if c in shots.columns]
+    data = {}
+    for c in columns:
+        values = shots[c]
+        data[c] = values.astype(object).where(values.notna(), None).tolist()
+    return {"columns": columns, "count": len(shots), "data": data}
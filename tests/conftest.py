@@ -0,0 +1,14 @@
+"""
+Test setup: app is imported against a throwaway warehouse and shared cache,
+with the boot warm-up and the upstream rate limit off. No test talks to
+stats.nba.com; those that need upstream replace nba_fetch / nbacall_retry.
+"""
+import os
+import sys
+import tempfile
+
+os.environ["COURTVISION_WAREHOUSE"] = tempfile.mkdtemp(prefix="courtvision-tests-")
+os.environ["COURTVISION_WARMUP"] = "0"
+os.environ["COURTVISION_UPSTREAM_RATE"] = "0"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
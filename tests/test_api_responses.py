@@ -0,0 +1,72 @@
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+
+def league(n: int = 40, points: float = 100.0) -> pd.DataFrame:
+    return pd.DataFrame({
+        "PLAYER_ID": np.arange(n),
+        "PLAYER_NAME": [f"Player {i}" for i in range(n)],
+        "TEAM_ABBREVIATION": ["BOS", "NYK"] * (n // 2),
+        "GP": np.full(n, 10),
+        "MIN": np.full(n, 300.0),
+        "PTS": np.arange(n) * points,
+    })
+
+@pytest.fixture
+def tables(monkeypatch):
+    current = {"table": app.LeaguePlayerTable("2024-25", league())}
+    monkeypatch.setattr(app, "get_league_player_table", lambda season: current["table"])
+    return current
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+def test_players_etag_and_304(tables, client):
+    first = client.get("/api/players?season=2024-25")
+    etag = first.headers["ETag"].strip('"')
+    assert first.status_code == 200 and first.get_json()["total"] == 40
+
+    again = client.get("/api/players?season=2024-25", headers={"If-None-Match": f'"{etag}"'})
+    assert again.status_code == 304
+    assert again.data == b""
+
+    other = client.get("/api/players?season=2024-25&limit=5")
+    assert other.headers["ETag"].strip('"') != etag
+
+def test_players_etag_follows_the_dataset_version(tables, client):
+    etag = client.get("/api/players?season=2024-25").headers["ETag"]
+    tables["table"] = app.LeaguePlayerTable("2024-25", league(points=101.0))
+    refreshed = client.get("/api/players?season=2024-25", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+
+def test_gzip_variant_has_its_own_tag(tables, client):
+    plain = client.get("/api/players?season=2024-25")
+    zipped = client.get("/api/players?season=2024-25", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in zipped.headers["Vary"]
+    assert gzip.decompress(zipped.data) == plain.data
+    assert zipped.headers["ETag"].strip('"') == plain.headers["ETag"].strip('"') + "-gzip"
+
+    cached = client.get("/api/players?season=2024-25",
+                        headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["ETag"]})
+    assert cached.status_code == 304
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get("/api/search-players?q=lebron&limit=1", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert response.headers.get("ETag")  # content tag added for routes without a dataset version
+
+def test_dataframes_encode_as_records_with_nulls():
+    df = pd.DataFrame({"PTS": [1.5, np.nan], "NAME": ["a", None]})
+    assert json.loads(app.encode_json({"data": df, "count": np.int64(2)})) == {
+        "data": [{"PTS": 1.5, "NAME": "a"}, {"PTS": None, "NAME": None}],
+        "count": 2,
+    }
@@ -0,0 +1,100 @@
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from caches import ResponseCache, SharedCache
+
+FRAMES = {"Rows": pd.DataFrame({"PLAYER_ID": range(200), "PTS": [float(i) for i in range(200)]})}
+
+@pytest.fixture
+def shared(tmp_path):
+    return SharedCache(str(tmp_path / "shared"), 1 << 30)
+
+def test_lease_is_exclusive_until_released(shared):
+    token = shared.lease("k", 60)
+    assert token is not None
+    assert shared.lease("k", 60) is None
+    shared.release("k", token)
+    assert shared.lease("k", 60) is not None
+
+def test_release_with_another_token_keeps_the_lease(shared):
+    token = shared.lease("k", 60)
+    shared.release("k", "not-" + token)
+    assert shared.lease("k", 60) is None
+    shared.release("k", token)
+    assert shared.lease("k", 60) is not None
+
+def test_expired_lease_can_be_taken_over_and_old_owner_cannot_release_it(shared):
+    stale = shared.lease("k", -1)
+    fresh = shared.lease("k", 60)
+    assert fresh is not None and fresh != stale
+    shared.release("k", stale)
+    assert shared.lease("k", 60) is None
+
+def test_leases_are_per_key(shared):
+    assert shared.lease("a", 60) is not None
+    assert shared.lease("b", 60) is not None
+
+def test_leases_are_shared_between_instances(tmp_path):
+    first = SharedCache(str(tmp_path / "shared"), 1 << 30)
+    second = SharedCache(str(tmp_path / "shared"), 1 << 30)
+    token = first.lease("k", 60)
+    assert second.lease("k", 60) is None
+    first.release("k", token)
+    assert second.lease("k", 60) is not None
+
+def test_disabled_cache_always_grants(tmp_path):
+    disabled = SharedCache("", 1 << 30)
+    assert disabled.lease("k", 60) is not None
+    assert disabled.lease("k", 60) is not None
+    assert disabled.get("k") == (None, False, None)
+
+def test_round_trip_and_ttl(shared):
+    shared.set("k", "Test", FRAMES, ttl=60)
+    frames, fresh, _ = shared.get("k")
+    assert fresh
+    pd.testing.assert_frame_equal(frames["Rows"], FRAMES["Rows"])
+    shared.set("old", "Test", FRAMES, ttl=60, stored_at=0)
+    assert shared.get("old")[0] is None
+    frames, fresh, _ = shared.get("old", max_stale=None)
+    assert frames is not None and not fresh
+
+def test_eviction_drops_the_least_recently_read(shared):
+    for key in ("a", "b", "c"):
+        shared.set(key, "Test", FRAMES, ttl=60)
+    size = shared.stats()["bytes"] // 3
+    shared._query("UPDATE entries SET last_access = 0")
+    shared.get("a")
+    shared.max_bytes = 2 * size
+    shared.set("d", "Test", FRAMES, ttl=60)
+    assert [key for key in "abcd" if shared.get(key)[0] is not None] == ["a", "d"]
+
+def test_old_index_gains_owner_and_last_access_columns(tmp_path):
+    directory = tmp_path / "shared"
+    os.makedirs(directory / "entries")
+    db = sqlite3.connect(directory / "index.sqlite")
+    db.execute("CREATE TABLE entries (digest TEXT PRIMARY KEY, endpoint TEXT, stored_at REAL, ttl REAL, "
+               "nbytes INTEGER, layout TEXT)")
+    db.execute("CREATE TABLE leases (digest TEXT PRIMARY KEY, expires REAL)")
+    db.execute("INSERT INTO entries VALUES ('x', 'Test', 5, 60, 1, '[]')")
+    db.commit()
+    db.close()
+    shared = SharedCache(str(directory), 1 << 30)
+    assert shared.directory is not None
+    assert shared._query("SELECT last_access FROM entries") == (5.0,)
+    token = shared.lease("k", 60)
+    shared.release("k", token)
+    assert shared.lease("k", 60) is not None
+
+def test_response_cache_evicts_least_recently_used():
+    size = sum(df.memory_usage(index=True, deep=True).sum() for df in FRAMES.values())
+    cache = ResponseCache(max_bytes=2 * size)
+    cache.set("a", FRAMES, ttl=60)
+    cache.set("b", FRAMES, ttl=60)
+    cache.get("a")
+    cache.set("c", FRAMES, ttl=60)
+    assert cache.get("a")[0] is not None
+    assert cache.get("b")[0] is None
+    assert cache.stats()["evictions"] == 1
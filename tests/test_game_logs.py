@@ -0,0 +1,123 @@
+import time
+
+import pandas as pd
+import pytest
+
+import app
+from app import GAME_LOGS, TeamGameLog, sync_game_log, upsert_games
+
+def team_log(*games) -> pd.DataFrame:
+    """TeamGameLog-shaped rows, newest first, from (game_id, 'APR 14, 2024', 'W'|'L', pts)."""
+    rows = [
+        {"Team_ID": 1610612738, "Game_ID": gid, "GAME_DATE": date, "WL": wl, "W": 0, "L": 0, "W_PCT": 0.0, "PTS": pts}
+        for gid, date, wl, pts in games
+    ]
+    return pd.DataFrame(rows).iloc[::-1].reset_index(drop=True)
+
+OCT_22 = ("001", "OCT 22, 2026", "W", 110)
+OCT_24 = ("002", "OCT 24, 2026", "L", 98)
+OCT_26 = ("003", "OCT 26, 2026", "W", 121)
+
+def test_upsert_is_idempotent_and_recomputes_records():
+    current = team_log(OCT_22, OCT_24)
+    merged = upsert_games(current, team_log(OCT_24, OCT_26))
+    assert list(merged["Game_ID"]) == ["003", "002", "001"]
+    assert list(merged["W"]) == [2, 1, 1]
+    assert list(merged["L"]) == [1, 1, 0]
+    assert merged["W_PCT"].iloc[0] == pytest.approx(0.667)
+    assert upsert_games(merged, team_log(OCT_24, OCT_26)).equals(merged)
+
+def test_upsert_prefers_new_rows():
+    final_score = ("002", "OCT 24, 2026", "L", 104)
+    merged = upsert_games(team_log(OCT_22, OCT_24), team_log(final_score))
+    assert merged.set_index("Game_ID").loc["002", "PTS"] == 104
+    assert len(merged) == 2
+
+def test_upsert_keeps_league_log_oldest_first():
+    league = pd.DataFrame({
+        "TEAM_ID": [1, 2, 1], "GAME_ID": ["002", "002", "001"],
+        "GAME_DATE": ["2026-10-24", "2026-10-24", "2026-10-22"],
+    })
+    merged = upsert_games(None, league, newest_first=False)
+    assert list(merged["GAME_ID"]) == ["001", "002", "002"]
+
+def test_upsert_with_nothing_new_returns_current():
+    current = team_log(OCT_22)
+    assert upsert_games(current, pd.DataFrame()) is current
+
+class FakeUpstream:
+    """Full loads through nba_fetch and date-bounded deltas through nbacall_retry."""
+
+    def __init__(self, monkeypatch, full: pd.DataFrame):
+        self.full = full
+        self.delta = pd.DataFrame()
+        self.delta_error = None
+        self.full_calls = []
+        self.delta_calls = []
+        monkeypatch.setattr(app, "nba_fetch", self.nba_fetch)
+        monkeypatch.setattr(app, "nbacall_retry", self.nbacall_retry)
+        monkeypatch.setattr(app, "endpoint_frames", lambda resp: {"TeamGameLog": resp})
+
+    def nba_fetch(self, endpoint_cls, **kwargs):
+        self.full_calls.append(kwargs)
+        return app.NBAFrames({"TeamGameLog": self.full})
+
+    def nbacall_retry(self, endpoint_cls, **kwargs):
+        self.delta_calls.append(kwargs)
+        if self.delta_error:
+            raise self.delta_error
+        return self.delta
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "background sync did not finish"
+        time.sleep(0.01)
+
+@pytest.fixture
+def season(monkeypatch):
+    # Single worker: no shared-cache copy to pick up instead of syncing
+    monkeypatch.setattr(app.SHARED_CACHE, "directory", None)
+    GAME_LOGS.clear()
+    return app.get_seasons()[0]
+
+def expire(team_id: int, season: str):
+    key = ("TeamGameLog", season, team_id)
+    entry = GAME_LOGS.get(key)
+    GAME_LOGS.put(key, entry["df"], entry["name"], synced=0)
+
+def test_cold_load_then_served_from_memory(monkeypatch, season):
+    upstream = FakeUpstream(monkeypatch, team_log(OCT_22, OCT_24))
+    first = sync_game_log(TeamGameLog, season, team_id=101).get_data_frames()[0]
+    again = sync_game_log(TeamGameLog, season, team_id=101).get_data_frames()[0]
+    assert len(first) == 2
+    assert again is first
+    assert len(upstream.full_calls) == 1
+    assert upstream.delta_calls == []
+
+def test_stale_log_is_served_at_once_and_synced_in_the_background(monkeypatch, season):
+    upstream = FakeUpstream(monkeypatch, team_log(OCT_22, OCT_24))
+    sync_game_log(TeamGameLog, season, team_id=102)
+    expire(102, season)
+    upstream.delta = team_log(OCT_24, OCT_26)
+
+    stale = sync_game_log(TeamGameLog, season, team_id=102).get_data_frames()[0]
+    assert len(stale) == 2
+    wait_for(lambda: GAME_LOGS.get(("TeamGameLog", season, 102))["synced"] > 0)
+
+    assert upstream.delta_calls[0]["date_from_nullable"] == "10/24/2026"
+    synced = sync_game_log(TeamGameLog, season, team_id=102).get_data_frames()[0]
+    assert list(synced["Game_ID"]) == ["003", "002", "001"]
+    assert list(synced["W"]) == [2, 1, 1]
+    assert len(upstream.full_calls) == 1
+
+def test_failed_delta_keeps_the_log_and_waits_a_ttl(monkeypatch, season):
+    upstream = FakeUpstream(monkeypatch, team_log(OCT_22, OCT_24))
+    held = sync_game_log(TeamGameLog, season, team_id=103).get_data_frames()[0]
+    expire(103, season)
+    upstream.delta_error = ConnectionError("upstream down")
+
+    sync_game_log(TeamGameLog, season, team_id=103)
+    wait_for(lambda: GAME_LOGS.get(("TeamGameLog", season, 103))["synced"] > 0)
+    assert sync_game_log(TeamGameLog, season, team_id=103).get_data_frames()[0] is held
+    assert len(upstream.delta_calls) == 1
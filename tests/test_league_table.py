@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import LeaguePlayerTable
+
+def league(n: int = 60, seed: int = 7) -> pd.DataFrame:
+    """A Totals-shaped league table with many tied PTS and AST values."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "PLAYER_ID": np.arange(1000, 1000 + n),
+        "PLAYER_NAME": [f"Player {i:02d}" for i in range(n)],
+        "TEAM_ABBREVIATION": rng.choice(["BOS", "NYK", "LAL"], n),
+        "GP": rng.integers(1, 82, n),
+        "MIN": rng.integers(10, 3000, n).astype(float),
+        "PTS": rng.integers(0, 6, n) * 100.0,
+        "AST": rng.integers(0, 3, n) * 50.0,
+        "REB": rng.integers(0, 800, n).astype(float),
+        "FGA": rng.integers(1, 1500, n).astype(float),
+        "FTA": rng.integers(0, 500, n).astype(float),
+    })
+
+@pytest.fixture(scope="module")
+def table():
+    return LeaguePlayerTable("2024-25", league())
+
+def expected_order(table, sort_by: str, mask=None) -> list:
+    keys = table.sort_values[sort_by].to_numpy()
+    rows = range(len(keys)) if mask is None else np.flatnonzero(mask)
+    return sorted(rows, key=lambda i: (-keys[i], i))
+
+def ids(rows: pd.DataFrame) -> list:
+    return list(rows["PLAYER_ID"])
+
+@pytest.mark.parametrize("sort_by", ["PTS", "AST", "REB"])
+@pytest.mark.parametrize("page_size", [1, 7, 10, 60])
+def test_pages_are_slices_of_one_sort(table, sort_by, page_size):
+    full, total = table.query(sort_by=sort_by)
+    assert total == 60
+    assert list(full.index) == expected_order(table, sort_by)
+
+    paged = []
+    for offset in range(0, total, page_size):
+        rows, page_total = table.query(sort_by=sort_by, offset=offset, limit=page_size)
+        assert page_total == total
+        paged += ids(rows)
+    assert paged == ids(full)
+
+def test_ties_keep_table_order(table):
+    rows, _ = table.query(sort_by="PTS")
+    pts = table.sort_values["PTS"].to_numpy()
+    for value in np.unique(pts):
+        tied = [i for i in rows.index if pts[i] == value]
+        assert tied == sorted(tied)
+
+def test_filters_and_paging_agree(table):
+    mask = (table.full["TEAM_ABBREVIATION"] == "BOS").to_numpy()
+    rows, total = table.query(team="BOS", sort_by="PTS", offset=3, limit=5)
+    assert total == mask.sum()
+    assert list(rows.index) == expected_order(table, "PTS", mask)[3:8]
+
+def test_text_sort_is_descending_with_stable_ties(table):
+    rows, _ = table.query(sort_by="TEAM_ABBREVIATION")
+    teams = list(rows["TEAM_ABBREVIATION"])
+    assert teams == sorted(teams, reverse=True)
+    for team in set(teams):
+        tied = [i for i in rows.index if table.full.at[i, "TEAM_ABBREVIATION"] == team]
+        assert tied == sorted(tied)
+
+def test_fields_project_columns(table):
+    rows, _ = table.query(sort_by="PTS", limit=3, fields=["PLAYER_NAME", "PTS", "NOT_A_COLUMN"])
+    assert list(rows.columns) == ["PLAYER_NAME", "PTS"]
+    assert len(rows) == 3
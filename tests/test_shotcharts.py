@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import shotcharts
+
+def shots(points, made) -> pd.DataFrame:
+    x, y = zip(*points)
+    return pd.DataFrame({"LOC_X": x, "LOC_Y": y, "SHOT_MADE_FLAG": made})
+
+def distance_in_sizes(a, b, size: float) -> float:
+    return float(np.hypot(a[0] - b[0], a[1] - b[1])) / size
+
+def test_nearby_shots_share_a_bin():
+    bins = shotcharts.hex_bins(shots([(0, 0), (2, 1), (-1, -2)], [1, 0, 1]), size=15)
+    assert len(bins) == 1
+    assert bins[0]["fga"] == 3 and bins[0]["fgm"] == 2
+    assert bins[0]["fg_pct"] == pytest.approx(66.7, abs=0.1)
+    assert (bins[0]["x"], bins[0]["y"]) == (0.0, 0.0)
+
+def test_each_shot_lands_in_its_nearest_hex_center():
+    rng = np.random.default_rng(3)
+    points = list(zip(rng.uniform(-250, 250, 500), rng.uniform(-50, 400, 500)))
+    size = 15
+    centers = [(b["x"], b["y"]) for b in shotcharts.hex_bins(shots(points, np.zeros(500, dtype=int)), size=size)]
+    for point in points:
+        nearest = min(distance_in_sizes(point, c, size) for c in centers)
+        # inside a pointy-top hexagon: no farther from its center than a corner
+        assert nearest <= 1.0 + 1e-6
+
+def test_bins_are_sorted_by_attempts_and_add_up():
+    data = shots([(0, 0)] * 5 + [(100, 100)] * 2 + [(-150, 200)], [1, 1, 0, 0, 0, 1, 1, 0])
+    bins = shotcharts.hex_bins(data, size=15)
+    assert [b["fga"] for b in bins] == [5, 2, 1]
+    assert sum(b["fgm"] for b in bins) == int(data["SHOT_MADE_FLAG"].sum())
+
+def test_no_shots_no_bins():
+    assert shotcharts.hex_bins(shots([(0, 0)], [1]).iloc[:0]) == []
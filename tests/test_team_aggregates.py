@@ -0,0 +1,38 @@
+import pandas as pd
+
+from app import build_team_aggregates
+
+def league_log() -> pd.DataFrame:
+    rows = [
+        # TEAM_ID, GAME_DATE, MATCHUP, WL, PTS
+        (1, "2024-10-22", "BOS vs. NYK", "W", 110),
+        (1, "2024-10-25", "BOS @ LAL", "L", 100),
+        (1, "2024-11-02", "BOS vs. MIA", "W", 120),
+        (2, "2024-10-22", "NYK @ BOS", "L", 95),
+        (2, "2024-11-03", "NYK vs. DEN", "W", 105),
+    ]
+    return pd.DataFrame(rows, columns=["TEAM_ID", "GAME_DATE", "MATCHUP", "WL", "PTS"])
+
+def test_records_and_splits_per_team():
+    aggregates = build_team_aggregates(league_log())
+    boston = aggregates[1]
+    assert (boston["games"], boston["wins"], boston["losses"]) == (3, 2, 1)
+    assert boston["monthly"][10] == {"wins": 1, "losses": 1, "pts_avg": 105.0}
+    assert boston["monthly"][11] == {"wins": 1, "losses": 0, "pts_avg": 120.0}
+    assert boston["home"] == {"wins": 2, "losses": 0, "pts_avg": 115.0}
+    assert boston["road"] == {"wins": 0, "losses": 1, "pts_avg": 100.0}
+    assert boston["east_pts_avg"] == 115.0
+    assert boston["west_pts_avg"] == 100.0
+
+    new_york = aggregates[2]
+    assert (new_york["wins"], new_york["losses"]) == (1, 1)
+    assert new_york["road"]["wins"] == 0 and new_york["home"]["wins"] == 1
+
+def test_team_game_log_spelling_and_dates():
+    log = league_log().rename(columns={"TEAM_ID": "Team_ID"})
+    log["GAME_DATE"] = ["OCT 22, 2024", "OCT 25, 2024", "NOV 02, 2024", "OCT 22, 2024", "NOV 03, 2024"]
+    assert build_team_aggregates(log) == build_team_aggregates(league_log())
+
+def test_empty_or_unusable_logs():
+    assert build_team_aggregates(pd.DataFrame()) == {}
+    assert build_team_aggregates(league_log().drop(columns=["WL"])) == {}
@@ -0,0 +1,195 @@
+import time
+
+import pytest
+import requests
+
+import app
+from upstream_health import CircuitOpen, EndpointHealth, TokenBucket
+
+def make_health(**overrides) -> EndpointHealth:
+    options = dict(failure_threshold=3, reset_timeout=30, min_timeout=0.1, p99_multiplier=3.0)
+    options.update(overrides)
+    return EndpointHealth("Test", **options)
+
+def trip(health: EndpointHealth):
+    for _ in range(health.failure_threshold):
+        health.before_call()
+        health.failure()
+
+def expire(health: EndpointHealth):
+    health.opened_at -= health.reset_timeout + 1
+
+def test_consecutive_failures_open_the_circuit():
+    health = make_health()
+    for _ in range(health.failure_threshold - 1):
+        health.before_call()
+        health.failure()
+    assert health.state == EndpointHealth.CLOSED
+    health.before_call()
+    health.failure()
+    assert health.state == EndpointHealth.OPEN
+    with pytest.raises(CircuitOpen):
+        health.before_call()
+    assert health.stats()["short_circuited"] == 1
+
+def test_success_resets_the_failure_count():
+    health = make_health()
+    for _ in range(health.failure_threshold - 1):
+        health.before_call()
+        health.failure()
+    health.before_call()
+    health.success(0.01)
+    health.before_call()
+    health.failure()
+    assert health.state == EndpointHealth.CLOSED
+
+def test_half_open_admits_a_single_probe():
+    health = make_health()
+    trip(health)
+    expire(health)
+    health.before_call()
+    assert health.state == EndpointHealth.HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        health.before_call()
+    health.success(0.01)
+    assert health.state == EndpointHealth.CLOSED
+    health.before_call()
+
+def test_failed_probe_reopens():
+    health = make_health()
+    trip(health)
+    expire(health)
+    health.before_call()
+    health.failure()
+    assert health.state == EndpointHealth.OPEN
+    with pytest.raises(CircuitOpen):
+        health.before_call()
+
+def test_release_frees_the_probe_without_a_verdict():
+    health = make_health()
+    trip(health)
+    expire(health)
+    health.before_call()
+    health.release()
+    assert health.state == EndpointHealth.HALF_OPEN
+    health.before_call()
+
+def test_timeout_adapts_to_p99_with_a_floor():
+    health = make_health()
+    assert health.timeout(60) == 60  # too few samples
+    for _ in range(EndpointHealth.MIN_SAMPLES):
+        health.success(0.01)
+    assert health.timeout(60) == pytest.approx(0.1)
+    for _ in range(EndpointHealth.MIN_SAMPLES):
+        health.success(1.0)
+    assert health.timeout(60) == pytest.approx(3.0)
+    assert health.timeout(2) == 2
+
+def test_recorded_timeouts_raise_the_adaptive_timeout():
+    health = make_health()
+    for _ in range(EndpointHealth.MIN_SAMPLES):
+        health.success(0.05)
+    first = health.timeout(60)
+    for _ in range(5):
+        health.record(first)
+    assert health.timeout(60) == pytest.approx(3 * first)
+
+def test_opening_clears_the_latency_window():
+    health = make_health()
+    for _ in range(EndpointHealth.MIN_SAMPLES):
+        health.success(0.01)
+    trip(health)
+    assert health.stats()["samples"] == 0
+    expire(health)
+    health.before_call()
+    assert health.timeout(60) == 60
+
+class FakeEndpoint:
+    """Stands in for an nba_api endpoint class; `behaviour(timeout)` runs per attempt."""
+    attempts = 0
+    behaviour = None
+
+    def __init__(self, timeout=None, **kwargs):
+        type(self).attempts += 1
+        type(self).behaviour(timeout)
+
+def fake_endpoint(name: str, behaviour):
+    return type(name, (FakeEndpoint,), {"attempts": 0, "behaviour": staticmethod(behaviour)})
+
+def call(endpoint_cls, retries: int = 3, timeout: float = 60):
+    return app.nbacall_retry(endpoint_cls, retries=retries, backoff=0, timeout=timeout)
+
+def test_retried_call_counts_one_failure():
+    def down(timeout):
+        raise requests.exceptions.ConnectionError("down")
+    endpoint = fake_endpoint("AlwaysDown", down)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        call(endpoint, retries=3)
+    assert endpoint.attempts == 3
+    assert app.endpoint_health(endpoint).failures == 1
+
+def test_non_transient_error_is_not_retried_or_counted():
+    def bad_payload(timeout):
+        raise KeyError("resultSets")
+    endpoint = fake_endpoint("BadPayload", bad_payload)
+    health = app.endpoint_health(endpoint)
+    trip(health)
+    expire(health)
+    with pytest.raises(KeyError):
+        call(endpoint)
+    assert endpoint.attempts == 1
+    assert health.failures == health.failure_threshold
+    # the probe slot was handed back, so the next call may probe
+    health.before_call()
+
+def test_open_then_slow_but_successful_probe_closes():
+    upstream = {"latency": 0.01}
+
+    def respond(timeout):
+        if timeout < upstream["latency"]:
+            raise requests.exceptions.ReadTimeout("read timed out")
+
+    endpoint = fake_endpoint("SlowDown", respond)
+    health = app.endpoint_health(endpoint)
+    for _ in range(EndpointHealth.MIN_SAMPLES):
+        call(endpoint, retries=1)
+    learned = health.timeout(60)
+    assert learned < 60
+
+    # upstream slows beyond anything the adaptive timeout allows
+    upstream["latency"] = 30
+    for _ in range(health.failure_threshold):
+        with pytest.raises(requests.exceptions.Timeout):
+            call(endpoint, retries=1)
+    assert health.state == EndpointHealth.OPEN
+    with pytest.raises(CircuitOpen):
+        call(endpoint, retries=1)
+
+    # the probe gets the caller's timeout, so a slow answer still closes the circuit
+    expire(health)
+    call(endpoint, retries=1, timeout=60)
+    assert health.state == EndpointHealth.CLOSED
+    call(endpoint, retries=1, timeout=60)
+    assert health.state == EndpointHealth.CLOSED
+
+def test_token_bucket_allows_a_burst_then_paces():
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate=100, burst=1)
+    bucket.acquire()
+    started = time.monotonic()
+    bucket.acquire()
+    assert 0.005 <= time.monotonic() - started < 0.5
+
+def test_token_bucket_pause_holds_everyone():
+    bucket = TokenBucket(rate=1000, burst=5)
+    bucket.pause(0.5)
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+    assert bucket.stats()["pauses"] == 1
+
+def test_token_bucket_rate_zero_is_unlimited():
+    bucket = TokenBucket(rate=0, burst=1)
+    assert all(bucket.reserve() == 0 for _ in range(100))
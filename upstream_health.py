@@ -0,0 +1,194 @@
+"""
+Health of upstream (stats.nba.com) endpoints.
+
+EndpointHealth is a per-endpoint circuit breaker that also keeps a window of
+recent latencies, from which it derives an adaptive timeout. While a circuit is
+open, callers get CircuitOpen without contacting upstream. TokenBucket is the
+process-wide rate limit every upstream request draws from.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second up to `burst`. acquire()
+    blocks until a token is available. pause() makes every caller wait, which is
+    how one throttled request slows the whole process down instead of only its
+    own retry loop.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+        self.waited = 0.0
+        self.pauses = 0
+
+    def configure(self, rate: float = None, burst: int = None):
+        with self._lock:
+            if rate is not None:
+                self.rate = float(rate)
+            if burst is not None:
+                self.burst = max(1, int(burst))
+                self._tokens = min(self._tokens, self.burst)
+
+    def reserve(self) -> float:
+        """Take a token and return 0, or return how long to wait before trying again."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            delay = self._resume_at - now
+            if delay <= 0:
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return 0.0
+                delay = (1 - self._tokens) / self.rate
+            self.waited += delay
+            return delay
+
+    def acquire(self):
+        while True:
+            delay = self.reserve()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        while True:
+            delay = self.reserve()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self.pauses += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"rate": self.rate, "burst": self.burst, "waited_s": round(self.waited, 3), "pauses": self.pauses}
+
+class CircuitOpen(RuntimeError):
+    """Raised without contacting upstream while an endpoint's circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit open; next probe in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+class EndpointHealth:
+    """
+    Circuit breaker plus a latency window for one nba_api endpoint.
+    closed: calls go through; `failure_threshold` consecutive failures open it.
+    open: calls fail immediately with CircuitOpen for `reset_timeout` seconds.
+    half_open: a single probe call goes through; success closes the circuit,
+    failure opens it again.
+    A call is one verdict however many attempts it takes: success(), failure(),
+    or release() when it ended without one (a non-transient error, cancellation).
+    Timeouts adapt to the recent p99 latency once there are enough samples, so
+    a hung connection is dropped after seconds rather than the caller's timeout
+    (never below `min_timeout`).
+    Attempts that time out are recorded at the timeout they were given, so the
+    window follows an upstream that slows down; opening the circuit clears it,
+    and the half-open probe runs with the caller's timeout.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+    MIN_SAMPLES = 20
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float,
+                 min_timeout: float, p99_multiplier: float, window: int = 200):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.min_timeout = min_timeout
+        self.p99_multiplier = p99_multiplier
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._probing = False
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                wait_for = self.opened_at + self.reset_timeout - time.monotonic()
+                if wait_for > 0:
+                    self.short_circuited += 1
+                    raise CircuitOpen(self.name, wait_for)
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    self.short_circuited += 1
+                    raise CircuitOpen(self.name, 1.0)
+                self._probing = True
+
+    def record(self, elapsed: float):
+        """Add one attempt's latency (for a timeout, at least the timeout it had)."""
+        with self._lock:
+            self._latencies.append(elapsed)
+
+    def success(self, elapsed: float):
+        with self._lock:
+            self._latencies.append(elapsed)
+            self.failures = 0
+            self.state = self.CLOSED
+            self._probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+                self._latencies.clear()  # learned under conditions that no longer hold
+                print(f"[WARN] {self.name} circuit opened after {self.failures} consecutive failures")
+
+    def release(self):
+        """End a call without a verdict, freeing the half-open probe slot if it held it."""
+        with self._lock:
+            self._probing = False
+
+    def p99(self):
+        with self._lock:
+            if len(self._latencies) < self.MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[int(0.99 * (len(ordered) - 1))]
+
+    def timeout(self, requested: float) -> float:
+        """The caller's timeout, capped at a multiple of observed p99 latency."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                return requested
+        p99 = self.p99()
+        if p99 is None:
+            return requested
+        return min(requested, max(self.min_timeout, self.p99_multiplier * p99))
+
+    def stats(self) -> dict:
+        p99 = self.p99()
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+                "p99_ms": round(p99 * 1e3, 1) if p99 is not None else None,
+                "samples": len(self._latencies),
+            }
@@ -0,0 +1,159 @@
+"""
+Record and replay stats.nba.com responses for offline benchmarks and load tests.
+
+A fixture is one upstream response stored as gzipped JSON under
+<dir>/<endpoint>/<digest>.json.gz, where the digest covers the endpoint name
+and its query parameters (sorted, blank values kept). RecordingAdapter sits on
+the shared requests.Session in front of the real transport and writes every
+successful response; ReplayAdapter (and AsyncReplayTransport for the httpx
+client) answers from the fixtures without touching the network, optionally
+adding latency and failing a fraction of calls so retries, timeouts and the
+circuit breaker can be exercised too.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+def request_key(url: str) -> tuple:
+    """(endpoint, sorted query params) for a stats.nba.com URL."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    return parts.path.rstrip("/").rsplit("/", 1)[-1].lower(), tuple(sorted(query))
+
+class FixtureStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.recorded = 0
+
+    def path(self, endpoint: str, query: tuple) -> str:
+        digest = hashlib.sha1(json.dumps([endpoint, query]).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, endpoint, f"{digest}.json.gz")
+
+    def load(self, endpoint: str, query: tuple):
+        """The stored fixture dict ({"status", "body", ...}) or None."""
+        try:
+            with gzip.open(self.path(endpoint, query), "rt", encoding="utf-8") as f:
+                fixture = json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return fixture
+
+    def save(self, endpoint: str, query: tuple, status: int, body: str, url: str):
+        path = self.path(endpoint, query)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump({"url": url, "endpoint": endpoint, "params": query, "status": status, "body": body}, f)
+        os.replace(tmp, path)
+        with self._lock:
+            self.recorded += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"directory": self.directory, "hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+class FaultInjector:
+    """Latency of latency_ms plus up to jitter_ms, and a failure on error_rate of calls."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple:
+        """(delay in seconds, whether this call fails)."""
+        with self._lock:
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000.0
+            return delay, self._random.random() < self.error_rate
+
+def _requests_response(request, status: int, body: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json; charset=utf-8"
+    response.url = request.url
+    response.request = request
+    return response
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter that also stores every 200 response as a fixture."""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            endpoint, query = request_key(request.url)
+            self.store.save(endpoint, query, response.status_code, response.text, request.url)
+        return response
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter answering from fixtures; a missing fixture is a ConnectionError."""
+
+    def __init__(self, store: FixtureStore, faults: FaultInjector = None):
+        super().__init__()
+        self.store = store
+        self.faults = faults or FaultInjector()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        delay, fail = self.faults.draw()
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(f"replay latency {delay:.1f}s over {read_timeout}s", request=request)
+        time.sleep(delay)
+        if fail:
+            raise requests.exceptions.ConnectionError("injected upstream failure", request=request)
+        endpoint, query = request_key(request.url)
+        fixture = self.store.load(endpoint, query)
+        if fixture is None:
+            raise requests.exceptions.ConnectionError(f"no fixture for {endpoint} {dict(query)}", request=request)
+        return _requests_response(request, fixture["status"], fixture["body"])
+
+    def close(self):
+        pass
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    """The same replay for the async httpx upstream client."""
+
+    def __init__(self, store: FixtureStore, faults: FaultInjector = None):
+        self.store = store
+        self.faults = faults or FaultInjector()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay, fail = self.faults.draw()
+        read_timeout = (request.extensions.get("timeout") or {}).get("read")
+        if read_timeout is not None and delay > read_timeout:
+            await asyncio.sleep(read_timeout)
+            raise httpx.ReadTimeout(f"replay latency {delay:.1f}s over {read_timeout}s", request=request)
+        await asyncio.sleep(delay)
+        if fail:
+            raise httpx.ConnectError("injected upstream failure", request=request)
+        endpoint, query = request_key(str(request.url))
+        fixture = self.store.load(endpoint, query)
+        if fixture is None:
+            raise httpx.ConnectError(f"no fixture for {endpoint} {dict(query)}", request=request)
+        return httpx.Response(
+            fixture["status"], text=fixture["body"], request=request,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        )
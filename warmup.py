@@ -0,0 +1,107 @@
+"""
+Background cache warm-up: periodic passes over the requests a cold worker would
+otherwise make on its first page loads, so they are served from cache.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from time import time as _now
+
+class CacheWarmer:
+    """
+    Runs `tasks(season)` for `current_season()` once when started and then
+    every `interval` seconds on a daemon thread. Each task is a (label, source,
+    kwargs) triple passed to `run_task(source, kwargs)`, which should go through
+    the normal cache and upstream path; they run on a pool of `concurrency`
+    threads, so a warm-up never takes more than that many upstream slots away
+    from live traffic.
+    Every worker on a host may run the loop, but a pass only runs in the worker
+    that takes `lease(key, seconds)` for it (the host's shared-cache lease);
+    the others find its results in the shared cache.
+    """
+
+    def __init__(self, tasks, run_task, current_season, concurrency: int, interval: float,
+                 lease=None, min_lease: float = 300):
+        self.tasks = tasks
+        self.run_task = run_task
+        self.current_season = current_season
+        self.lease = lease
+        self.min_lease = min_lease
+        self.concurrency = max(1, concurrency)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._progress = {"state": "idle", "runs": 0, "skipped": 0, "season": None, "total": 0, "done": 0,
+                          "failed": 0, "errors": [], "last_started": None, "last_duration_s": None}
+
+    def run(self, season: str = None, echo=None) -> dict:
+        season = season or self.current_season()
+        tasks = self.tasks(season)
+        started = _now()
+        with self._lock:
+            self._progress.update(state="running", season=season, total=len(tasks), done=0, failed=0,
+                                  errors=[], last_started=datetime.now().isoformat(timespec="seconds"))
+
+        def one(source, kwargs):
+            if self._stop.is_set():
+                return
+            self.run_task(source, kwargs)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="nba-warmup") as pool:
+            futures = {pool.submit(one, source, kwargs): label for label, source, kwargs in tasks}
+            for n, fut in enumerate(as_completed(futures), 1):
+                label = futures[fut]
+                with self._lock:
+                    self._progress["done"] += 1
+                    if fut.exception() is not None:
+                        self._progress["failed"] += 1
+                        self._progress["errors"] = (self._progress["errors"] + [f"{label}: {fut.exception()}"])[-5:]
+                if echo and (n % 10 == 0 or n == len(tasks)):
+                    echo(f"  warm-up {season}: {n}/{len(tasks)}")
+
+        with self._lock:
+            self._progress.update(state="idle", runs=self._progress["runs"] + 1,
+                                  last_duration_s=round(_now() - started, 2))
+            progress = dict(self._progress)
+        if progress["failed"]:
+            print(f"[WARN] warm-up {season}: {progress['failed']}/{progress['total']} tasks failed")
+        return progress
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                season = self.current_season()
+                # Held until it expires, so the host gets one pass per interval
+                if self.lease and self.lease(("warmup", season), max(self.interval, self.min_lease)) is None:
+                    with self._lock:
+                        self._progress["skipped"] += 1
+                else:
+                    self.run(season)
+            except Exception as e:
+                print(f"[WARN] warm-up failed: {e}")
+            if self.interval <= 0 or self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="nba-warmup", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _after_fork(self):
+        # Threads do not survive fork(); pre-forked server workers restart their own loop
+        was_running = self._thread is not None and not self._stop.is_set()
+        self._lock = threading.Lock()
+        self._thread = None
+        if was_running:
+            self.start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._progress, errors=list(self._progress["errors"]))